@@ -0,0 +1,6 @@
+"""Performance benchmarks for mock_platform tools and the state store.
+
+Run ``python -m benchmarks.run --out results.json`` from the repository root
+(with ``src`` on the path or the package installed) and compare two runs with
+``python -m benchmarks.compare base.json head.json``.
+"""
@@ -0,0 +1,76 @@
+"""Compare two benchmark result files.
+
+Usage::
+
+    python -m benchmarks.compare base.json head.json --threshold 0.15
+
+Rows are matched on (scenario, size). The exit status is 1 when any row's
+throughput drops by more than the threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+Key = Tuple[str, int]
+
+
+def load(path: str) -> Dict[Key, Dict[str, Any]]:
+    """Read a results file keyed by (scenario, size).
+
+    Args:
+        path: JSON file written by `benchmarks.run`.
+
+    Returns:
+        Result rows by key.
+    """
+    with open(path, encoding="utf-8") as handle:
+        report = json.load(handle)
+    return {(row["scenario"], row["size"]): row for row in report["results"]}
+
+
+def compare(base: Dict[Key, Dict[str, Any]], head: Dict[Key, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Pair up rows present in both runs.
+
+    Args:
+        base: Baseline rows.
+        head: Candidate rows.
+
+    Returns:
+        One entry per shared key with throughput and memory ratios (head / base).
+    """
+    rows = []
+    for key in sorted(base.keys() & head.keys()):
+        old, new = base[key], head[key]
+        rows.append(
+            {
+                "scenario": key[0],
+                "size": key[1],
+                "ops_ratio": new["ops_per_s"] / old["ops_per_s"] if old["ops_per_s"] else float("inf"),
+                "mem_ratio": new["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else float("inf"),
+            }
+        )
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed fractional throughput drop")
+    args = parser.parse_args(argv)
+
+    regressions = 0
+    for row in compare(load(args.base), load(args.head)):
+        regressed = row["ops_ratio"] < 1 - args.threshold
+        regressions += regressed
+        flag = "REGRESSION" if regressed else ""
+        print(f"{row['scenario']:<34} {row['size']:>7} ops x{row['ops_ratio']:6.2f} mem x{row['mem_ratio']:6.2f} {flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
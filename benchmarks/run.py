@@ -0,0 +1,153 @@
+"""Run benchmark scenarios and emit machine-readable results.
+
+Usage::
+
+    python -m benchmarks.run --sizes 10,1000,100000 --sessions 1,100,10000 --out results.json
+
+Throughput is measured without tracing; peak memory is measured in a second
+pass under tracemalloc covering setup plus a bounded number of calls.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.scenarios import SCENARIOS, Scenario
+
+DEFAULT_SIZES = (10, 1_000, 100_000)
+DEFAULT_SESSIONS = (1, 100, 10_000)
+
+
+def measure(scenario: Scenario, size: int, min_time_s: float = 0.2, max_calls: int = 100_000) -> Dict[str, Any]:
+    """Measure one scenario at one size.
+
+    Args:
+        scenario: Scenario to run.
+        size: Records or sessions, depending on the scenario axis.
+        min_time_s: Keep calling until at least this much time has passed.
+        max_calls: Hard cap on timed calls.
+
+    Returns:
+        Result row with ops/sec and peak traced memory.
+    """
+    workload = scenario.setup(size)
+    limit = max_calls if workload.max_calls is None else min(max_calls, workload.max_calls)
+    gc.collect()
+    start = time.perf_counter()
+    calls = _drive(workload.op, limit, min_time_s)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        traced = scenario.setup(size)
+        _drive(traced.op, min(limit, 1_000), min_time_s)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ops = calls * workload.ops_per_call
+    return {
+        "scenario": scenario.name,
+        "axis": scenario.axis,
+        "size": size,
+        "calls": calls,
+        "seconds": elapsed,
+        "ops_per_s": ops / elapsed if elapsed > 0 else 0.0,
+        "peak_bytes": peak,
+    }
+
+
+def _drive(op: Callable[[], Any], limit: int, min_time_s: float) -> int:
+    """Call `op` until `limit` calls or `min_time_s` seconds, returning the call count."""
+    calls = 0
+    deadline = time.perf_counter() + min_time_s
+    while calls < limit:
+        op()
+        calls += 1
+        if time.perf_counter() >= deadline:
+            break
+    return calls
+
+
+def run(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    sessions: Sequence[int] = DEFAULT_SESSIONS,
+    only: Optional[Sequence[str]] = None,
+    min_time_s: float = 0.2,
+) -> Dict[str, Any]:
+    """Run every selected scenario across its size axis.
+
+    Args:
+        sizes: Record counts for ``records`` scenarios.
+        sessions: Session counts for ``sessions`` scenarios.
+        only: Scenario name prefixes to keep; None runs all.
+        min_time_s: Minimum timed duration per row.
+
+    Returns:
+        ``{"meta": {...}, "results": [...]}``.
+    """
+    rows: List[Dict[str, Any]] = []
+    for scenario in SCENARIOS:
+        if only and not any(scenario.name.startswith(prefix) for prefix in only):
+            continue
+        for size in sizes if scenario.axis == "records" else sessions:
+            row = measure(scenario, size, min_time_s=min_time_s)
+            rows.append(row)
+            print(
+                f"{row['scenario']:<34} {row['axis']:<8} {size:>7} {row['ops_per_s']:>14,.0f} ops/s "
+                f"{row['peak_bytes'] / 1e6:>9.2f} MB",
+                file=sys.stderr,
+            )
+    return {"meta": _meta(), "results": rows}
+
+
+def _meta() -> Dict[str, Any]:
+    """Describe the environment so runs can be compared."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(part) for part in text.split(",") if part]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=_int_list, default=list(DEFAULT_SIZES))
+    parser.add_argument("--sessions", type=_int_list, default=list(DEFAULT_SESSIONS))
+    parser.add_argument("--only", action="append", help="Scenario name prefix (repeatable)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per row")
+    parser.add_argument("--out", help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.sessions, args.only, args.min_time)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
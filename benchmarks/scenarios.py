@@ -0,0 +1,231 @@
+"""Benchmark scenarios parameterized by data size.
+
+Each scenario builds its fixtures for a given size and returns a `Workload`:
+a zero-argument callable timed by the runner, plus the number of logical
+operations one call performs and an optional cap on how often it may run.
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from mock_platform import Clock, InMemoryStateStore, ToolContext
+from mock_platform.models import Contact, Conversation, Memo, Message
+from mock_platform.runner import build_default_registry
+from mock_platform.seeds import default_state_factory
+
+_WORDS = ("budget", "hiring", "roadmap", "review", "launch", "decision", "casey", "quarter", "vendor", "design")
+
+
+@dataclass
+class Workload:
+    """A prepared, repeatable benchmark operation.
+
+    Attributes:
+        op: Callable timed by the runner.
+        ops_per_call: Logical operations performed by one `op()` call.
+        max_calls: Upper bound on `op()` calls (None when unbounded).
+    """
+
+    op: Callable[[], Any]
+    ops_per_call: int = 1
+    max_calls: Optional[int] = None
+
+
+@dataclass
+class Scenario:
+    """A named benchmark with the size axis it scales along.
+
+    Attributes:
+        name: Scenario identifier used in results.
+        axis: ``"records"`` (contacts/messages/memos) or ``"sessions"``.
+        setup: Builds a workload for a size.
+    """
+
+    name: str
+    axis: str
+    setup: Callable[[int], Workload]
+
+
+def sized_state_factory(size: int) -> Callable[[], Dict[str, Any]]:
+    """Return a seed factory with `size` contacts, memos and delivered messages.
+
+    Messages are spread over up to 100 conversations with their peer and
+    client_msg_id indexes populated, as `send_text` would leave them.
+
+    Args:
+        size: Records per collection (on top of the default seeds).
+
+    Returns:
+        Factory producing JSON-shaped session state.
+    """
+
+    def factory() -> Dict[str, Any]:
+        state = default_state_factory()
+        for i in range(size):
+            contact = Contact(contact_id=f"c{i}", name=f"Contact {i:06d}", phones=[{"e164": f"+1555{i:07d}"}])
+            state["contacts"][contact.contact_id] = contact.to_dict()
+            memo = Memo(
+                memo_id=f"memo{i}",
+                title=f"Memo {i:06d} {_WORDS[i % len(_WORDS)]}",
+                content=" ".join(_WORDS[(i + k) % len(_WORDS)] for k in range(12)),
+                created_at=i,
+                updated_at=i,
+            )
+            state["memos"][memo.memo_id] = memo.to_dict()
+        peers = min(size, 100)
+        for p in range(peers):
+            conversation = Conversation(conversation_id=f"c{p + 1}", peer=f"+1555{p:07d}")
+            state["conversations"][conversation.conversation_id] = conversation.to_dict()
+            state["conversation_index"][conversation.peer] = conversation.conversation_id
+        for i in range(size):
+            conversation = state["conversations"][f"c{i % peers + 1}"]
+            message = Message(
+                message_id=f"m{i + 1}",
+                conversation_id=conversation["conversation_id"],
+                to={"type": "e164", "value": conversation["peer"]},
+                text=f"message {i}",
+                client_msg_id=f"seed-{i}",
+                status="delivered",
+                created_ms=0,
+                updated_ms=0,
+            )
+            state["messages"][message.message_id] = message.to_dict()
+            state["client_msg_index"][message.client_msg_id] = message.message_id
+            conversation["messages"].append(message.message_id)
+        state["next_message_id"] = size + 1
+        state["next_conversation_id"] = peers + 1
+        return state
+
+    return factory
+
+
+def _context(size: int, snapshot_mode: str = "deepcopy", session: str = "bench") -> ToolContext:
+    """Return a context over a store seeded with `size` records."""
+    store = InMemoryStateStore(sized_state_factory(size), snapshot_mode=snapshot_mode)
+    ctx = ToolContext(user_id=session, trace_id="bench", clock=Clock(), state_store=store)
+    store.get(ctx.session)
+    return ctx
+
+
+def _tool(name: str, make_args: Callable[[int, int], dict], warm: Optional[dict] = None) -> Callable[[int], Workload]:
+    """Build a setup running one tool with per-call arguments.
+
+    Args:
+        name: Tool name.
+        make_args: Maps (size, call number) to arguments.
+        warm: Arguments for one untimed call that builds lazy indexes.
+    """
+
+    def setup(size: int) -> Workload:
+        registry = build_default_registry()
+        ctx = _context(size)
+        if warm is not None:
+            registry.call(name, warm, ctx)
+        counter = itertools.count()
+        call = registry.call
+
+        def op() -> None:
+            result = call(name, make_args(size, next(counter)), ctx)
+            if not result.ok:
+                raise RuntimeError(f"{name} failed: {result.error}")
+
+        return Workload(op)
+
+    return setup
+
+
+def _send_args(size: int, n: int) -> dict:
+    return {"to": {"type": "e164", "value": f"+1555{n % max(size, 1):07d}"}, "text": "hi", "client_msg_id": f"b{n}"}
+
+
+def _advance(size: int) -> Workload:
+    """Queue `size` deliveries due 1 ms apart, then time 1 ms advances that each deliver one."""
+    registry = build_default_registry()
+    ctx = _context(size)
+    state = ctx.state_store.get(ctx.session)
+    for n in range(size):
+        state["delivery_delay_ms"] = n + 1
+        registry.call("messaging.send_text", _send_args(size, n), ctx)
+    advance = ctx.clock.advance
+    return Workload(lambda: advance(1), max_calls=size)
+
+
+def _snapshot(snapshot_mode: str) -> Callable[[int], Workload]:
+    """Time one episode step: snapshot, one `send_text`, restore."""
+
+    def setup(size: int) -> Workload:
+        registry = build_default_registry()
+        ctx = _context(size, snapshot_mode)
+        store, session = ctx.state_store, ctx.session
+        counter = itertools.count()
+        call = registry.call
+
+        def op() -> None:
+            snapshot = store.snapshot(session)
+            call("messaging.send_text", _send_args(size, next(counter)), ctx)
+            store.restore(session, snapshot)
+
+        return Workload(op)
+
+    return setup
+
+
+def _sessions_get(sessions: int) -> Workload:
+    """Round-robin a cheap read across `sessions` resident sessions."""
+    registry = build_default_registry()
+    store = InMemoryStateStore(default_state_factory)
+    clock = Clock()
+    contexts: List[ToolContext] = [
+        ToolContext(user_id=f"s{i}", trace_id="bench", clock=clock, state_store=store) for i in range(sessions)
+    ]
+    for ctx in contexts:
+        store.get(ctx.session)
+    cycle = itertools.cycle(contexts)
+    call = registry.call
+    return Workload(lambda: call("contacts.get", {"contact_id": "anders"}, next(cycle)))
+
+
+def _sessions_create(sessions: int) -> Workload:
+    """Create fresh sessions from the seed template."""
+    store = InMemoryStateStore(default_state_factory)
+    store.get("warm")
+    counter = itertools.count()
+    return Workload(lambda: store.get(f"s{next(counter)}"), max_calls=sessions)
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("contacts.search", "records", _tool("contacts.search", lambda s, n: {"q": "ontact 00"}, {"q": "ontact"})),
+    Scenario("contacts.get", "records", _tool("contacts.get", lambda s, n: {"contact_id": f"c{n % max(s, 1)}"})),
+    Scenario("messaging.send_text", "records", _tool("messaging.send_text", _send_args)),
+    Scenario(
+        "messaging.get_message", "records", _tool("messaging.get_message", lambda s, n: {"message_id": f"m{n % max(s, 1) + 1}"})
+    ),
+    Scenario(
+        "messaging.list_messages",
+        "records",
+        _tool("messaging.list_messages", lambda s, n: {"conversation_id": "c1", "limit": 20}),
+    ),
+    Scenario("memo.list_memos", "records", _tool("memo.list_memos", lambda s, n: {})),
+    Scenario("memo.search.title", "records", _tool("memo.search", lambda s, n: {"title": "emo 00"}, {"title": "emo"})),
+    Scenario(
+        "memo.search.ranked",
+        "records",
+        _tool("memo.search", lambda s, n: {"query": "hiring budget", "ranked": True, "limit": 10}, {"query": "budget"}),
+    ),
+    Scenario("memo.get_memo", "records", _tool("memo.get_memo", lambda s, n: {"memo_id": "decision"})),
+    Scenario("admin.reset", "records", _tool("admin.reset", lambda s, n: {})),
+    Scenario(
+        "admin.set_delivery",
+        "records",
+        _tool("admin.set_delivery", lambda s, n: {"message_id": f"m{n % max(s, 1) + 1}", "status": "delivered"}),
+    ),
+    Scenario("admin.set_rule", "records", _tool("admin.set_rule", lambda s, n: {"name": f"r{n % 100}", "value": n})),
+    Scenario("clock.advance", "records", _advance),
+    Scenario("store.snapshot_restore.deepcopy", "records", _snapshot("deepcopy")),
+    Scenario("store.snapshot_restore.cow", "records", _snapshot("cow")),
+    Scenario("sessions.get", "sessions", _sessions_get),
+    Scenario("sessions.create", "sessions", _sessions_create),
+]
@@ -0,0 +1,95 @@
+"""Asyncio front-end for the tool registry."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, List, Tuple
+
+from mock_platform.context import ToolContext
+from mock_platform.registry import ToolRegistry
+from mock_platform.tools import ToolResult
+
+
+class AsyncToolRegistry:
+    """Awaitable wrapper around a ToolRegistry with per-session serialization.
+
+    Handlers run on the event loop thread. Calls for the same session are
+    serialized through a per-session `asyncio.Lock`, while calls for different
+    sessions interleave freely. Locks are created on demand and dropped once no
+    task holds or waits for them, so long-running loops do not accumulate them.
+    """
+
+    def __init__(self, registry: ToolRegistry) -> None:
+        """Wrap a registry.
+
+        Args:
+            registry: Registry whose tools are exposed.
+        """
+        self._registry = registry
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._users: Dict[str, int] = {}
+
+    @property
+    def registry(self) -> ToolRegistry:
+        """Return the wrapped registry."""
+        return self._registry
+
+    @asynccontextmanager
+    async def session(self, session_id: str) -> AsyncIterator[None]:
+        """Hold a session's lock across several awaits.
+
+        The lock is not reentrant: use the wrapped `registry.call` inside the
+        block rather than `acall`.
+
+        Args:
+            session_id: Session to serialize on.
+        """
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        self._users[session_id] = self._users.get(session_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            remaining = self._users[session_id] - 1
+            if remaining:
+                self._users[session_id] = remaining
+            else:
+                del self._users[session_id]
+                del self._locks[session_id]
+
+    async def acall(self, tool_name: str, args: dict, ctx: ToolContext) -> ToolResult:
+        """Invoke a tool, serialized with other calls for the same session.
+
+        Args:
+            tool_name: Registered tool name.
+            args: Arguments dictionary.
+            ctx: ToolContext for the invocation.
+
+        Returns:
+            ToolResult describing success or failure.
+        """
+        async with self.session(ctx.session):
+            return self._registry.call(tool_name, args, ctx)
+
+    async def acall_batch(
+        self, calls: Iterable[Tuple[str, dict]], ctx: ToolContext, stop_on_error: bool = False
+    ) -> List[ToolResult]:
+        """Invoke a batch atomically with respect to the session.
+
+        Args:
+            calls: Sequence of ``(tool_name, args)`` pairs.
+            ctx: ToolContext shared by every call.
+            stop_on_error: Stop after the first result with ``ok=False``.
+
+        Returns:
+            One ToolResult per executed call, in order.
+        """
+        async with self.session(ctx.session):
+            return self._registry.call_batch(calls, ctx, stop_on_error=stop_on_error)
+
+    def active_sessions(self) -> int:
+        """Return the number of sessions with a held or awaited lock."""
+        return len(self._locks)
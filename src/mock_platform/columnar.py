@@ -0,0 +1,242 @@
+"""Columnar per-session message table for bulk queries.
+
+`message_table(store, session_id)` returns a `MessageTable` holding one row
+per message in parallel arrays: ids, conversation/peer/status codes and the
+``created_ms``/``updated_ms`` timestamps. Like the search indexes in
+`mock_platform.indexing` it lives in `InMemoryStateStore.indexes`, is built
+on first use and dropped on reset/restore. The built-in tools report new
+messages and status changes through `track_message`; messages appended to the
+state directly are picked up on the next `message_table` call.
+
+Aggregations run over the arrays with NumPy when it is installed and with
+C-level builtins (`collections.Counter`, `map`) otherwise, so they never
+touch the per-message records.
+"""
+
+from __future__ import annotations
+
+import operator
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, Dict, List, Mapping, Optional
+
+from mock_platform.state import InMemoryStateStore
+
+try:  # pragma: no cover - exercised only where NumPy is installed
+    import numpy as _np
+except ImportError:  # pragma: no cover
+    _np = None
+
+_TABLE_KEY = "messaging.columns"
+
+
+class _Codes:
+    """Interns strings to dense integer codes."""
+
+    __slots__ = ("names", "_codes")
+
+    def __init__(self) -> None:
+        """Start with no interned strings."""
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, name: str) -> int:
+        """Return the code for `name`, interning it if new."""
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def get(self, name: str) -> Optional[int]:
+        """Return the code for `name`, or None if it was never interned."""
+        return self._codes.get(name)
+
+
+class MessageTable:
+    """Parallel-array view of a session's messages."""
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self._clear()
+        self._source: Optional[Mapping[str, Any]] = None
+
+    def _clear(self) -> None:
+        """Drop every row."""
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._conversations = _Codes()
+        self._peers = _Codes()
+        self._statuses = _Codes()
+        self._conversation = array("i")
+        self._peer = array("i")
+        self._status = array("H")
+        self._created = array("q")
+        self._updated = array("q")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def sync(self, messages: Mapping[str, Any]) -> None:
+        """Add rows for messages written to the collection without `track_message`.
+
+        The common case (same collection, same size) is O(1). Messages are
+        append-only in the built-in tools, so a different or shrunken
+        collection is rebuilt from scratch.
+
+        Args:
+            messages: The session's ``messages`` collection.
+        """
+        if messages is self._source and len(messages) == len(self.ids):
+            return
+        if messages is not self._source or len(messages) < len(self.ids):
+            self._clear()
+            self._source = messages
+        rows = self._rows
+        for message_id, message in messages.items():
+            if message_id not in rows:
+                self.upsert(message_id, message)
+
+    def upsert(self, message_id: str, message: Mapping[str, Any]) -> None:
+        """Add a row or refresh an existing row's status and timestamps.
+
+        Args:
+            message_id: Message identifier.
+            message: Message record.
+        """
+        row = self._rows.get(message_id)
+        status = self._statuses.code(message["status"])
+        if row is not None:
+            self._status[row] = status
+            self._updated[row] = message["updated_ms"]
+            return
+        self._rows[message_id] = len(self.ids)
+        self.ids.append(message_id)
+        self._conversation.append(self._conversations.code(message["conversation_id"]))
+        self._peer.append(self._peers.code(message["to"]["value"]))
+        self._status.append(status)
+        self._created.append(message["created_ms"])
+        self._updated.append(message["updated_ms"])
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Return message counts keyed by status.
+
+        Returns:
+            Mapping of status to count (statuses with no rows are omitted).
+        """
+        return self._count(self._status, self._statuses, "uint16")
+
+    def count_by_peer(self) -> Dict[str, int]:
+        """Return message counts keyed by recipient e164.
+
+        Returns:
+            Mapping of peer to count.
+        """
+        return self._count(self._peer, self._peers, "int32")
+
+    def count_by_conversation(self) -> Dict[str, int]:
+        """Return message counts keyed by conversation id.
+
+        Returns:
+            Mapping of conversation id to count.
+        """
+        return self._count(self._conversation, self._conversations, "int32")
+
+    def latencies(self, status: Optional[str] = "delivered") -> List[int]:
+        """Return ``updated_ms - created_ms`` per message, in table order.
+
+        Args:
+            status: Only include messages with this status; None includes all.
+
+        Returns:
+            Latencies in milliseconds.
+        """
+        if _np is not None and self.ids:
+            values = _np.frombuffer(self._updated, dtype="int64") - _np.frombuffer(self._created, dtype="int64")
+            mask = self._status_mask(status)
+            return (values if mask is None else values[mask]).tolist()
+        values = map(operator.sub, self._updated, self._created)
+        if status is None:
+            return list(values)
+        code = self._statuses.get(status)
+        if code is None:
+            return []
+        return list(compress(values, map(code.__eq__, self._status)))
+
+    def latency_summary(self, status: Optional[str] = "delivered") -> Dict[str, Any]:
+        """Summarize latencies for messages with a status.
+
+        Args:
+            status: Status filter as in `latencies`.
+
+        Returns:
+            ``count``, ``mean_ms``, ``min_ms`` and ``max_ms`` (None when empty).
+        """
+        if _np is not None and self.ids:
+            values = _np.frombuffer(self._updated, dtype="int64") - _np.frombuffer(self._created, dtype="int64")
+            mask = self._status_mask(status)
+            if mask is not None:
+                values = values[mask]
+            if not len(values):
+                return {"count": 0, "mean_ms": None, "min_ms": None, "max_ms": None}
+            return {
+                "count": int(values.size),
+                "mean_ms": float(values.mean()),
+                "min_ms": int(values.min()),
+                "max_ms": int(values.max()),
+            }
+        values = self.latencies(status)
+        if not values:
+            return {"count": 0, "mean_ms": None, "min_ms": None, "max_ms": None}
+        return {"count": len(values), "mean_ms": sum(values) / len(values), "min_ms": min(values), "max_ms": max(values)}
+
+    def _count(self, column: array, codes: _Codes, dtype: str) -> Dict[str, int]:
+        """Count rows per code of a column."""
+        if _np is not None and self.ids:
+            counts = _np.bincount(_np.frombuffer(column, dtype=dtype), minlength=len(codes.names)).tolist()
+            return {name: count for name, count in zip(codes.names, counts) if count}
+        counts = Counter(column)
+        return {name: counts[code] for code, name in enumerate(codes.names) if counts[code]}
+
+    def _status_mask(self, status: Optional[str]) -> Any:
+        """Return a NumPy row mask for a status, or None for all rows."""
+        if status is None:
+            return None
+        code = self._statuses.get(status)
+        if code is None:
+            return _np.zeros(len(self.ids), dtype=bool)
+        return _np.frombuffer(self._status, dtype="uint16") == code
+
+
+def message_table(store: InMemoryStateStore, session_id: str) -> MessageTable:
+    """Return the session's message table, built on first use and synced.
+
+    Args:
+        store: State store holding the session.
+        session_id: Session identifier.
+
+    Returns:
+        Up-to-date MessageTable.
+    """
+    messages = store.get(session_id)["messages"]
+    cache = store.indexes(session_id)
+    table = cache.get(_TABLE_KEY)
+    if table is None:
+        table = cache[_TABLE_KEY] = MessageTable()
+    table.sync(messages)
+    return table
+
+
+def track_message(store: InMemoryStateStore, session_id: str, message_id: str, message: Mapping[str, Any]) -> None:
+    """Apply a message insert or status change to the table if one is built.
+
+    Args:
+        store: State store holding the session.
+        session_id: Session identifier.
+        message_id: Message identifier.
+        message: Current message record.
+    """
+    table = store.indexes(session_id).get(_TABLE_KEY)
+    if table is not None:
+        table.upsert(message_id, message)
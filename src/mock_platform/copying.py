@@ -0,0 +1,36 @@
+"""Fast copier for JSON-shaped session state."""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+from mock_platform.records import CompactRecord
+
+_ATOMIC = frozenset({str, int, float, bool, type(None)})
+
+
+def clone_json(value: Any) -> Any:
+    """Return a deep copy of a JSON-shaped value.
+
+    Dicts, lists and scalars are copied with specialized comprehensions, which
+    is several times faster than `copy.deepcopy` because no memo dict or
+    reduce protocol is involved. Compact records copy themselves; any other
+    type falls back to `copy.deepcopy`.
+
+    Args:
+        value: Value to copy.
+
+    Returns:
+        Independent copy of value.
+    """
+    cls = type(value)
+    if cls in _ATOMIC:
+        return value
+    if cls is dict:
+        return {key: item if type(item) in _ATOMIC else clone_json(item) for key, item in value.items()}
+    if cls is list:
+        return [item if type(item) in _ATOMIC else clone_json(item) for item in value]
+    if isinstance(value, CompactRecord):
+        return value.copy()
+    return copy.deepcopy(value)
@@ -0,0 +1,400 @@
+"""Copy-on-write mappings for structural-sharing session snapshots."""
+
+from __future__ import annotations
+
+from collections.abc import ItemsView, KeysView, MutableMapping, ValuesView
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from mock_platform.copying import clone_json
+from mock_platform.records import CompactRecord
+from mock_platform.tracking import KeyChanges, TrackedDict
+
+
+_MUTABLE = (dict, list, CompactRecord)
+
+
+class _Sentinel:
+    """Marker value that survives copying and pickling by identity."""
+
+    __slots__ = ("_name",)
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __repr__(self) -> str:
+        return self._name
+
+    def __reduce__(self) -> str:
+        return self._name
+
+
+_MISSING = _Sentinel("_MISSING")
+_DELETED = _Sentinel("_DELETED")
+
+# Fold the delta into a fresh base once it outgrows this share of the base.
+_FLATTEN_RATIO = 4
+_FLATTEN_MIN = 64
+
+
+class _CowItems(ItemsView):
+    """Items view yielding stored records without copying them."""
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        return self._mapping._iter_items()
+
+    def __contains__(self, item: object) -> bool:
+        key, value = item
+        found = self._mapping.peek(key, _MISSING)
+        return found is not _MISSING and (found is value or found == value)
+
+
+class _CowValues(ValuesView):
+    """Values view yielding stored records without copying them."""
+
+    def __iter__(self) -> Iterator[Any]:
+        return (value for _, value in self._mapping._iter_items())
+
+
+class CowMap(MutableMapping):
+    """Mapping whose storage and records can be shared with forks.
+
+    A map is a shared, never-mutated base dict plus a private delta: values
+    replaced or deleted in place (`_changes`) and keys appended after the
+    base (`_tail`, in insertion order). Forking copies only the delta, so it
+    costs O(changes); reads and writes are O(1). The first item access to a
+    mutable record (dict/list/compact record) copies just that record into
+    the delta, so in-place mutation of a record never leaks into a fork. Once
+    the delta outgrows a quarter of the base it is folded into a fresh base
+    (amortized O(1) per change).
+
+    Iteration order matches a plain dict given the same operations. Iteration
+    views (`keys`, `values`, `items`) return the stored records without
+    copying and must be treated as read-only; mutate records through item
+    access (`m[key]`, `m.get`). Like `TrackedDict`, the map reports keys
+    accessed that way, written or deleted to its watchers (see `watch`).
+    """
+
+    __slots__ = ("_base", "_changes", "_tail", "_len", "_owned", "_watchers")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        """Initialize the map.
+
+        Args:
+            data: Initial records; the map takes ownership of them.
+        """
+        self._base: Dict[str, Any] = dict(data) if data else {}
+        self._changes: Dict[str, Any] = {}
+        self._tail: Dict[str, Any] = {}
+        self._len = len(self._base)
+        self._owned: Set[str] = set(self._base)
+        self._watchers: List[KeyChanges] = []
+
+    def fork(self) -> "CowMap":
+        """Return a copy sharing the base and records with this map.
+
+        Returns:
+            New map with the same contents.
+        """
+        other = CowMap.__new__(CowMap)
+        other._base = self._base
+        other._changes = dict(self._changes)
+        other._tail = dict(self._tail)
+        other._len = self._len
+        other._owned = set()
+        other._watchers = []
+        self._owned = set()
+        return other
+
+    def watch(self) -> KeyChanges:
+        """Start reporting changed keys to a new watcher; forks start without any.
+
+        Returns:
+            Watcher collecting keys from now on.
+        """
+        changes = KeyChanges()
+        self._watchers.append(changes)
+        return changes
+
+    def _lookup(self, key: str, default: Any = _MISSING) -> Any:
+        """Return the stored value for key without copying, or default."""
+        tail = self._tail
+        if key in tail:
+            return tail[key]
+        changes = self._changes
+        if key in changes:
+            value = changes[key]
+            return default if value is _DELETED else value
+        return self._base.get(key, default)
+
+    def _in_base(self, key: str) -> bool:
+        """Return True when key is live at its base position."""
+        return key in self._base and self._changes.get(key) is not _DELETED
+
+    def _iter_items(self) -> Iterator[Tuple[str, Any]]:
+        """Yield stored (key, record) pairs in order without copying."""
+        changes = self._changes
+        if not changes:
+            yield from self._base.items()
+        else:
+            for key, value in self._base.items():
+                changed = changes.get(key, _MISSING)
+                if changed is _MISSING:
+                    yield key, value
+                elif changed is not _DELETED:
+                    yield key, changed
+        yield from self._tail.items()
+
+    def _grew(self) -> None:
+        """Fold a large delta into a fresh base."""
+        if len(self._changes) + len(self._tail) > len(self._base) // _FLATTEN_RATIO + _FLATTEN_MIN:
+            self._base = dict(self._iter_items())
+            self._changes = {}
+            self._tail = {}
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        for watcher in self._watchers:
+            watcher.touched[key] = None
+        if key in self._owned or not isinstance(value, _MUTABLE):
+            return value
+        value = clone_json(value)
+        if key in self._tail:
+            self._tail[key] = value
+        else:
+            self._changes[key] = value
+        self._owned.add(key)
+        self._grew()
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        for watcher in self._watchers:
+            watcher.touched[key] = None
+        if key in self._tail:
+            self._tail[key] = value
+        elif self._in_base(key):
+            self._changes[key] = value
+        else:
+            self._tail[key] = value
+            self._len += 1
+        self._owned.add(key)
+        self._grew()
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._tail:
+            del self._tail[key]
+        elif self._in_base(key):
+            self._changes[key] = _DELETED
+        else:
+            raise KeyError(key)
+        for watcher in self._watchers:
+            watcher.remove(key)
+        self._len -= 1
+        self._owned.discard(key)
+        self._grew()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._tail or self._in_base(key)
+
+    def __iter__(self) -> Iterator[str]:
+        if not self._changes and not self._tail:
+            return iter(self._base)
+        return (key for key, _ in self._iter_items())
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"CowMap({dict(self._iter_items())!r})"
+
+    def keys(self):  # type: ignore[override]
+        """Return a read-only keys view."""
+        if not self._changes and not self._tail:
+            return self._base.keys()
+        return KeysView(self)
+
+    def values(self):  # type: ignore[override]
+        """Return a read-only values view (records are not copied)."""
+        if not self._changes and not self._tail:
+            return self._base.values()
+        return _CowValues(self)
+
+    def items(self):  # type: ignore[override]
+        """Return a read-only items view (records are not copied)."""
+        if not self._changes and not self._tail:
+            return self._base.items()
+        return _CowItems(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a writable record for key, or default."""
+        if key in self:
+            return self[key]
+        return default
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Return the stored record for key without copying it (read-only)."""
+        return self._lookup(key, default)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        """Remove key and return its record without copying it."""
+        value = self._lookup(key)
+        if value is _MISSING:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        del self[key]
+        return value
+
+
+class CowState(dict):
+    """Top-level session state in ``"cow"`` mode.
+
+    Collections are CowMaps, which `fork_state` forks. Other mutable values
+    (such as the delivery queue list) are shared with forks as they are and
+    copied on first item access (``state[key]``, ``get``, ``setdefault``,
+    ``pop``), so snapshot and restore cost O(1) in their size. As with
+    CowMap, iteration views return shared values and are read-only; use
+    `peek` to read a value without copying it.
+    """
+
+    __slots__ = ("_shared",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize like `dict`, with nothing shared."""
+        super().__init__(*args, **kwargs)
+        self._shared: Set[str] = set()
+
+    def _own(self, key: str) -> Any:
+        """Replace a shared value with a private copy and return it."""
+        self._shared.discard(key)
+        value = clone_json(dict.__getitem__(self, key))
+        dict.__setitem__(self, key, value)
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._shared:
+            return self._own(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a writable value for key, or default."""
+        if key in self._shared:
+            return self._own(key)
+        return dict.get(self, key, default)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        """Return a writable value for key, inserting default first if missing."""
+        if key in self._shared:
+            return self._own(key)
+        return dict.setdefault(self, key, default)
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Return the stored value for key without copying it (read-only)."""
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._shared.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._shared.discard(key)
+        dict.__delitem__(self, key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        """Remove key and return a private copy of its value."""
+        if key in self._shared:
+            self._own(key)
+        return dict.pop(self, key, *default)
+
+    def clear(self) -> None:
+        """Remove every value."""
+        self._shared.clear()
+        dict.clear(self)
+
+    def _share(self, key: str, value: Any) -> None:
+        """Store value as shared with another state."""
+        dict.__setitem__(self, key, value)
+        self._shared.add(key)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return dict, (dict(self),)
+
+
+def peek(mapping: Any, key: str, default: Any = None) -> Any:
+    """Read a record for inspection only, skipping the CowMap copy on access.
+
+    Args:
+        mapping: Plain dict, TrackedDict, CowMap or CowState.
+        key: Record key.
+        default: Value returned when key is missing.
+
+    Returns:
+        The stored record, which must not be mutated.
+    """
+    if isinstance(mapping, (CowMap, TrackedDict, CowState)):
+        return mapping.peek(key, default)
+    return mapping.get(key, default)
+
+
+def to_cow_state(state: Dict[str, Any]) -> CowState:
+    """Wrap every top-level dict of a session state in a CowMap.
+
+    Args:
+        state: Plain session state; ownership is transferred.
+
+    Returns:
+        CowState using CowMap collections.
+    """
+    return CowState((key, CowMap(value) if isinstance(value, dict) else value) for key, value in state.items())
+
+
+def fork_state(state: Dict[str, Any]) -> CowState:
+    """Return a structural-sharing copy of a session state.
+
+    CowMap collections are forked in O(changes). A CowState's other mutable
+    values (queues, counters) are shared with the copy and copied by whichever
+    side accesses them first, and plain dicts added to it since the last fork
+    become CowMaps on both sides (copied once). A plain state is deep-copied.
+
+    Args:
+        state: Session state, plain or CowState.
+
+    Returns:
+        Independent CowState.
+    """
+    forked = CowState()
+    sharing = isinstance(state, CowState)
+    for key, value in state.items():
+        if isinstance(value, CowMap):
+            forked[key] = value.fork()
+        elif isinstance(value, dict):
+            if sharing:
+                value = state[key] = CowMap(state[key])
+                forked[key] = value.fork()
+            else:
+                forked[key] = CowMap(clone_json(value))
+        elif sharing and isinstance(value, _MUTABLE):
+            state._share(key, value)
+            forked._share(key, value)
+        else:
+            forked[key] = clone_json(value)
+    return forked
+
+
+def materialize(value: Any) -> Any:
+    """Return a plain JSON-shaped copy of a (possibly CowMap-backed) value.
+
+    Args:
+        value: State, snapshot or record.
+
+    Returns:
+        Deep copy using only dicts, lists and scalars.
+    """
+    if isinstance(value, CompactRecord):
+        return value.to_dict()
+    if isinstance(value, (CowMap, dict)):
+        return {key: materialize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [materialize(item) for item in value]
+    return value
@@ -0,0 +1,169 @@
+"""Compact JSON transport encoding for tool results.
+
+`dumps_bytes` produces the UTF-8 bytes of
+``json.dumps(value, ensure_ascii=False, separators=(",", ":"))`` for
+JSON-shaped values that may contain read-only views (`mock_platform.views`),
+compact records (`mock_platform.records`) or `CowMap`s, without first copying
+them into plain dicts. Two backends produce identical bytes:
+
+- ``"orjson"`` (used when the package is installed) for speed.
+- ``"stdlib"``: the top levels of the value (result, payload, record lists)
+  are walked so compact records can write themselves from their slots with
+  `CompactRecord.to_json`; every other subtree, including plain dict records,
+  goes to a reused C `json` encoder.
+
+orjson formats floats like `repr` only for ``1e-4 <= abs(x) < 1e16``; outside
+that range it writes ``1e-9``/``0.00001`` where `json` writes ``1e-09``/``1e-05``.
+Such output is detected by a regex over the encoded bytes and re-encoded by the
+stdlib backend, as are values orjson rejects (non-string keys, integers beyond
+64 bits). orjson also writes non-finite floats as ``null`` where `json` writes
+``NaN``/``Infinity``; when its output holds a ``null`` not accounted for by a
+top-level None, the value is walked for such floats and re-encoded by the
+stdlib backend if it holds any.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections.abc import Mapping
+from json.encoder import c_make_encoder, encode_basestring
+from typing import Any, Optional
+
+from mock_platform.records import CompactRecord
+from mock_platform.views import ReadOnlyList, ReadOnlyMapping
+
+try:  # pragma: no cover - depends on the environment
+    import orjson as _orjson
+except ImportError:  # pragma: no cover
+    _orjson = None
+
+BACKENDS = ("orjson", "stdlib")
+
+# Floats orjson writes differently from `repr`: exponent forms (a digit followed
+# by "e") and positional forms below 1e-4. Strings that happen to match only
+# cost a stdlib re-encode.
+_ORJSON_FLOAT_MISMATCH = re.compile(rb"\de|(?<!\d)0\.0000")
+
+# Types `_has_non_finite` skips without further checks.
+_SCALARS = frozenset((str, int, bool, type(None)))
+
+# Containers nested at least this deep (result -> data -> list) are handed to
+# the C encoder in one piece.
+_MAX_DEPTH = 3
+
+
+def _default(value: Any) -> Any:
+    """Turn views, records and CowMaps into types the encoders understand."""
+    if isinstance(value, (ReadOnlyMapping, ReadOnlyList)):
+        return value._data
+    if isinstance(value, CompactRecord):
+        return value.to_dict()
+    if isinstance(value, Mapping):
+        return dict(value.items())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if c_make_encoder is not None:
+    # The encoder JSONEncoder.iterencode would build on every call, built once.
+    _C_ENCODER = c_make_encoder(None, _default, encode_basestring, None, ":", ",", False, False, True)
+
+    def _encode_subtree(value: Any) -> str:
+        return "".join(_C_ENCODER(value, 0))
+
+else:  # pragma: no cover - interpreters without the C accelerator
+    _encode_subtree = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_default).encode
+
+
+def default_backend() -> str:
+    """Return the backend `dumps_bytes` uses when none is requested."""
+    return "stdlib" if _orjson is None else "orjson"
+
+
+def dumps_bytes(value: Any, backend: Optional[str] = None) -> bytes:
+    """Encode a JSON-shaped value as compact UTF-8 JSON.
+
+    Args:
+        value: Value to encode.
+        backend: ``"orjson"`` or ``"stdlib"``; defaults to `default_backend()`.
+
+    Returns:
+        Encoded bytes.
+
+    Raises:
+        ValueError: If the backend is unknown or unavailable.
+        TypeError: If value contains non-JSON types.
+    """
+    backend = backend or default_backend()
+    if backend == "orjson":
+        if _orjson is None:
+            raise ValueError("orjson is not installed")
+        try:
+            encoded = _orjson.dumps(value, default=_default)
+        except _orjson.JSONEncodeError:
+            pass
+        else:
+            if _ORJSON_FLOAT_MISMATCH.search(encoded) is None and not _may_hide_non_finite(value, encoded):
+                return encoded
+    elif backend != "stdlib":
+        raise ValueError(f"Unknown backend '{backend}'")
+    return _encode(value, 0).encode("utf-8")
+
+
+def _may_hide_non_finite(value: Any, encoded: bytes) -> bool:
+    """Return True unless every ``null`` orjson wrote is known to come from None.
+
+    Each None encodes as one ``null``, so when the ``null`` count equals the
+    number of None values at the top level of a dict (the usual
+    ``"error":null``), no non-finite float can have been written as ``null``.
+    """
+    nulls = encoded.count(b"null")
+    if not nulls:
+        return False
+    if type(value) is dict and nulls == sum(item is None for item in value.values()):
+        return False
+    return _has_non_finite(value)
+
+
+def _has_non_finite(value: Any) -> bool:
+    """Return True if value holds a NaN or infinite float anywhere."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        cls = type(item)
+        if cls in _SCALARS:
+            continue
+        if cls is dict:
+            stack.extend(item.values())
+        elif cls is list or cls is tuple:
+            stack.extend(item)
+        elif isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, (ReadOnlyMapping, ReadOnlyList)):
+            stack.append(item._data)
+        elif isinstance(item, CompactRecord):
+            stack.extend(item.to_dict().values())
+        elif isinstance(item, Mapping):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def _encode(value: Any, depth: int) -> str:
+    """Encode a value, letting compact records near the top write themselves."""
+    if isinstance(value, (ReadOnlyMapping, ReadOnlyList)):
+        value = value._data
+    if isinstance(value, CompactRecord):
+        encoded = value.to_json()
+        return _encode_subtree(value.to_dict()) if encoded is None else encoded
+    if depth < _MAX_DEPTH:
+        cls = type(value)
+        if cls is dict and all(type(key) is str for key in value):
+            items = ",".join([encode_basestring(key) + ":" + _encode(item, depth + 1) for key, item in value.items()])
+            return "{" + items + "}"
+        if cls is list:
+            return "[" + ",".join([_encode(item, depth + 1) for item in value]) + "]"
+    return _encode_subtree(value)
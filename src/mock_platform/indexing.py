@@ -0,0 +1,288 @@
+"""Derived per-session search indexes.
+
+Indexes are not part of the JSON session state: they live in
+`InMemoryStateStore.indexes(session_id)`, are built lazily on first use and
+are dropped whenever the session is reset or restored. Between those points
+they follow the indexed collection incrementally: session collections report
+every key read through item access, written or deleted (see
+`mock_platform.tracking`), and `sync` re-indexes just those keys. Records are
+therefore re-indexed after in-place edits such as
+``state["contacts"][key]["name"] = ...`` without any per-query scan.
+"""
+
+from __future__ import annotations
+
+import abc
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from mock_platform.cow import peek
+from mock_platform.tracking import KeyChanges
+
+_TOKEN_RE = re.compile(r"\w+")
+_MISSING = object()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens.
+
+    Args:
+        text: Source text.
+
+    Returns:
+        Tokens in order of appearance.
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def ngrams(text: str, n: int) -> Set[str]:
+    """Return the set of length-n substrings of text.
+
+    Args:
+        text: Source text (already normalized).
+        n: Gram length.
+
+    Returns:
+        Set of grams; empty when text is shorter than n.
+    """
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
+class _KeyedIndex(abc.ABC):
+    """Base for indexes over a keyed record collection, tracking collection order."""
+
+    def __init__(self) -> None:
+        """Initialize empty bookkeeping."""
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._source: Optional[Mapping[str, Any]] = None
+        self._changes: Optional[KeyChanges] = None
+
+    def sync(self, records: Mapping[str, dict]) -> bool:
+        """Bring the index up to date with records.
+
+        The first sync against a collection indexes it fully and starts
+        watching it; later syncs re-index only the keys the collection
+        reported since, so an unchanged collection costs O(1).
+
+        Args:
+            records: Collection being indexed.
+
+        Returns:
+            False when records cannot report changed keys (a plain dict put
+            into the state by hand); the index is then not usable and callers
+            should scan instead.
+        """
+        if records is not self._source:
+            for key in list(self._order):
+                self.discard(key)
+            self._source = records
+            watch = getattr(records, "watch", None)
+            self._changes = None if watch is None else watch()
+            if self._changes is None:
+                return False
+            for key, record in records.items():
+                self.add(key, record)
+            return True
+        changes = self._changes
+        if changes is None:
+            return False
+        if changes.touched or changes.removed:
+            removed, touched = changes.drain()
+            for key in removed:
+                self.discard(key)
+            for key in touched:
+                record = peek(records, key, _MISSING)
+                if record is _MISSING:
+                    self.discard(key)
+                else:
+                    self.add(key, record)
+        return True
+
+    def add(self, key: str, record: dict) -> None:
+        """Index or re-index a record.
+
+        Args:
+            key: Record key.
+            record: Record contents.
+        """
+        if key in self._order:
+            self._unindex(key)
+        else:
+            self._order[key] = self._next_order
+            self._next_order += 1
+        self._index(key, record)
+
+    def discard(self, key: str) -> None:
+        """Remove a record from the index if present.
+
+        Args:
+            key: Record key.
+        """
+        if key in self._order:
+            self._unindex(key)
+            del self._order[key]
+
+    def _in_order(self, keys: Iterable[str]) -> List[str]:
+        """Sort keys by collection order."""
+        return sorted(keys, key=self._order.__getitem__)
+
+    @abc.abstractmethod
+    def _index(self, key: str, record: dict) -> None:
+        """Add a record not currently indexed to the index structures."""
+
+    @abc.abstractmethod
+    def _unindex(self, key: str) -> None:
+        """Remove an indexed record from the index structures."""
+
+
+class NgramIndex(_KeyedIndex):
+    """Character n-gram index narrowing substring queries to candidate keys.
+
+    Each record contributes the lowercased grams of the strings returned by
+    `extract`. A query of at least `n` characters can only be a substring of a
+    record whose gram set contains every query gram, so intersecting posting
+    sets yields a superset of the matches; callers still run their exact
+    predicate on the candidates, which keeps results identical to a scan.
+    """
+
+    def __init__(self, extract: Callable[[dict], Iterable[str]], n: int = 3) -> None:
+        """Initialize an empty index.
+
+        Args:
+            extract: Returns the searchable strings of a record.
+            n: Gram length.
+        """
+        super().__init__()
+        self._extract = extract
+        self._n = n
+        self._postings: Dict[str, Set[str]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+
+    def candidates(self, query: str) -> Optional[List[str]]:
+        """Return keys that may contain query, in collection order.
+
+        Args:
+            query: Substring query.
+
+        Returns:
+            Candidate keys, or None when the query is too short to narrow.
+        """
+        grams = ngrams(query.lower(), self._n)
+        if not grams:
+            return None
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        found = set(postings[0])
+        for posting in postings[1:]:
+            if not found:
+                break
+            found &= posting
+        return self._in_order(found)
+
+    def _index(self, key: str, record: dict) -> None:
+        """Record the record's grams in the postings."""
+        grams: Set[str] = set()
+        for text in self._extract(record):
+            grams |= ngrams(text.lower(), self._n)
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def _unindex(self, key: str) -> None:
+        """Drop the record's grams from the postings."""
+        for gram in self._grams.pop(key):
+            posting = self._postings[gram]
+            posting.discard(key)
+            if not posting:
+                del self._postings[gram]
+
+
+class InvertedIndex(_KeyedIndex):
+    """Token inverted index with conjunctive matching and BM25 ranking."""
+
+    def __init__(self, extract: Callable[[dict], Iterable[str]], k1: float = 1.2, b: float = 0.75) -> None:
+        """Initialize an empty index.
+
+        Args:
+            extract: Returns the searchable strings of a record.
+            k1: BM25 term-frequency saturation.
+            b: BM25 length normalization.
+        """
+        super().__init__()
+        self._extract = extract
+        self._k1 = k1
+        self._b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def match_all(self, query: str) -> List[str]:
+        """Return keys containing every query token, in collection order.
+
+        Args:
+            query: Free-text query.
+
+        Returns:
+            Matching keys; empty when the query has no tokens.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        postings = sorted((self._postings.get(term, {}) for term in terms), key=len)
+        found = set(postings[0])
+        for posting in postings[1:]:
+            if not found:
+                break
+            found.intersection_update(posting)
+        return self._in_order(found)
+
+    def rank(self, query: str) -> List[Tuple[str, float]]:
+        """Score keys containing any query token with BM25.
+
+        Args:
+            query: Free-text query.
+
+        Returns:
+            ``(key, score)`` pairs by descending score, ties in collection order.
+        """
+        docs = len(self._lengths)
+        if not docs:
+            return []
+        avg_length = self._total_length / docs or 1.0
+        k1, b = self._k1, self._b
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1.0 + (docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for key, freq in posting.items():
+                norm = k1 * (1.0 - b + b * self._lengths[key] / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * freq * (k1 + 1.0) / (freq + norm)
+        order = self._order
+        return sorted(scores.items(), key=lambda item: (-item[1], order[item[0]]))
+
+    def _index(self, key: str, record: dict) -> None:
+        """Record the record's term frequencies and length."""
+        counts: Dict[str, int] = {}
+        length = 0
+        for text in self._extract(record):
+            for term in tokenize(text):
+                counts[term] = counts.get(term, 0) + 1
+                length += 1
+        for term, freq in counts.items():
+            self._postings.setdefault(term, {})[key] = freq
+        self._terms[key] = list(counts)
+        self._lengths[key] = length
+        self._total_length += length
+
+    def _unindex(self, key: str) -> None:
+        """Drop the record's postings and length."""
+        for term in self._terms.pop(key):
+            posting = self._postings[term]
+            del posting[key]
+            if not posting:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(key)
@@ -0,0 +1,147 @@
+"""Opt-in per-tool latency and allocation statistics for `ToolRegistry`."""
+
+from __future__ import annotations
+
+import json
+import threading
+import tracemalloc
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence
+
+# Upper bounds (microseconds) of the wall-time histogram buckets; a final
+# overflow bucket collects everything slower.
+DEFAULT_BUCKETS_US: Sequence[int] = (10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 50_000, 100_000)
+
+
+class ToolStats:
+    """Aggregated statistics for one tool.
+
+    Attributes:
+        calls: Number of calls.
+        errors: Number of calls returning ``ok=False``.
+        total_ns: Summed wall time in nanoseconds.
+        min_ns: Fastest call.
+        max_ns: Slowest call.
+        buckets: Histogram counts aligned with the instrumentation's bucket bounds.
+        alloc_net_bytes: Summed net traced allocation per call.
+        alloc_peak_bytes: Largest traced allocation peak seen within one call.
+    """
+
+    __slots__ = ("calls", "errors", "total_ns", "min_ns", "max_ns", "buckets", "alloc_net_bytes", "alloc_peak_bytes")
+
+    def __init__(self, bucket_count: int) -> None:
+        """Initialize empty stats.
+
+        Args:
+            bucket_count: Number of histogram buckets including overflow.
+        """
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets: List[int] = [0] * bucket_count
+        self.alloc_net_bytes = 0
+        self.alloc_peak_bytes = 0
+
+
+class Instrumentation:
+    """Collects per-tool call counts, wall-time histograms and allocation deltas."""
+
+    def __init__(self, track_allocations: bool = False, buckets_us: Sequence[int] = DEFAULT_BUCKETS_US) -> None:
+        """Initialize the collector.
+
+        Args:
+            track_allocations: Measure tracemalloc deltas per call (starts tracing if needed).
+            buckets_us: Ascending histogram bucket upper bounds in microseconds.
+        """
+        self.track_allocations = track_allocations
+        self._bounds_ns = [bound * 1_000 for bound in buckets_us]
+        self._buckets_us = list(buckets_us)
+        self._stats: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """Begin allocation tracing when requested and not already active."""
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """Stop allocation tracing if this collector started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def record(self, tool_name: str, elapsed_ns: int, ok: bool, alloc_net: int = 0, alloc_peak: int = 0) -> None:
+        """Add one call to the aggregates.
+
+        Args:
+            tool_name: Tool that was called.
+            elapsed_ns: Wall time of the call.
+            ok: Whether the call succeeded.
+            alloc_net: Net traced bytes allocated by the call.
+            alloc_peak: Peak traced bytes above the starting point during the call.
+        """
+        bucket = bisect_left(self._bounds_ns, elapsed_ns)
+        with self._lock:
+            stats = self._stats.get(tool_name)
+            if stats is None:
+                stats = self._stats[tool_name] = ToolStats(len(self._bounds_ns) + 1)
+                stats.min_ns = elapsed_ns
+            stats.calls += 1
+            stats.errors += not ok
+            stats.total_ns += elapsed_ns
+            if elapsed_ns < stats.min_ns:
+                stats.min_ns = elapsed_ns
+            if elapsed_ns > stats.max_ns:
+                stats.max_ns = elapsed_ns
+            stats.buckets[bucket] += 1
+            stats.alloc_net_bytes += alloc_net
+            if alloc_peak > stats.alloc_peak_bytes:
+                stats.alloc_peak_bytes = alloc_peak
+
+    def reset(self) -> None:
+        """Drop every aggregate."""
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-shaped copy of the aggregates.
+
+        Returns:
+            ``{"buckets_us": [...], "tools": {name: {...}}}``; each tool's
+            ``histogram`` has one extra trailing overflow bucket.
+        """
+        with self._lock:
+            tools = {
+                name: {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "total_us": stats.total_ns / 1_000,
+                    "mean_us": stats.total_ns / stats.calls / 1_000,
+                    "min_us": stats.min_ns / 1_000,
+                    "max_us": stats.max_ns / 1_000,
+                    "histogram": list(stats.buckets),
+                    "alloc_net_bytes": stats.alloc_net_bytes,
+                    "alloc_peak_bytes": stats.alloc_peak_bytes,
+                }
+                for name, stats in self._stats.items()
+            }
+        return {"buckets_us": list(self._buckets_us), "tools": tools}
+
+    def export_json(self, path: Optional[str] = None) -> str:
+        """Serialize the snapshot, optionally writing it to a file.
+
+        Args:
+            path: Destination file; omitted to only return the text.
+
+        Returns:
+            JSON text of `snapshot()`.
+        """
+        text = json.dumps(self.snapshot(), indent=2, sort_keys=True)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(text)
+        return text
@@ -0,0 +1,139 @@
+"""Write-ahead delta journal for session state changes.
+
+When a store is created with ``journal=True`` every state mutation made by
+`messaging.send_text`, `admin.set_delivery`, `admin.set_rule`, `admin.reset`
+and the delivery processor appends one entry to the session's `Journal`::
+
+    {"seq": 3, "kind": "messaging.send_text", "now_ms": 0, "ops": [...]}
+
+Each op is a JSON list ``[op, path, arg]`` applied to the state in order:
+
+- ``["set", path, value]``: assign value at path (creating the key).
+- ``["del", path]``: delete the key at path if present.
+- ``["append", path, value]``: append value to the list at path.
+- ``["heappush", path, value]`` / ``["heappop", path]``: heap operations on
+  the list at path, matching `mock_platform.scheduler`.
+
+A ``"reset"`` entry has no ops; replaying it reseeds the state. The journal
+restarts whenever the session is restored from a snapshot, so entries always
+describe changes relative to the last restore (or session creation).
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from mock_platform.copying import clone_json
+
+Op = List[Any]
+
+
+class Journal:
+    """Append-only list of delta entries for one session."""
+
+    def __init__(self) -> None:
+        """Initialize an empty journal."""
+        self._entries: List[Dict[str, Any]] = []
+
+    def record(self, kind: str, now_ms: int, ops: List[Op]) -> int:
+        """Append an entry.
+
+        Args:
+            kind: Mutation source, usually the tool name.
+            now_ms: Logical time of the mutation.
+            ops: Ops in application order; values must not alias live state.
+
+        Returns:
+            Sequence number of the entry.
+        """
+        seq = len(self._entries)
+        self._entries.append({"seq": seq, "kind": kind, "now_ms": now_ms, "ops": ops})
+        return seq
+
+    def mark(self) -> int:
+        """Return the sequence number the next entry will get (an O(1) checkpoint)."""
+        return len(self._entries)
+
+    def entries(self, since: int = 0, until: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return entries with since <= seq < until.
+
+        Args:
+            since: First sequence number to include.
+            until: Sequence number to stop before; defaults to the end.
+
+        Returns:
+            Journal entries (shared, do not mutate).
+        """
+        return self._entries[since:until]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def apply_ops(state: Dict[str, Any], ops: Iterable[Op]) -> None:
+    """Apply journal ops to a state in place.
+
+    Args:
+        state: Session state (plain or CowMap-backed).
+        ops: Ops to apply.
+
+    Raises:
+        ValueError: If an op is unknown.
+    """
+    for op in ops:
+        kind, path = op[0], op[1]
+        if kind == "set":
+            _parent(state, path)[path[-1]] = clone_json(op[2])
+        elif kind == "del":
+            _parent(state, path).pop(path[-1], None)
+        elif kind == "append":
+            _walk(state, path).append(clone_json(op[2]))
+        elif kind == "heappush":
+            heapq.heappush(_walk(state, path), clone_json(op[2]))
+        elif kind == "heappop":
+            heapq.heappop(_walk(state, path))
+        else:
+            raise ValueError(f"Unknown journal op '{kind}'")
+
+
+def replay(
+    state: Dict[str, Any],
+    entries: Iterable[Dict[str, Any]],
+    seed: Optional[Callable[[], Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Replay journal entries onto a base state.
+
+    Args:
+        state: Base state matching the journal start; modified in place unless
+            a reset entry replaces it.
+        entries: Entries to apply, in order.
+        seed: Factory producing the seed state for ``"reset"`` entries.
+
+    Returns:
+        The resulting state.
+
+    Raises:
+        ValueError: If a reset entry is replayed without a seed factory.
+    """
+    for entry in entries:
+        if entry["kind"] == "reset":
+            if seed is None:
+                raise ValueError("Replaying a reset entry requires a seed factory")
+            state = clone_json(seed())
+        else:
+            apply_ops(state, entry["ops"])
+    return state
+
+
+def _walk(state: Dict[str, Any], path: List[Any]) -> Any:
+    """Return the value at path."""
+    node: Any = state
+    for key in path:
+        node = node[key]
+    return node
+
+
+def _parent(state: Dict[str, Any], path: List[Any]) -> Any:
+    """Return the container holding the last key of path."""
+    return _walk(state, path[:-1])
@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import asdict, dataclass, field
 from typing import Any, Dict, List, Optional
 
+from mock_platform.records import MessageRecord
+
 
 @dataclass
 class Contact:
@@ -37,6 +39,20 @@ class Message:
         """Return dict representation."""
         return asdict(self)
 
+    def to_record(self) -> MessageRecord:
+        """Return compact slotted representation."""
+        return MessageRecord(
+            self.message_id,
+            self.conversation_id,
+            dict(self.to),
+            self.text,
+            self.client_msg_id,
+            self.status,
+            self.created_ms,
+            self.updated_ms,
+            None if self.contact is None else dict(self.contact),
+        )
+
 
 @dataclass
 class Conversation:
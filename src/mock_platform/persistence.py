@@ -0,0 +1,114 @@
+"""Disk persistence for session states and snapshots.
+
+`CheckpointDirectory` stores each state as one file: an 8-byte header
+(magic + format version) followed by a pickle protocol 5 payload, which is
+considerably more compact and faster to decode than JSON for the nested
+dict/list records of a session. Files are written atomically and read
+through `mmap`, so listing or opening thousands of checkpoints touches no
+payload bytes until a state is actually loaded.
+
+The class also satisfies the `SessionSpill` protocol and can be passed as
+`EvictionPolicy(spill=CheckpointDirectory(path))`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+from urllib.parse import quote, unquote
+
+from mock_platform.cow import CowMap, materialize
+
+_MAGIC = b"MPCK"
+_VERSION = 1
+_HEADER = _MAGIC + bytes([_VERSION, 0, 0, 0])
+_SUFFIX = ".ckpt"
+
+
+class CheckpointDirectory:
+    """Directory of named, binary-encoded session states."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Open (and create if needed) a checkpoint directory.
+
+        Args:
+            path: Directory path.
+        """
+        self._path = Path(path)
+        self._path.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def path(self) -> Path:
+        """Return the directory path."""
+        return self._path
+
+    def save(self, name: str, state: Dict[str, Any]) -> Path:
+        """Write a state or snapshot under name, replacing any previous one.
+
+        Args:
+            name: Checkpoint name (any string; it is escaped for the filesystem).
+            state: Plain or CowMap-backed session state.
+
+        Returns:
+            Path of the written file.
+        """
+        if any(isinstance(value, CowMap) for value in state.values()):
+            state = materialize(state)
+        target = self._file(name)
+        fd, tmp = tempfile.mkstemp(dir=self._path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(_HEADER)
+                pickle.dump(state, handle, protocol=5)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return target
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """Load a checkpoint through a memory map.
+
+        Args:
+            name: Checkpoint name.
+
+        Returns:
+            Plain session state, or None if no such checkpoint exists.
+
+        Raises:
+            ValueError: If the file is not a checkpoint of a supported version.
+        """
+        try:
+            handle = open(self._file(name), "rb")
+        except FileNotFoundError:
+            return None
+        with handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if mapped[: len(_HEADER)] != _HEADER:
+                raise ValueError(f"'{name}' is not a version {_VERSION} checkpoint")
+            with memoryview(mapped) as view:
+                return pickle.loads(view[len(_HEADER) :])
+
+    def delete(self, name: str) -> None:
+        """Remove a checkpoint if present.
+
+        Args:
+            name: Checkpoint name.
+        """
+        self._file(name).unlink(missing_ok=True)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._file(name).exists()
+
+    def names(self) -> Iterator[str]:
+        """Yield stored checkpoint names without reading any payload."""
+        for entry in os.scandir(self._path):
+            if entry.name.endswith(_SUFFIX):
+                yield unquote(entry.name[: -len(_SUFFIX)])
+
+    def _file(self, name: str) -> Path:
+        """Return the file path for a checkpoint name."""
+        return self._path / (quote(name, safe="") + _SUFFIX)
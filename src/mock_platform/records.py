@@ -0,0 +1,271 @@
+"""Compact slotted records for large session tables.
+
+A plain message dict costs a hash table per message plus a nested ``to``
+dict. `MessageRecord` stores the same fields in ``__slots__`` and keeps
+``to`` as two slots, which cuts per-message memory several-fold. Records
+behave like mutable mappings (``record["status"]``, ``.get``), compare
+equal to the equivalent dict, and are materialized with `to_plain` at the
+`ToolResult` boundary so callers and snapshots see the usual JSON shape.
+"""
+
+from __future__ import annotations
+
+import abc
+from collections.abc import MutableMapping
+from json.encoder import encode_basestring
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class CompactRecord(MutableMapping):
+    """Fixed-key mapping backed by ``__slots__``.
+
+    Subclasses list their keys in ``_fields``; one slot per key by default.
+    Keys cannot be added or deleted. Nested values returned by item access
+    may be rebuilt on each read, so update them by assigning the whole value.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._fields:
+            raise KeyError(f"{type(self).__name__} has no field '{key}'")
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError(f"{type(self).__name__} fields cannot be deleted")
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value for key, or default for unknown keys."""
+        if key in self._fields:
+            return getattr(self, key)
+        return default
+
+    @abc.abstractmethod
+    def to_dict(self) -> Dict[str, Any]:
+        """Return an independent plain-dict copy.
+
+        Returns:
+            JSON-shaped dict with keys in field order.
+        """
+
+    @abc.abstractmethod
+    def copy(self) -> "CompactRecord":
+        """Return an independent copy of the record."""
+
+    def to_json(self) -> Optional[str]:
+        """Return compact JSON for the record when its shape allows a fast path.
+
+        Returns:
+            The text ``json.dumps(self.to_dict(), ensure_ascii=False,
+            separators=(",", ":"))`` would produce, or None when a field holds
+            a value the fast path does not handle.
+        """
+        return None
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_from_dict, (type(self), self.to_dict()))
+
+
+class MessageRecord(CompactRecord):
+    """Slotted message with the same keys as `Message.to_dict()`."""
+
+    __slots__ = (
+        "message_id",
+        "conversation_id",
+        "_to_type",
+        "_to_value",
+        "text",
+        "client_msg_id",
+        "status",
+        "created_ms",
+        "updated_ms",
+        "contact",
+    )
+    _fields = (
+        "message_id",
+        "conversation_id",
+        "to",
+        "text",
+        "client_msg_id",
+        "status",
+        "created_ms",
+        "updated_ms",
+        "contact",
+    )
+
+    def __init__(
+        self,
+        message_id: str,
+        conversation_id: str,
+        to: Dict[str, str],
+        text: str,
+        client_msg_id: str,
+        status: str,
+        created_ms: int,
+        updated_ms: int,
+        contact: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Initialize the record; arguments mirror `Message`."""
+        self.message_id = message_id
+        self.conversation_id = conversation_id
+        self.to = to
+        self.text = text
+        self.client_msg_id = client_msg_id
+        self.status = status
+        self.created_ms = created_ms
+        self.updated_ms = updated_ms
+        self.contact = contact
+
+    @property
+    def to(self) -> Dict[str, str]:
+        """Recipient as ``{"type": ..., "value": ...}`` (rebuilt per read)."""
+        return {"type": self._to_type, "value": self._to_value}
+
+    @to.setter
+    def to(self, value: Dict[str, str]) -> None:
+        if set(value) != {"type", "value"}:
+            raise ValueError("to must have exactly 'type' and 'value'")
+        self._to_type = value["type"]
+        self._to_value = value["value"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return an independent plain-dict copy.
+
+        Returns:
+            JSON-shaped dict with keys in field order.
+        """
+        contact = self.contact
+        return {
+            "message_id": self.message_id,
+            "conversation_id": self.conversation_id,
+            "to": {"type": self._to_type, "value": self._to_value},
+            "text": self.text,
+            "client_msg_id": self.client_msg_id,
+            "status": self.status,
+            "created_ms": self.created_ms,
+            "updated_ms": self.updated_ms,
+            "contact": None if contact is None else dict(contact),
+        }
+
+    def to_json(self) -> Optional[str]:
+        """Return compact JSON built directly from the slots.
+
+        Returns:
+            JSON text matching the stdlib encoding of `to_dict`, or None when a
+            field does not have its usual type (str ids/text, int timestamps,
+            contact None or ``{"contact_id": str}``).
+        """
+        contact = self.contact
+        if contact is None:
+            contact_json = "null"
+        elif type(contact) is dict and tuple(contact) == ("contact_id",) and type(contact["contact_id"]) is str:
+            contact_json = '{"contact_id":' + encode_basestring(contact["contact_id"]) + "}"
+        else:
+            return None
+        created_ms = self.created_ms
+        updated_ms = self.updated_ms
+        if type(created_ms) is not int or type(updated_ms) is not int:
+            return None
+        try:
+            return "".join(
+                (
+                    '{"message_id":',
+                    encode_basestring(self.message_id),
+                    ',"conversation_id":',
+                    encode_basestring(self.conversation_id),
+                    ',"to":{"type":',
+                    encode_basestring(self._to_type),
+                    ',"value":',
+                    encode_basestring(self._to_value),
+                    '},"text":',
+                    encode_basestring(self.text),
+                    ',"client_msg_id":',
+                    encode_basestring(self.client_msg_id),
+                    ',"status":',
+                    encode_basestring(self.status),
+                    ',"created_ms":',
+                    int.__repr__(created_ms),
+                    ',"updated_ms":',
+                    int.__repr__(updated_ms),
+                    ',"contact":',
+                    contact_json,
+                    "}",
+                )
+            )
+        except TypeError:
+            return None
+
+    def copy(self) -> "MessageRecord":
+        """Return an independent copy of the record."""
+        other = MessageRecord.__new__(MessageRecord)
+        other.message_id = self.message_id
+        other.conversation_id = self.conversation_id
+        other._to_type = self._to_type
+        other._to_value = self._to_value
+        other.text = self.text
+        other.client_msg_id = self.client_msg_id
+        other.status = self.status
+        other.created_ms = self.created_ms
+        other.updated_ms = self.updated_ms
+        other.contact = None if self.contact is None else dict(self.contact)
+        return other
+
+
+def to_plain(value: Any) -> Any:
+    """Return a plain dict for a compact record, or value unchanged.
+
+    Args:
+        value: Record, dict or any other value.
+
+    Returns:
+        ``value.to_dict()`` for compact records, else value itself.
+    """
+    if isinstance(value, CompactRecord):
+        return value.to_dict()
+    return value
+
+
+def to_compact(value: Any) -> Any:
+    """Return a `MessageRecord` for a plain message dict, or value unchanged.
+
+    Dicts whose keys are not exactly the message fields (legacy or extended
+    messages) are left as dicts.
+
+    Args:
+        value: Message dict, record or any other value.
+
+    Returns:
+        A new record for convertible message dicts, else value itself.
+    """
+    if type(value) is dict and value.keys() == _MESSAGE_KEYS:
+        to = value["to"]
+        if type(to) is dict and to.keys() == _TO_KEYS:
+            return MessageRecord(**value)
+    return value
+
+
+_MESSAGE_KEYS = frozenset(MessageRecord._fields)
+_TO_KEYS = frozenset(("type", "value"))
+
+
+def _from_dict(cls: type, data: Dict[str, Any]) -> CompactRecord:
+    """Unpickle a record from its dict form."""
+    return cls(**data)
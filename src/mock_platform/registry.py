@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
-from typing import Callable, Dict
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from mock_platform.context import ToolContext
+from mock_platform.copying import clone_json
+from mock_platform.instrumentation import Instrumentation
+from mock_platform.schema import Validator, compile_schema
 from mock_platform.tools import ToolError, ToolResult
+from mock_platform.views import freeze
 
 ToolFn = Callable[[dict, ToolContext], ToolResult]
 
@@ -13,24 +19,50 @@ ToolFn = Callable[[dict, ToolContext], ToolResult]
 class ToolRegistry:
     """Registers tools and exposes a single call entry point with uniform error handling."""
 
-    def __init__(self) -> None:
-        """Initialize an empty registry."""
+    def __init__(self, readonly_results: bool = False) -> None:
+        """Initialize an empty registry.
+
+        Args:
+            readonly_results: Wrap every result payload in a recursive read-only
+                view (see `mock_platform.views`). Stored records are returned
+                without copying but cannot be mutated through the result.
+        """
+        self._readonly_results = readonly_results
         self._tools: Dict[str, ToolFn] = {}
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._instrumentation: Optional[Instrumentation] = None
 
-    def register_tool(self, name: str, fn: ToolFn) -> None:
+    def register_tool(self, name: str, fn: ToolFn, schema: Optional[Dict[str, Any]] = None) -> None:
         """Register a tool handler.
 
         Args:
             name: Fully qualified tool name (e.g., `contacts.search`).
             fn: Callable accepting args dict and ToolContext, returning ToolResult.
+            schema: Optional argument schema (see `mock_platform.schema`). It is
+                compiled once here; calls whose args fail it get
+                `invalid_arguments` before the handler or session state is touched.
 
         Raises:
-            ValueError: If a tool with the same name already exists.
+            ValueError: If a tool with the same name already exists or the schema is unsupported.
         """
         if name in self._tools:
             raise ValueError(f"Tool '{name}' already registered")
+        if schema is not None:
+            fn = _validated(fn, compile_schema(schema))
+            self._schemas[name] = clone_json(schema)
+        if self._readonly_results:
+            fn = _frozen(fn)
         self._tools[name] = fn
 
+    def export_schemas(self) -> Dict[str, Dict[str, Any]]:
+        """Return every tool's argument schema, e.g. for agent tool definitions.
+
+        Returns:
+            Mapping of tool name to a copy of its schema; tools registered
+            without one map to ``{"type": "object"}``.
+        """
+        return {name: clone_json(self._schemas.get(name, {"type": "object"})) for name in self._tools}
+
     def call(self, tool_name: str, args: dict, ctx: ToolContext) -> ToolResult:
         """Invoke a tool by name with standardized error handling.
 
@@ -42,40 +74,202 @@ class ToolRegistry:
         Returns:
             ToolResult describing success or failure.
         """
-        if tool_name not in self._tools:
-            return ToolResult(
-                ok=False,
-                error={"code": "tool_not_found", "message": f"Tool '{tool_name}' not found", "details": None},
-            )
-
-        if not isinstance(args, dict):
-            return ToolResult(
-                ok=False,
-                error={"code": "invalid_arguments", "message": "args must be a dict", "details": None},
-            )
-
-        handler = self._tools[tool_name]
-        try:
-            result = handler(args, ctx)
-        except TypeError as exc:
-            return ToolResult(
-                ok=False,
-                error={"code": "invalid_arguments", "message": str(exc), "details": None},
-            )
-        except ToolError as exc:
-            return ToolResult(
-                ok=False,
-                error={"code": exc.code, "message": str(exc), "details": exc.details},
-            )
-        except Exception as exc:  # pylint: disable=broad-except
-            return ToolResult(
-                ok=False,
-                error={"code": "internal_error", "message": str(exc), "details": None},
-            )
-
-        if not isinstance(result, ToolResult):
-            return ToolResult(
-                ok=False,
-                error={"code": "invalid_return", "message": "Tool did not return ToolResult", "details": None},
-            )
+        handler = self._tools.get(tool_name)
+        if handler is None:
+            return _tool_not_found(tool_name)
+        return _dispatch(handler, args, ctx)
+
+    def enable_instrumentation(
+        self, instrumentation: Optional[Instrumentation] = None, track_allocations: bool = False
+    ) -> Instrumentation:
+        """Start collecting per-tool timing (and optionally allocation) stats.
+
+        The instance's `call` is swapped for a measuring variant, so a registry
+        without instrumentation runs the plain method with no extra checks.
+        Every instrumented result gets ``meta["timing"]``.
+
+        Args:
+            instrumentation: Collector to use; a new one is created when omitted.
+            track_allocations: Passed to a newly created collector.
+
+        Returns:
+            The active collector (use `snapshot()`/`export_json()` on it).
+        """
+        self.disable_instrumentation()
+        if instrumentation is None:
+            instrumentation = Instrumentation(track_allocations=track_allocations)
+        instrumentation.start()
+        self._instrumentation = instrumentation
+        self.call = self._instrumented_call  # type: ignore[method-assign]
+        return instrumentation
+
+    def disable_instrumentation(self) -> Optional[Instrumentation]:
+        """Stop collecting stats and restore the plain `call`.
+
+        Returns:
+            The collector that was active, if any, with its stats intact.
+        """
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            instrumentation.stop()
+            self._instrumentation = None
+            self.__dict__.pop("call", None)
+        return instrumentation
+
+    def _instrumented_call(self, tool_name: str, args: dict, ctx: ToolContext) -> ToolResult:
+        """`call` variant installed by `enable_instrumentation`."""
+        return _measure(self._instrumentation, tool_name, self._tools.get(tool_name), args, ctx)
+
+    def call_batch(
+        self, calls: Iterable[Tuple[str, dict]], ctx: ToolContext, stop_on_error: bool = False
+    ) -> List[ToolResult]:
+        """Invoke several tools in order against one context.
+
+        Each call gets exactly the error handling of `call`. Each distinct
+        tool is resolved once per batch into its compiled argument validator
+        and bare handler, which run without the per-call wrapper, and the
+        session is pinned (see `InMemoryStateStore.pinned`), so eviction
+        bookkeeping for it runs once rather than per call. With
+        instrumentation enabled every call in the batch is measured.
+
+        Args:
+            calls: Sequence of ``(tool_name, args)`` pairs.
+            ctx: ToolContext shared by every call.
+            stop_on_error: Stop after the first result with ``ok=False``.
+
+        Returns:
+            One ToolResult per executed call, in order.
+        """
+        tools = self._tools
+        plans: Dict[str, Tuple[Optional[ToolFn], Optional[Validator], Optional[ToolFn]]] = {}
+        results: List[ToolResult] = []
+        append = results.append
+        instrumentation = self._instrumentation
+        with ctx.state_store.pinned(ctx.session):
+            for tool_name, args in calls:
+                plan = plans.get(tool_name)
+                if plan is None:
+                    plan = plans[tool_name] = _plan(tools.get(tool_name))
+                handler, validator, fn = plan
+                if instrumentation is not None:
+                    result = _measure(instrumentation, tool_name, handler, args, ctx)
+                elif handler is None:
+                    result = _tool_not_found(tool_name)
+                elif validator is None or not isinstance(args, dict):
+                    result = _dispatch(handler, args, ctx)
+                else:
+                    try:
+                        error = validator(args)
+                    except Exception:  # pylint: disable=broad-except
+                        result = _dispatch(handler, args, ctx)
+                    else:
+                        result = _dispatch(fn, args, ctx) if error is None else _invalid_arguments(error)
+                append(result)
+                if stop_on_error and not result.ok:
+                    break
+        return results
+
+
+def _plan(handler: Optional[ToolFn]) -> Tuple[Optional[ToolFn], Optional[Validator], Optional[ToolFn]]:
+    """Split a registered handler into ``(handler, validator, bare handler)`` for `call_batch`."""
+    validator = getattr(handler, "__validator__", None)
+    if validator is None:
+        return handler, None, None
+    return handler, validator, handler.__wrapped__
+
+
+def _tool_not_found(tool_name: str) -> ToolResult:
+    """Return the standard unknown-tool error."""
+    return ToolResult(
+        ok=False,
+        error={"code": "tool_not_found", "message": f"Tool '{tool_name}' not found", "details": None},
+    )
+
+
+def _validated(fn: ToolFn, validator: Validator) -> ToolFn:
+    """Wrap a handler so its args are checked by a compiled schema first."""
+
+    def handler(args: dict, ctx: ToolContext) -> ToolResult:
+        error = validator(args)
+        if error is not None:
+            return _invalid_arguments(error)
+        return fn(args, ctx)
+
+    handler.__wrapped__ = fn  # type: ignore[attr-defined]
+    handler.__validator__ = validator  # type: ignore[attr-defined]
+    return handler
+
+
+def _invalid_arguments(message: str) -> ToolResult:
+    """Return the standard schema-validation error."""
+    return ToolResult(ok=False, error={"code": "invalid_arguments", "message": message, "details": None})
+
+
+def _frozen(fn: ToolFn) -> ToolFn:
+    """Wrap a handler so its result payload is a read-only view."""
+
+    def handler(args: dict, ctx: ToolContext) -> ToolResult:
+        result = fn(args, ctx)
+        if isinstance(result, ToolResult) and result.data is not None:
+            result.data = freeze(result.data)
         return result
+
+    handler.__wrapped__ = fn  # type: ignore[attr-defined]
+    return handler
+
+
+def _measure(
+    instrumentation: Instrumentation, tool_name: str, handler: Optional[ToolFn], args: dict, ctx: ToolContext
+) -> ToolResult:
+    """Dispatch one call, recording its wall time and allocation deltas."""
+    track = instrumentation.track_allocations and tracemalloc.is_tracing()
+    if track:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter_ns()
+    result = _tool_not_found(tool_name) if handler is None else _dispatch(handler, args, ctx)
+    elapsed_ns = time.perf_counter_ns() - start
+    timing = {"wall_us": elapsed_ns / 1_000}
+    if track:
+        current, peak = tracemalloc.get_traced_memory()
+        timing["alloc_net_bytes"] = current - before
+        timing["alloc_peak_bytes"] = peak - before
+        instrumentation.record(tool_name, elapsed_ns, result.ok, current - before, peak - before)
+    else:
+        instrumentation.record(tool_name, elapsed_ns, result.ok)
+    result.meta["timing"] = timing
+    return result
+
+
+def _dispatch(handler: ToolFn, args: dict, ctx: ToolContext) -> ToolResult:
+    """Run a handler with standardized argument checks and error handling."""
+    if not isinstance(args, dict):
+        return ToolResult(
+            ok=False,
+            error={"code": "invalid_arguments", "message": "args must be a dict", "details": None},
+        )
+
+    try:
+        result = handler(args, ctx)
+    except TypeError as exc:
+        return ToolResult(
+            ok=False,
+            error={"code": "invalid_arguments", "message": str(exc), "details": None},
+        )
+    except ToolError as exc:
+        return ToolResult(
+            ok=False,
+            error={"code": exc.code, "message": str(exc), "details": exc.details},
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        return ToolResult(
+            ok=False,
+            error={"code": "internal_error", "message": str(exc), "details": None},
+        )
+
+    if not isinstance(result, ToolResult):
+        return ToolResult(
+            ok=False,
+            error={"code": "invalid_return", "message": "Tool did not return ToolResult", "details": None},
+        )
+    return result
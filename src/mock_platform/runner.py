@@ -0,0 +1,175 @@
+"""Process-pool episode runner with fork-after-seed warm start.
+
+The parent process builds a fully registered `ToolRegistry` and an
+`InMemoryStateStore` whose seed template is already materialized, then forks
+workers that inherit both copy-on-write. Workers therefore skip imports, tool
+registration and seeding and only clone the template per episode.
+
+An episode script is a list of steps, each either
+``{"tool": name, "args": {...}}`` or ``{"advance": ms}``.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from mock_platform.context import ToolContext
+from mock_platform.cow import materialize
+from mock_platform.registry import ToolRegistry
+from mock_platform.seeds import default_state_factory
+from mock_platform.services import (
+    register_admin_tools,
+    register_contacts_tools,
+    register_memo_tools,
+    register_messaging_tools,
+)
+from mock_platform.state import Clock, InMemoryStateStore
+
+Step = Dict[str, Any]
+
+# Set in the parent right before forking; inherited by workers.
+_WORKER_ENV: Optional[Tuple[ToolRegistry, InMemoryStateStore]] = None
+
+
+def build_default_registry() -> ToolRegistry:
+    """Return a registry with every built-in tool registered.
+
+    Returns:
+        Registry exposing contacts, messaging, memo and admin tools.
+    """
+    registry = ToolRegistry()
+    register_contacts_tools(registry)
+    register_messaging_tools(registry)
+    register_admin_tools(registry)
+    register_memo_tools(registry)
+    return registry
+
+
+@dataclass
+class EpisodeResult:
+    """Outcome of one episode script.
+
+    Attributes:
+        index: Position of the episode in the submitted sequence.
+        results: `ToolResult.to_dict()` for each tool step, in order.
+        final_ms: Logical time at the end of the episode.
+        error: Error message when the script itself was malformed.
+    """
+
+    index: int
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    final_ms: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class RunReport:
+    """Results and throughput of a run.
+
+    Attributes:
+        episodes: Episode results in submission order.
+        elapsed_s: Wall time of the run in seconds.
+        calls: Total tool calls executed.
+        workers: Worker processes used (1 means in-process).
+    """
+
+    episodes: List[EpisodeResult]
+    elapsed_s: float
+    calls: int
+    workers: int
+
+    @property
+    def episodes_per_s(self) -> float:
+        """Return episode throughput."""
+        return len(self.episodes) / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def calls_per_s(self) -> float:
+        """Return tool-call throughput."""
+        return self.calls / self.elapsed_s if self.elapsed_s else 0.0
+
+
+class EpisodeRunner:
+    """Runs episode scripts across forked worker processes."""
+
+    def __init__(
+        self,
+        registry_factory: Callable[[], ToolRegistry] = build_default_registry,
+        state_factory: Callable[[], Dict[str, Any]] = default_state_factory,
+        processes: Optional[int] = None,
+    ) -> None:
+        """Build the registry and seed template in the current process.
+
+        Args:
+            registry_factory: Returns a fully registered registry.
+            state_factory: Seed factory for episode sessions.
+            processes: Worker count; defaults to the CPU count. 1 runs in-process.
+        """
+        self._registry = registry_factory()
+        self._store = InMemoryStateStore(state_factory)
+        self._store.get("__warmup__")
+        self._store.discard("__warmup__")
+        self._processes = processes or os.cpu_count() or 1
+
+    def run(self, episodes: Sequence[Sequence[Step]], chunksize: int = 16) -> RunReport:
+        """Execute episode scripts, each against its own fresh session.
+
+        Args:
+            episodes: Episode scripts.
+            chunksize: Episodes handed to a worker at a time.
+
+        Returns:
+            RunReport with results in submission order.
+        """
+        global _WORKER_ENV
+        jobs = list(enumerate(episodes))
+        start = time.perf_counter()
+        workers = min(self._processes, len(jobs)) or 1
+        if workers == 1 or "fork" not in multiprocessing.get_all_start_methods():
+            workers = 1
+            results = [_run_episode(self._registry, self._store, job) for job in jobs]
+        else:
+            _WORKER_ENV = (self._registry, self._store)
+            try:
+                with multiprocessing.get_context("fork").Pool(workers) as pool:
+                    results = pool.map(_run_in_worker, jobs, chunksize=chunksize)
+            finally:
+                _WORKER_ENV = None
+        elapsed = time.perf_counter() - start
+        calls = sum(len(result.results) for result in results)
+        return RunReport(episodes=results, elapsed_s=elapsed, calls=calls, workers=workers)
+
+
+def _run_in_worker(job: Tuple[int, Sequence[Step]]) -> EpisodeResult:
+    """Pool entry point using the environment inherited from the parent."""
+    registry, store = _WORKER_ENV
+    return _run_episode(registry, store, job)
+
+
+def _run_episode(registry: ToolRegistry, store: InMemoryStateStore, job: Tuple[int, Sequence[Step]]) -> EpisodeResult:
+    """Run one episode on a fresh session and clock."""
+    index, steps = job
+    session_id = f"episode-{index}"
+    clock = Clock()
+    ctx = ToolContext(user_id=session_id, trace_id=session_id, clock=clock, state_store=store)
+    outcome = EpisodeResult(index=index)
+    store.reset(session_id)
+    try:
+        for step in steps:
+            if "advance" in step:
+                clock.advance(step["advance"])
+            elif "tool" in step:
+                # Copy now: the payload may still reference live records that later steps mutate.
+                outcome.results.append(materialize(registry.call(step["tool"], step.get("args", {}), ctx).to_dict()))
+            else:
+                raise ValueError(f"Unknown step {step!r}")
+    except (TypeError, ValueError) as exc:
+        outcome.error = str(exc)
+    finally:
+        outcome.final_ms = clock.now_ms()
+        store.discard(session_id)
+    return outcome
@@ -0,0 +1,187 @@
+"""Heap-based delivery scheduler stored inside JSON session state.
+
+The queue lives in ``state["delivery_queue"]`` as a binary min-heap of
+``[due_ms, seq, message_id, target_status]`` lists, so it stays
+JSON-serializable and is captured by snapshots. ``state["delivery_pending"]``
+maps each message id to the sequence number of its live entry; cancelling
+only drops that mapping and the stale heap entry is skipped when it surfaces.
+
+States saved before the heap existed hold ``{"message_id", "due_ms",
+"target_status"}`` dicts in arrival order; every function here converts them
+to heap entries the first time it touches such a queue.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any, Iterable, List, Optional, Tuple
+
+# Rebuild the heap once stale (cancelled) entries outnumber live ones by this factor.
+_COMPACT_RATIO = 2
+_COMPACT_MIN = 64
+
+
+def schedule_delivery(
+    state: dict, message_id: str, due_ms: int, target_status: str = "delivered", ops: Optional[List[Any]] = None
+) -> int:
+    """Schedule a status transition for a message.
+
+    A message has at most one live entry; scheduling again supersedes it.
+
+    Args:
+        state: Session state.
+        message_id: Message to update.
+        due_ms: Logical time at which the transition becomes due.
+        target_status: Status applied when due.
+        ops: Optional journal op sink (see `mock_platform.journal`).
+
+    Returns:
+        Sequence number of the new entry.
+    """
+    queue = _heap(state, ops)
+    seq = state.get("next_delivery_seq", 1)
+    state["next_delivery_seq"] = seq + 1
+    heapq.heappush(queue, [due_ms, seq, message_id, target_status])
+    state.setdefault("delivery_pending", {})[message_id] = seq
+    if ops is not None:
+        ops.append(["set", ["next_delivery_seq"], seq + 1])
+        ops.append(["heappush", ["delivery_queue"], [due_ms, seq, message_id, target_status]])
+        ops.append(["set", ["delivery_pending", message_id], seq])
+    return seq
+
+
+def cancel_delivery(state: dict, message_id: str, ops: Optional[List[Any]] = None) -> bool:
+    """Cancel the pending entry for a message in O(1).
+
+    Args:
+        state: Session state.
+        message_id: Message whose entry should be dropped.
+        ops: Optional journal op sink.
+
+    Returns:
+        True when a pending entry existed.
+    """
+    queue = _heap(state, ops)
+    pending = state.setdefault("delivery_pending", {})
+    if message_id not in pending:
+        return False
+    del pending[message_id]
+    if ops is not None:
+        ops.append(["del", ["delivery_pending", message_id]])
+    if len(queue) > _COMPACT_MIN and len(queue) > _COMPACT_RATIO * (len(pending) + 1):
+        _compact(state, ops)
+    return True
+
+
+def pop_due(state: dict, now_ms: int, ops: Optional[List[Any]] = None) -> List[Tuple[str, str]]:
+    """Remove and return entries due at or before now_ms in due order.
+
+    Args:
+        state: Session state.
+        now_ms: Current logical time.
+        ops: Optional journal op sink.
+
+    Returns:
+        List of ``(message_id, target_status)`` pairs.
+    """
+    queue = _heap(state, ops)
+    if not queue or queue[0][0] > now_ms:
+        return []
+    pending = state.setdefault("delivery_pending", {})
+    due: List[Tuple[str, str]] = []
+    while queue and queue[0][0] <= now_ms:
+        _, seq, message_id, target_status = heapq.heappop(queue)
+        if ops is not None:
+            ops.append(["heappop", ["delivery_queue"]])
+        if pending.get(message_id) != seq:
+            continue
+        del pending[message_id]
+        if ops is not None:
+            ops.append(["del", ["delivery_pending", message_id]])
+        due.append((message_id, target_status))
+    return due
+
+
+def next_due_ms(state: dict, ops: Optional[List[Any]] = None) -> Optional[int]:
+    """Return the due time of the earliest live entry, if any.
+
+    Stale entries found at the top of the heap are discarded on the way.
+
+    Args:
+        state: Session state.
+        ops: Optional journal op sink.
+
+    Returns:
+        Due time in milliseconds, or None when nothing is pending.
+    """
+    queue = _heap(state, ops)
+    pending = state.setdefault("delivery_pending", {})
+    while queue and pending.get(queue[0][2]) != queue[0][1]:
+        heapq.heappop(queue)
+        if ops is not None:
+            ops.append(["heappop", ["delivery_queue"]])
+    return queue[0][0] if queue else None
+
+
+def _compact(state: dict, ops: Optional[List[Any]] = None) -> None:
+    """Drop cancelled entries and re-heapify."""
+    pending = state["delivery_pending"]
+    queue = [entry for entry in state["delivery_queue"] if pending.get(entry[2]) == entry[1]]
+    heapq.heapify(queue)
+    state["delivery_queue"] = queue
+    if ops is not None:
+        ops.append(["set", ["delivery_queue"], [list(entry) for entry in queue]])
+
+
+def earliest_due_ms(queue: List[Any]) -> Optional[int]:
+    """Return the due time of the earliest entry without modifying the queue.
+
+    Args:
+        queue: Delivery queue, possibly still in the legacy dict form.
+
+    Returns:
+        Due time in milliseconds, or None for an empty queue.
+    """
+    if not queue:
+        return None
+    if type(queue[0]) is dict:
+        return min(entry["due_ms"] for entry in queue)
+    return queue[0][0]
+
+
+def due_times(queue: Iterable[Any]) -> List[int]:
+    """Return the distinct due times in the queue, ascending, without modifying it.
+
+    Args:
+        queue: Delivery queue, possibly still in the legacy dict form.
+
+    Returns:
+        Sorted due times in milliseconds.
+    """
+    return sorted({entry["due_ms"] if type(entry) is dict else entry[0] for entry in queue})
+
+
+def _heap(state: dict, ops: Optional[List[Any]] = None) -> List[Any]:
+    """Return the queue heap, converting a legacy dict queue on first touch.
+
+    Legacy entries get sequence numbers in arrival order, so a later entry for
+    the same message supersedes an earlier one as with `schedule_delivery`.
+    """
+    queue = state["delivery_queue"]
+    if not queue or type(queue[0]) is not dict:
+        return queue
+    seq = state.get("next_delivery_seq", 1)
+    pending = state.setdefault("delivery_pending", {})
+    heap = []
+    for entry in queue:
+        heap.append([entry["due_ms"], seq, entry["message_id"], entry.get("target_status", "delivered")])
+        pending[entry["message_id"]] = seq
+        seq += 1
+    heapq.heapify(heap)
+    state["delivery_queue"] = heap
+    state["next_delivery_seq"] = seq
+    if ops is not None:
+        ops.append(["set", ["delivery_queue"], [list(entry) for entry in heap]])
+        ops.append(["set", ["delivery_pending"], dict(pending)])
+        ops.append(["set", ["next_delivery_seq"], seq])
+    return heap
@@ -0,0 +1,124 @@
+"""Declarative tool argument schemas compiled into validator functions.
+
+Schemas use a small JSON Schema subset so they can be exported to agents
+as-is: ``type`` (``object``, ``string``, ``integer``, ``number``,
+``boolean``, ``array``, ``null``, or a list of those), ``properties``,
+``required``, ``additionalProperties: false``, ``enum`` and ``minimum``.
+Other keywords (``description``, ``default``...) are carried along for
+export and ignored by validation.
+
+`compile_schema` walks the schema once and returns a closure chain, so a
+call only pays for the checks its schema declares.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# A validator returns None for valid input, or an error message naming the field.
+Validator = Callable[[Any], Optional[str]]
+
+_TYPES: Dict[str, Tuple[type, ...]] = {
+    "object": (dict,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "null": (type(None),),
+}
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """Compile an argument schema into a validator.
+
+    Args:
+        schema: Object schema describing a tool's args dict.
+
+    Returns:
+        Function returning None when args are valid, else an error message.
+
+    Raises:
+        ValueError: If the schema uses an unsupported type.
+    """
+    return _compile(schema, "args")
+
+
+def _compile(schema: Dict[str, Any], path: str) -> Validator:
+    """Compile one schema node found at `path`."""
+    checks: List[Validator] = []
+    type_name = schema.get("type")
+    if type_name is not None:
+        type_names = [type_name] if isinstance(type_name, str) else list(type_name)
+        for name in type_names:
+            if name not in _TYPES:
+                raise ValueError(f"Unsupported schema type '{name}' at {path}")
+        checks.append(_type_check(type_names, path))
+        if "null" in type_names:
+            # Constraints below only apply to non-null values.
+            inner = _compile({k: v for k, v in schema.items() if k != "type"}, path)
+            type_check = checks[0]
+            return lambda value: type_check(value) or (None if value is None else inner(value))
+    if "enum" in schema:
+        allowed = frozenset(schema["enum"])
+        message = f"{path} must be one of {', '.join(map(str, schema['enum']))}"
+        checks.append(lambda value: None if value in allowed else message)
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+        message = f"{path} must be >= {minimum}"
+        checks.append(lambda value: None if value >= minimum else message)
+    if type_name == "object" or "properties" in schema or "required" in schema:
+        checks.append(_object_check(schema, path))
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(value: Any) -> Optional[str]:
+        for check in checks:
+            error = check(value)
+            if error is not None:
+                return error
+        return None
+
+    return validate
+
+
+def _type_check(type_names: List[str], path: str) -> Validator:
+    """Return an isinstance check; bools are not accepted as numbers."""
+    types = tuple(t for name in type_names for t in _TYPES[name])
+    article = "an" if type_names[0][0] in "aeiou" else "a"
+    message = f"{path} must be {article} {' or '.join(type_names)}"
+    if bool in types or not {"integer", "number"} & set(type_names):
+        return lambda value: None if isinstance(value, types) else message
+    return lambda value: None if isinstance(value, types) and not isinstance(value, bool) else message
+
+
+def _object_check(schema: Dict[str, Any], path: str) -> Validator:
+    """Return a check for required keys, property values and extra keys."""
+    prefix = "" if path == "args" else path + "."
+    required = [(key, f"{prefix}{key} is required") for key in schema.get("required", ())]
+    properties = [
+        (key, _compile(sub_schema, prefix + key)) for key, sub_schema in schema.get("properties", {}).items()
+    ]
+    closed = schema.get("additionalProperties", True) is False
+    known = frozenset(schema.get("properties", {}))
+    not_object = f"{path} must be an object"
+
+    def validate(value: Dict[str, Any]) -> Optional[str]:
+        if not isinstance(value, dict):
+            return not_object
+        for key, message in required:
+            if key not in value:
+                return message
+        for key, check in properties:
+            if key in value:
+                error = check(value[key])
+                if error is not None:
+                    return error
+        if closed:
+            for key in value:
+                if key not in known:
+                    return f"{prefix}{key} is not allowed"
+        return None
+
+    return validate
@@ -28,8 +28,12 @@ def default_state_factory() -> Dict[str, Any]:
         "contacts": contacts,
         "memos": {memo_seed.memo_id: memo_seed.to_dict()},
         "messages": {},
+        "client_msg_index": {},
         "conversations": {},
+        "conversation_index": {},
         "delivery_queue": [],
+        "delivery_pending": {},
+        "next_delivery_seq": 1,
         "rules": {},
         "next_message_id": 1,
         "next_conversation_id": 1,
@@ -2,10 +2,31 @@
 
 from __future__ import annotations
 
+from mock_platform.columnar import track_message
 from mock_platform.context import ToolContext
+from mock_platform.copying import clone_json
+from mock_platform.records import to_plain
 from mock_platform.registry import ToolRegistry
+from mock_platform.scheduler import cancel_delivery
 from mock_platform.tools import ToolError, ToolResult
 
+_RESET_SCHEMA = {"type": "object", "description": "Clear session state and restore seed data.", "properties": {}}
+_SET_DELIVERY_SCHEMA = {
+    "type": "object",
+    "description": "Force a message delivery status.",
+    "properties": {
+        "message_id": {"type": "string"},
+        "status": {"type": "string", "enum": ["sent", "delivered", "failed"]},
+    },
+    "required": ["message_id", "status"],
+}
+_SET_RULE_SCHEMA = {
+    "type": "object",
+    "description": "Store a named rule (reserved for fault injection).",
+    "properties": {"name": {"type": "string"}, "value": {"description": "Any JSON value."}},
+    "required": ["name"],
+}
+
 
 def register_admin_tools(registry: ToolRegistry) -> None:
     """Register admin/maintenance tools.
@@ -13,9 +34,9 @@ def register_admin_tools(registry: ToolRegistry) -> None:
     Args:
         registry: Tool registry to mutate.
     """
-    registry.register_tool("admin.reset", reset_state)
-    registry.register_tool("admin.set_delivery", set_delivery)
-    registry.register_tool("admin.set_rule", set_rule)
+    registry.register_tool("admin.reset", reset_state, _RESET_SCHEMA)
+    registry.register_tool("admin.set_delivery", set_delivery, _SET_DELIVERY_SCHEMA)
+    registry.register_tool("admin.set_rule", set_rule, _SET_RULE_SCHEMA)
 
 
 def reset_state(args: dict, ctx: ToolContext) -> ToolResult:
@@ -36,43 +57,47 @@ def set_delivery(args: dict, ctx: ToolContext) -> ToolResult:
     """Force a message delivery status.
 
     Args:
-        args: Arguments containing message_id and status.
+        args: Arguments matching `_SET_DELIVERY_SCHEMA`: message_id and status.
         ctx: Tool invocation context.
 
     Returns:
         ToolResult with updated message or error.
     """
-    message_id = args.get("message_id")
-    status = args.get("status")
-    if not isinstance(message_id, str) or status not in {"sent", "delivered", "failed"}:
-        return ToolResult(
-            ok=False, error={"code": "invalid_arguments", "message": "message_id and status are required", "details": None}
-        )
-
+    message_id = args["message_id"]
+    status = args["status"]
     state = ctx.state_store.get(ctx.session)
     message = state["messages"].get(message_id)
     if not message:
         raise ToolError("Message not found", code="not_found")
     message["status"] = status
     message["updated_ms"] = ctx.now_ms
-    state["delivery_queue"] = [item for item in state.get("delivery_queue", []) if item["message_id"] != message_id]
-    return ToolResult(ok=True, data={"message": message})
+    track_message(ctx.state_store, ctx.session, message_id, message)
+    journal = ctx.state_store.journal(ctx.session)
+    ops = None if journal is None else [
+        ["set", ["messages", message_id, "status"], status],
+        ["set", ["messages", message_id, "updated_ms"], ctx.now_ms],
+    ]
+    cancel_delivery(state, message_id, ops)
+    if journal is not None:
+        journal.record("admin.set_delivery", ctx.now_ms, ops)
+    return ToolResult(ok=True, data={"message": to_plain(message)})
 
 
 def set_rule(args: dict, ctx: ToolContext) -> ToolResult:
     """Reserve extension point for future fault injection.
 
     Args:
-        args: Arguments containing name and value.
+        args: Arguments matching `_SET_RULE_SCHEMA`: name and value.
         ctx: Tool invocation context.
 
     Returns:
         ToolResult acknowledging the stored rule.
     """
-    name = args.get("name")
+    name = args["name"]
     value = args.get("value")
-    if not isinstance(name, str):
-        return ToolResult(ok=False, error={"code": "invalid_arguments", "message": "name is required", "details": None})
     state = ctx.state_store.get(ctx.session)
     state.setdefault("rules", {})[name] = value
+    journal = ctx.state_store.journal(ctx.session)
+    if journal is not None:
+        journal.record("admin.set_rule", ctx.now_ms, [["set", ["rules", name], clone_json(value)]])
     return ToolResult(ok=True, data={"name": name, "value": value})
@@ -2,48 +2,63 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Iterator, List, Optional
 
 from mock_platform.context import ToolContext
+from mock_platform.cow import peek
+from mock_platform.indexing import NgramIndex
 from mock_platform.registry import ToolRegistry
+from mock_platform.state import InMemoryStateStore
 from mock_platform.tools import ToolError, ToolResult
 
 
+_SEARCH_SCHEMA = {
+    "type": "object",
+    "description": "Search contacts by name or phone substring.",
+    "properties": {"q": {"type": "string", "description": "Case-insensitive substring."}},
+    "required": ["q"],
+}
+_GET_SCHEMA = {
+    "type": "object",
+    "description": "Return a contact by id.",
+    "properties": {"contact_id": {"type": "string"}},
+    "required": ["contact_id"],
+}
+
+
 def register_contacts_tools(registry: ToolRegistry) -> None:
     """Register contact-related tools.
 
     Args:
         registry: Tool registry to mutate.
     """
-    registry.register_tool("contacts.search", search_contacts)
-    registry.register_tool("contacts.get", get_contact)
+    registry.register_tool("contacts.search", search_contacts, _SEARCH_SCHEMA)
+    registry.register_tool("contacts.get", get_contact, _GET_SCHEMA)
 
 
 def search_contacts(args: dict, ctx: ToolContext) -> ToolResult:
     """Search contacts by name or phone substring.
 
+    Queries of three or more characters are narrowed through a per-session
+    trigram index before the substring check; results match a full scan,
+    including after contacts are edited in place.
+
     Args:
-        args: Arguments containing 'q'.
+        args: Arguments matching `_SEARCH_SCHEMA`.
         ctx: Tool invocation context.
 
     Returns:
-        ToolResult with contacts list or error.
+        ToolResult with contacts list.
     """
-    query = args.get("q")
-    if not isinstance(query, str):
-        return ToolResult(ok=False, error={"code": "invalid_arguments", "message": "q is required", "details": None})
-
+    query = args["q"]
     contacts = _contacts_state(ctx)
     q_lower = query.lower()
-    matches: List[dict] = []
-    for contact in contacts.values():
-        if q_lower in contact.get("name", "").lower():
-            matches.append(contact)
-            continue
-        for phone in contact.get("phones", []):
-            if q_lower in phone.get("e164", "").lower():
-                matches.append(contact)
-                break
+    index = None if len(q_lower) < _NGRAM else _contact_index(ctx.state_store, ctx.session, contacts)
+    if index is None:
+        candidates = contacts.values()
+    else:
+        candidates = [peek(contacts, contact_id) for contact_id in index.candidates(q_lower)]
+    matches: List[dict] = [contact for contact in candidates if _matches(contact, q_lower)]
     return ToolResult(ok=True, data={"contacts": matches})
 
 
@@ -51,18 +66,13 @@ def get_contact(args: dict, ctx: ToolContext) -> ToolResult:
     """Return a contact by id.
 
     Args:
-        args: Arguments containing 'contact_id'.
+        args: Arguments matching `_GET_SCHEMA`.
         ctx: Tool invocation context.
 
     Returns:
         ToolResult with contact or error.
     """
-    contact_id = args.get("contact_id")
-    if not isinstance(contact_id, str):
-        return ToolResult(
-            ok=False, error={"code": "invalid_arguments", "message": "contact_id is required", "details": None}
-        )
-
+    contact_id = args["contact_id"]
     contacts = _contacts_state(ctx)
     contact = contacts.get(contact_id)
     if not contact:
@@ -70,6 +80,64 @@ def get_contact(args: dict, ctx: ToolContext) -> ToolResult:
     return ToolResult(ok=True, data={"contact": contact})
 
 
+def upsert_contact(store: InMemoryStateStore, session_id: str, contact: dict) -> None:
+    """Insert or replace a contact and keep the search index current.
+
+    Args:
+        store: State store holding the session.
+        session_id: Session identifier.
+        contact: Contact record with at least `contact_id`.
+    """
+    contacts = store.get(session_id)["contacts"]
+    contacts[contact["contact_id"]] = contact
+    index = store.indexes(session_id).get(_INDEX_KEY)
+    if index is not None:
+        index.add(contact["contact_id"], contact)
+
+
+def remove_contact(store: InMemoryStateStore, session_id: str, contact_id: str) -> None:
+    """Remove a contact and keep the search index current.
+
+    Args:
+        store: State store holding the session.
+        session_id: Session identifier.
+        contact_id: Contact to remove.
+    """
+    store.get(session_id)["contacts"].pop(contact_id, None)
+    index = store.indexes(session_id).get(_INDEX_KEY)
+    if index is not None:
+        index.discard(contact_id)
+
+
+# Helpers
+
+_INDEX_KEY = "contacts.ngram"
+_NGRAM = 3
+
+
 def _contacts_state(ctx: ToolContext) -> dict:
     """Return contacts state for session."""
     return ctx.state_store.get(ctx.session)["contacts"]
+
+
+def _contact_index(store: InMemoryStateStore, session_id: str, contacts: dict) -> Optional[NgramIndex]:
+    """Return the session's contact trigram index synced with contacts, or None if contacts cannot be tracked."""
+    cache = store.indexes(session_id)
+    index = cache.get(_INDEX_KEY)
+    if index is None:
+        index = cache[_INDEX_KEY] = NgramIndex(_searchable_fields, n=_NGRAM)
+    return index if index.sync(contacts) else None
+
+
+def _searchable_fields(contact: dict) -> Iterator[str]:
+    """Yield the strings a contact search matches against."""
+    yield contact.get("name", "")
+    for phone in contact.get("phones", []):
+        yield phone.get("e164", "")
+
+
+def _matches(contact: dict, q_lower: str) -> bool:
+    """Return True when the contact name or a phone contains q_lower."""
+    if q_lower in contact.get("name", "").lower():
+        return True
+    return any(q_lower in phone.get("e164", "").lower() for phone in contact.get("phones", []))
@@ -2,23 +2,46 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Callable, Iterator, List, Optional
 
 from mock_platform.context import ToolContext
+from mock_platform.cow import peek
+from mock_platform.indexing import InvertedIndex, NgramIndex
 from mock_platform.models import Memo
 from mock_platform.registry import ToolRegistry
+from mock_platform.state import InMemoryStateStore
 from mock_platform.tools import ToolError, ToolResult
 
 
+_LIST_SCHEMA = {"type": "object", "description": "List memo summaries.", "properties": {}}
+_SEARCH_SCHEMA = {
+    "type": "object",
+    "description": "Search memos by title substring, or by full text with `query`.",
+    "properties": {
+        "title": {"type": "string", "description": "Case-insensitive title substring."},
+        "query": {"type": "string", "description": "Full-text words matched against title and content."},
+        "ranked": {"type": "boolean", "default": False, "description": "Order `query` hits by BM25 score."},
+        "limit": {"type": ["integer", "null"], "minimum": 1},
+        "offset": {"type": "integer", "minimum": 0, "default": 0},
+    },
+}
+_GET_SCHEMA = {
+    "type": "object",
+    "description": "Fetch a memo by id.",
+    "properties": {"memo_id": {"type": "string"}},
+    "required": ["memo_id"],
+}
+
+
 def register_memo_tools(registry: ToolRegistry) -> None:
     """Register memo tools.
 
     Args:
         registry: Tool registry to mutate.
     """
-    registry.register_tool("memo.list_memos", list_memos)
-    registry.register_tool("memo.search", search_memos)
-    registry.register_tool("memo.get_memo", get_memo)
+    registry.register_tool("memo.list_memos", list_memos, _LIST_SCHEMA)
+    registry.register_tool("memo.search", search_memos, _SEARCH_SCHEMA)
+    registry.register_tool("memo.get_memo", get_memo, _GET_SCHEMA)
 
 
 def list_memos(args: dict, ctx: ToolContext) -> ToolResult:
@@ -37,25 +60,42 @@ def list_memos(args: dict, ctx: ToolContext) -> ToolResult:
 
 
 def search_memos(args: dict, ctx: ToolContext) -> ToolResult:
-    """Search memos by title substring (case-insensitive).
+    """Search memos by title substring (case-insensitive) or by full text.
+
+    With `title` (the default mode) memos whose title contains the substring
+    are returned in memo order. With `query` the title and content are
+    searched through a per-session inverted index: memos containing every
+    query word are returned in memo order, or, with `ranked=True`, memos
+    containing any query word are returned by descending BM25 `score`.
+    `limit`/`offset` page through full-text results.
 
     Args:
-        args: Arguments containing 'title'.
+        args: Arguments matching `_SEARCH_SCHEMA`: 'title', or 'query' with optional 'ranked', 'limit', 'offset'.
         ctx: Tool invocation context.
 
     Returns:
         ToolResult with memo summaries.
     """
     title = args.get("title")
-    if not isinstance(title, str):
+    query = args.get("query")
+    if (query is None) == (title is None):
         return ToolResult(
             ok=False,
-            error={"code": "invalid_arguments", "message": "title is required", "details": None},
+            error={"code": "invalid_arguments", "message": "exactly one of title or query is required", "details": None},
         )
+    if query is not None:
+        return _search_full_text(args, query, ctx)
 
     memos = _memo_state(ctx)
     needle = title.lower()
-    matches: List[dict] = [_summary(m) for m in memos.values() if needle in m.get("title", "").lower()]
+    index = None
+    if len(needle) >= _NGRAM:
+        index = _synced(ctx, memos, _TITLE_INDEX_KEY, lambda: NgramIndex(_title_field, n=_NGRAM))
+    if index is None:
+        candidates = memos.values()
+    else:
+        candidates = [peek(memos, memo_id) for memo_id in index.candidates(needle)]
+    matches: List[dict] = [_summary(m) for m in candidates if needle in m.get("title", "").lower()]
     return ToolResult(ok=True, data={"memos": matches})
 
 
@@ -63,18 +103,13 @@ def get_memo(args: dict, ctx: ToolContext) -> ToolResult:
     """Fetch a memo by id.
 
     Args:
-        args: Arguments containing 'memo_id'.
+        args: Arguments matching `_GET_SCHEMA`.
         ctx: Tool invocation context.
 
     Returns:
         ToolResult with memo details or error.
     """
-    memo_id = args.get("memo_id")
-    if not isinstance(memo_id, str):
-        return ToolResult(
-            ok=False,
-            error={"code": "invalid_arguments", "message": "memo_id is required", "details": None},
-        )
+    memo_id = args["memo_id"]
     memos = _memo_state(ctx)
     memo = memos.get(memo_id)
     if not memo:
@@ -82,8 +117,87 @@ def get_memo(args: dict, ctx: ToolContext) -> ToolResult:
     return ToolResult(ok=True, data={"memo": memo})
 
 
+def upsert_memo(store: InMemoryStateStore, session_id: str, memo: dict) -> None:
+    """Insert or replace a memo and keep the search indexes current.
+
+    Args:
+        store: State store holding the session.
+        session_id: Session identifier.
+        memo: Memo record with at least `memo_id`, `title` and `content`.
+    """
+    store.get(session_id).setdefault("memos", {})[memo["memo_id"]] = memo
+    cache = store.indexes(session_id)
+    for key in (_TITLE_INDEX_KEY, _TEXT_INDEX_KEY):
+        if key in cache:
+            cache[key].add(memo["memo_id"], memo)
+
+
+def remove_memo(store: InMemoryStateStore, session_id: str, memo_id: str) -> None:
+    """Remove a memo and keep the search indexes current.
+
+    Args:
+        store: State store holding the session.
+        session_id: Session identifier.
+        memo_id: Memo to remove.
+    """
+    store.get(session_id).setdefault("memos", {}).pop(memo_id, None)
+    cache = store.indexes(session_id)
+    for key in (_TITLE_INDEX_KEY, _TEXT_INDEX_KEY):
+        if key in cache:
+            cache[key].discard(memo_id)
+
+
 # Helpers
 
+_TITLE_INDEX_KEY = "memo.title_ngram"
+_TEXT_INDEX_KEY = "memo.text"
+_NGRAM = 3
+
+
+def _search_full_text(args: dict, query: str, ctx: ToolContext) -> ToolResult:
+    """Run a full-text memo search over title and content.
+
+    Memos that cannot be tracked (a plain dict put into the state by hand) are
+    indexed from scratch for this query.
+    """
+    ranked = args.get("ranked", False)
+    limit = args.get("limit")
+    offset = args.get("offset", 0)
+    memos = _memo_state(ctx)
+    index = _synced(ctx, memos, _TEXT_INDEX_KEY, lambda: InvertedIndex(_text_fields))
+    if index is None:
+        index = InvertedIndex(_text_fields)
+        for memo_id, memo in memos.items():
+            index.add(memo_id, memo)
+    end = None if limit is None else offset + limit
+    if ranked:
+        hits = index.rank(query)[offset:end]
+        matches = [dict(_summary(peek(memos, memo_id)), score=score) for memo_id, score in hits]
+    else:
+        memo_ids = index.match_all(query)[offset:end]
+        matches = [_summary(peek(memos, memo_id)) for memo_id in memo_ids]
+    return ToolResult(ok=True, data={"memos": matches})
+
+
+def _synced(ctx: ToolContext, memos: dict, key: str, build: Callable[[], Any]) -> Optional[Any]:
+    """Return a session memo index by key synced with memos, or None when memos cannot be tracked."""
+    cache = ctx.state_store.indexes(ctx.session)
+    index = cache.get(key)
+    if index is None:
+        index = cache[key] = build()
+    return index if index.sync(memos) else None
+
+
+def _title_field(memo: dict) -> Iterator[str]:
+    """Yield the memo title for substring search."""
+    yield memo.get("title", "")
+
+
+def _text_fields(memo: dict) -> Iterator[str]:
+    """Yield the memo fields covered by full-text search."""
+    yield memo.get("title", "")
+    yield memo.get("content", "")
+
 
 def _memo_state(ctx: ToolContext) -> dict:
     """Return memos state for session."""
@@ -2,14 +2,55 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right
 from typing import Dict, List, Optional, Tuple
 
+from mock_platform.columnar import track_message
 from mock_platform.context import ToolContext
+from mock_platform.copying import clone_json
+from mock_platform.cow import peek
 from mock_platform.models import Conversation, Message
+from mock_platform.records import to_plain
 from mock_platform.registry import ToolRegistry
+from mock_platform.scheduler import due_times, earliest_due_ms, pop_due, schedule_delivery
+from mock_platform.state import Clock, InMemoryStateStore, SessionHook, TimerHandle
 from mock_platform.tools import ToolError, ToolResult
 
-_clock_listener_keys = set()
+
+_SEND_TEXT_SCHEMA = {
+    "type": "object",
+    "description": "Send a text message; delivery happens after the configured delay.",
+    "properties": {
+        "to": {
+            "type": "object",
+            "properties": {
+                "type": {"type": "string", "enum": ["contact_id", "e164"]},
+                "value": {"type": "string"},
+            },
+            "required": ["type", "value"],
+        },
+        "text": {"type": "string"},
+        "client_msg_id": {"type": "string", "description": "Idempotency key; repeats return the original message."},
+    },
+    "required": ["to", "text", "client_msg_id"],
+}
+_GET_MESSAGE_SCHEMA = {
+    "type": "object",
+    "description": "Return message details.",
+    "properties": {"message_id": {"type": "string"}},
+    "required": ["message_id"],
+}
+_LIST_MESSAGES_SCHEMA = {
+    "type": "object",
+    "description": "List a conversation's messages oldest to newest, one page at a time.",
+    "properties": {
+        "conversation_id": {"type": "string"},
+        "limit": {"type": "integer", "minimum": 1, "default": 50},
+        "before": {"type": ["string", "null"], "description": "Cursor to page back in time; excludes `after`."},
+        "after": {"type": ["string", "null"], "description": "Cursor to page forward; excludes `before`."},
+    },
+    "required": ["conversation_id"],
+}
 
 
 def register_messaging_tools(registry: ToolRegistry) -> None:
@@ -18,45 +59,51 @@ def register_messaging_tools(registry: ToolRegistry) -> None:
     Args:
         registry: Tool registry to mutate.
     """
-    registry.register_tool("messaging.send_text", send_text)
-    registry.register_tool("messaging.get_message", get_message)
-    registry.register_tool("messaging.list_messages", list_messages)
+    registry.register_tool("messaging.send_text", send_text, _SEND_TEXT_SCHEMA)
+    registry.register_tool("messaging.get_message", get_message, _GET_MESSAGE_SCHEMA)
+    registry.register_tool("messaging.list_messages", list_messages, _LIST_MESSAGES_SCHEMA)
 
 
 def send_text(args: dict, ctx: ToolContext) -> ToolResult:
     """Send a text message and schedule delivery via the logical clock.
 
+    Sends are idempotent on client_msg_id: a repeated id returns the original
+    message and conversation ids (with the message's current status) and
+    `meta["deduplicated"] = True`, without creating a message or delivery.
+
     Args:
-        args: Arguments containing to, text, client_msg_id.
+        args: Arguments matching `_SEND_TEXT_SCHEMA`: to, text, client_msg_id.
         ctx: Tool invocation context.
 
     Returns:
         ToolResult with identifiers and status.
     """
-    to = args.get("to")
-    text = args.get("text")
-    client_msg_id = args.get("client_msg_id")
-
-    if not isinstance(to, dict) or not isinstance(text, str) or not isinstance(client_msg_id, str):
-        return ToolResult(
-            ok=False,
-            error={"code": "invalid_arguments", "message": "to, text, client_msg_id are required", "details": None},
-        )
+    to = args["to"]
+    text = args["text"]
+    client_msg_id = args["client_msg_id"]
+    to_type = to["type"]
+    to_value = to["value"]
 
-    to_type = to.get("type")
-    to_value = to.get("value")
-    if to_type not in ("contact_id", "e164") or not isinstance(to_value, str):
+    state = ctx.state_store.get(ctx.session)
+    dedup_index = _client_msg_index(state)
+    existing_id = dedup_index.get(client_msg_id)
+    if existing_id is not None and existing_id in state["messages"]:
+        existing = state["messages"][existing_id]
         return ToolResult(
-            ok=False,
-            error={"code": "invalid_arguments", "message": "to must include type and value", "details": None},
+            ok=True,
+            data={
+                "message_id": existing_id,
+                "conversation_id": existing["conversation_id"],
+                "status": existing["status"],
+            },
+            meta={"deduplicated": True},
         )
 
-    state = ctx.state_store.get(ctx.session)
-    _ensure_clock_listener(ctx)
-
     resolved_e164, contact_ref = _resolve_recipient(state, to_type, to_value)
 
-    conversation_id = _ensure_conversation(state, resolved_e164, ctx.now_ms)
+    journal = ctx.state_store.journal(ctx.session)
+    ops = None if journal is None else []
+    conversation_id = _ensure_conversation(state, resolved_e164, ctx.now_ms, ops)
     message_id, message = _create_message(
         state,
         conversation_id,
@@ -65,8 +112,17 @@ def send_text(args: dict, ctx: ToolContext) -> ToolResult:
         client_msg_id,
         contact_ref,
         ctx.now_ms,
+        ops,
+        compact=ctx.state_store.compact_records,
     )
-    _schedule_delivery(state, message_id, ctx.now_ms, state["delivery_delay_ms"])
+    due_ms = ctx.now_ms + state["delivery_delay_ms"]
+    schedule_delivery(state, message_id, due_ms, ops=ops)
+    dedup_index[client_msg_id] = message_id
+    track_message(ctx.state_store, ctx.session, message_id, message)
+    if journal is not None:
+        ops.append(["set", ["client_msg_index", client_msg_id], message_id])
+        journal.record("messaging.send_text", ctx.now_ms, ops)
+    _delivery_timer(ctx).ensure(due_ms)
 
     return ToolResult(
         ok=True,
@@ -78,78 +134,82 @@ def get_message(args: dict, ctx: ToolContext) -> ToolResult:
     """Return message details.
 
     Args:
-        args: Arguments containing message_id.
+        args: Arguments matching `_GET_MESSAGE_SCHEMA`.
         ctx: Tool invocation context.
 
     Returns:
         ToolResult with message or error.
     """
-    message_id = args.get("message_id")
-    if not isinstance(message_id, str):
-        return ToolResult(
-            ok=False, error={"code": "invalid_arguments", "message": "message_id is required", "details": None}
-        )
-
+    message_id = args["message_id"]
     state = ctx.state_store.get(ctx.session)
     message = state["messages"].get(message_id)
     if not message:
         raise ToolError("Message not found", code="not_found")
-    return ToolResult(ok=True, data={"message": message})
+    return ToolResult(ok=True, data={"message": to_plain(message)})
 
 
 def list_messages(args: dict, ctx: ToolContext) -> ToolResult:
-    """List messages for a conversation.
+    """List messages for a conversation, one page at a time.
+
+    Pages are ordered oldest to newest. Without a cursor the newest `limit`
+    messages are returned. Cursors are opaque positions in the conversation:
+    pass a previous `next_cursor` as `before` to walk back in time, or as
+    `after` when paging forward from an `after` cursor. Each page indexes the
+    conversation's message-id list directly, so it costs O(limit).
 
     Args:
-        args: Arguments containing conversation_id and optional limit.
+        args: Arguments matching `_LIST_MESSAGES_SCHEMA`: conversation_id and optional limit, before, after.
         ctx: Tool invocation context.
 
     Returns:
-        ToolResult with ordered messages or error.
+        ToolResult with ordered messages and next_cursor (None when exhausted), or error.
     """
-    conversation_id = args.get("conversation_id")
+    conversation_id = args["conversation_id"]
     limit = args.get("limit", 50)
-    if not isinstance(conversation_id, str):
-        return ToolResult(
-            ok=False, error={"code": "invalid_arguments", "message": "conversation_id is required", "details": None}
-        )
-    if not isinstance(limit, int) or limit <= 0:
+    before = args.get("before")
+    after = args.get("after")
+    if before is not None and after is not None:
         return ToolResult(
-            ok=False, error={"code": "invalid_arguments", "message": "limit must be a positive int", "details": None}
+            ok=False,
+            error={"code": "invalid_arguments", "message": "before and after are mutually exclusive", "details": None},
         )
 
     state = ctx.state_store.get(ctx.session)
-    conversation = state["conversations"].get(conversation_id)
+    conversation = peek(state["conversations"], conversation_id)
     if not conversation:
         raise ToolError("Conversation not found", code="not_found")
 
     message_ids: List[str] = conversation.get("messages", [])
-    messages = [state["messages"][mid] for mid in message_ids][-limit:]
-    return ToolResult(ok=True, data={"messages": messages})
-
+    total = len(message_ids)
+    if after is not None:
+        start = _parse_cursor(after, total)
+        end = min(start + limit, total)
+        next_cursor = str(end) if end < total else None
+    else:
+        end = total if before is None else _parse_cursor(before, total)
+        start = max(end - limit, 0)
+        next_cursor = str(start) if start > 0 else None
 
-# Helpers
+    messages_state = state["messages"]
+    messages = [to_plain(messages_state[message_ids[pos]]) for pos in range(start, end)]
+    return ToolResult(ok=True, data={"messages": messages, "next_cursor": next_cursor})
 
 
-def _ensure_clock_listener(ctx: ToolContext) -> None:
-    """Attach delivery queue processing to the session clock."""
-    key = (ctx.session, id(ctx.clock))
-    if key in _clock_listener_keys:
-        return
+# Helpers
 
-    def _on_advance(now_ms: int) -> None:
-        _process_delivery_queue(ctx.session, ctx.state_store, now_ms)
 
-    ctx.clock.add_listener(_on_advance)
-    _clock_listener_keys.add(key)
+def _parse_cursor(cursor: object, total: int) -> int:
+    """Decode a list_messages cursor into a position within [0, total]."""
+    if not isinstance(cursor, str) or not (cursor.isascii() and cursor.isdigit()) or int(cursor) > total:
+        raise ToolError("Invalid cursor", code="invalid_arguments", details={"cursor": cursor})
+    return int(cursor)
 
 
 def _resolve_recipient(state: dict, to_type: str, to_value: str) -> Tuple[str, Optional[dict]]:
     """Resolve recipient to e164 and optional contact reference."""
     if to_type == "e164":
         return to_value, None
-    contacts = state["contacts"]
-    contact = contacts.get(to_value)
+    contact = peek(state["contacts"], to_value)
     if not contact:
         raise ToolError("Contact not found", code="not_found")
     phones = contact.get("phones", [])
@@ -158,12 +218,15 @@ def _resolve_recipient(state: dict, to_type: str, to_value: str) -> Tuple[str, O
     return phones[0].get("e164"), {"contact_id": contact["contact_id"]}
 
 
-def _ensure_conversation(state: dict, to_e164: str, now_ms: int) -> str:
-    """Find or create a conversation for the peer."""
-    for conv in state["conversations"].values():
-        if conv.get("peer") == to_e164:
-            conv["updated_ms"] = now_ms
-            return conv["conversation_id"]
+def _ensure_conversation(state: dict, to_e164: str, now_ms: int, ops: Optional[list] = None) -> str:
+    """Find or create a conversation for the peer via the peer index."""
+    index = _conversation_index(state)
+    conversation_id = index.get(to_e164)
+    if conversation_id is not None and conversation_id in state["conversations"]:
+        state["conversations"][conversation_id]["updated_ms"] = now_ms
+        if ops is not None:
+            ops.append(["set", ["conversations", conversation_id, "updated_ms"], now_ms])
+        return conversation_id
     conversation_id = f"c{state['next_conversation_id']}"
     state["next_conversation_id"] += 1
     conv = Conversation(
@@ -175,9 +238,36 @@ def _ensure_conversation(state: dict, to_e164: str, now_ms: int) -> str:
         updated_ms=now_ms,
     ).to_dict()
     state["conversations"][conversation_id] = conv
+    index[to_e164] = conversation_id
+    if ops is not None:
+        ops.append(["set", ["next_conversation_id"], state["next_conversation_id"]])
+        ops.append(["set", ["conversations", conversation_id], clone_json(conv)])
+        ops.append(["set", ["conversation_index", to_e164], conversation_id])
     return conversation_id
 
 
+def _conversation_index(state: dict) -> dict:
+    """Return the peer -> conversation_id index, rebuilding it for states that predate it."""
+    index = state.get("conversation_index")
+    if index is None:
+        index = {}
+        for conv in state["conversations"].values():
+            index.setdefault(conv["peer"], conv["conversation_id"])
+        state["conversation_index"] = index
+    return index
+
+
+def _client_msg_index(state: dict) -> dict:
+    """Return the client_msg_id -> message_id index, rebuilding it for states that predate it."""
+    index = state.get("client_msg_index")
+    if index is None:
+        index = {}
+        for message in state["messages"].values():
+            index.setdefault(message["client_msg_id"], message["message_id"])
+        state["client_msg_index"] = index
+    return index
+
+
 def _create_message(
     state: dict,
     conversation_id: str,
@@ -186,11 +276,13 @@ def _create_message(
     client_msg_id: str,
     contact_ref: Optional[dict],
     now_ms: int,
+    ops: Optional[list] = None,
+    compact: bool = False,
 ) -> Tuple[str, Dict[str, object]]:
-    """Create and store a message."""
+    """Create and store a message, as a slotted record when compact."""
     message_id = f"m{state['next_message_id']}"
     state["next_message_id"] += 1
-    message = Message(
+    entity = Message(
         message_id=message_id,
         conversation_id=conversation_id,
         to={"type": "e164", "value": to_e164},
@@ -200,32 +292,125 @@ def _create_message(
         created_ms=now_ms,
         updated_ms=now_ms,
         contact=contact_ref,
-    ).to_dict()
+    )
+    message = entity.to_record() if compact else entity.to_dict()
     state["messages"][message_id] = message
     state["conversations"][conversation_id]["messages"].append(message_id)
     state["conversations"][conversation_id]["updated_ms"] = now_ms
+    if ops is not None:
+        ops.append(["set", ["next_message_id"], state["next_message_id"]])
+        ops.append(["set", ["messages", message_id], message.to_dict() if compact else clone_json(message)])
+        ops.append(["append", ["conversations", conversation_id, "messages"], message_id])
+        ops.append(["set", ["conversations", conversation_id, "updated_ms"], now_ms])
     return message_id, message
 
 
-def _schedule_delivery(state: dict, message_id: str, now_ms: int, delay_ms: int) -> None:
-    """Schedule a delivery update for a message."""
-    due_ms = now_ms + delay_ms
-    state["delivery_queue"].append(
-        {"message_id": message_id, "due_ms": due_ms, "target_status": "delivered"}
-    )
+class _DeliveryTimer(SessionHook):
+    """Keeps one clock timer armed at the earliest entry of a session's delivery queue.
 
+    The timer is a session hook, so it is re-armed from the restored queue
+    whenever a restore or reset replaces the state and queued messages are
+    delivered on the next advance that reaches their due time.
 
-def _process_delivery_queue(session_id: str, store, now_ms: int) -> None:
-    """Promote messages whose due time has passed."""
-    state = store.get(session_id)
-    queue: List[dict] = state.get("delivery_queue", [])
-    remaining: List[dict] = []
-    for item in queue:
-        if item["due_ms"] <= now_ms:
-            message = state["messages"].get(item["message_id"])
-            if message and message.get("status") == "sent":
-                message["status"] = item["target_status"]
-                message["updated_ms"] = now_ms
-        else:
-            remaining.append(item)
-    state["delivery_queue"] = remaining
+    Evicted sessions are never reseeded or touched by the timer. While a
+    session is spilled the timer keeps stepping through its queued due times
+    and records the advance times that reached them; on rehydration those
+    deliveries are applied with the recorded times, as if the session had
+    stayed resident.
+    """
+
+    def __init__(self, clock: Clock, store: InMemoryStateStore, session_id: str) -> None:
+        """Initialize an unarmed timer.
+
+        Args:
+            clock: Clock whose advances deliver messages.
+            store: State store holding the session.
+            session_id: Session identifier.
+        """
+        self._clock = clock
+        self._store = store
+        self._session_id = session_id
+        self._handle: Optional[TimerHandle] = None
+        self._spilled_dues: Optional[List[int]] = None
+        self._missed: List[int] = []
+
+    def ensure(self, due_ms: int) -> None:
+        """Make sure the timer fires no later than due_ms.
+
+        Args:
+            due_ms: Due time of a newly queued delivery.
+        """
+        if self._handle is None or self._handle.due_ms > due_ms:
+            self._arm(due_ms)
+
+    def installed(self, state: dict) -> None:
+        """Re-arm for the replaced state's queue."""
+        self._spilled_dues = None
+        self._missed = []
+        self._arm(earliest_due_ms(peek(state, "delivery_queue")))
+
+    def evicted(self, state: dict) -> None:
+        """Remember the spilled queue's due times so advances keep being tracked."""
+        self._spilled_dues = due_times(peek(state, "delivery_queue"))
+        self._missed = []
+        self._arm(self._spilled_dues[0] if self._spilled_dues else None)
+
+    def rehydrated(self, state: dict) -> None:
+        """Apply the deliveries that came due while the session was spilled."""
+        for now_ms in self._missed:
+            _deliver_due(self._store, self._session_id, state, now_ms)
+        self.installed(state)
+
+    def discarded(self) -> None:
+        """Stop firing for a discarded session."""
+        self._arm(None)
+
+    def _arm(self, due_ms: Optional[int]) -> None:
+        """Replace the pending clock timer; None leaves the timer unarmed."""
+        if self._handle is not None:
+            self._clock.cancel(self._handle)
+            self._handle = None
+        if due_ms is not None:
+            self._handle = self._clock.schedule(due_ms, self._fire)
+
+    def _fire(self, now_ms: int) -> None:
+        """Clock callback promoting due messages, then re-arming for the rest of the queue."""
+        self._handle = None
+        state = self._store.resident(self._session_id)
+        if state is not None:
+            _deliver_due(self._store, self._session_id, state, now_ms)
+            self.installed(state)
+        elif self._spilled_dues is not None:
+            self._missed.append(now_ms)
+            del self._spilled_dues[: bisect_right(self._spilled_dues, now_ms)]
+            self._arm(self._spilled_dues[0] if self._spilled_dues else None)
+
+
+def _delivery_timer(ctx: ToolContext) -> _DeliveryTimer:
+    """Return the delivery timer of the context's session and clock, creating it on first use."""
+    hooks = ctx.state_store.session_hooks(ctx.session)
+    key = ("messaging.delivery", ctx.clock)
+    timer = hooks.get(key)
+    if timer is None:
+        timer = hooks[key] = _DeliveryTimer(ctx.clock, ctx.state_store, ctx.session)
+    return timer
+
+
+def _deliver_due(store, session_id: str, state: dict, now_ms: int) -> None:
+    """Promote messages whose due time has passed, journaling the changes."""
+    due_ms = earliest_due_ms(peek(state, "delivery_queue"))
+    if due_ms is None or due_ms > now_ms:
+        return
+    journal = store.journal(session_id)
+    ops = None if journal is None else []
+    for message_id, target_status in pop_due(state, now_ms, ops):
+        message = state["messages"].get(message_id)
+        if message and message.get("status") == "sent":
+            message["status"] = target_status
+            message["updated_ms"] = now_ms
+            track_message(store, session_id, message_id, message)
+            if ops is not None:
+                ops.append(["set", ["messages", message_id, "status"], target_status])
+                ops.append(["set", ["messages", message_id, "updated_ms"], now_ms])
+    if ops:
+        journal.record("delivery", now_ms, ops)
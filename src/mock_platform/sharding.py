@@ -0,0 +1,248 @@
+"""Sharded multi-process front-end with session affinity.
+
+`ShardedToolRegistry` hashes `ToolContext.session` onto one of N worker
+processes. Each worker owns a full `ToolRegistry` and `InMemoryStateStore`
+and runs handlers locally; requests travel over `multiprocessing` pipes, so
+everything stays on the local machine. The caller's clock is authoritative:
+each worker keeps a mirror clock per caller `Clock`, and every advance of a
+caller clock is forwarded (one-way, in pipe order) to the shards whose
+sessions use it, so deliveries fire at the same logical times as with a
+local registry and are visible to `get_state`/`snapshot` without a call.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import weakref
+import zlib
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from mock_platform.context import ToolContext
+from mock_platform.registry import ToolRegistry
+from mock_platform.runner import build_default_registry
+from mock_platform.seeds import default_state_factory
+from mock_platform.state import Clock, InMemoryStateStore
+from mock_platform.tools import ToolResult
+
+
+class ShardedToolRegistry:
+    """Drop-in `call` front-end that routes sessions to worker processes.
+
+    `ctx.clock` supplies the logical time (its advances are forwarded to the
+    workers from the first call that uses it on); `ctx.state_store` is not
+    used because session state lives in the owning worker. Use `snapshot`, `restore`,
+    `reset` and `get_state` for store operations on a session.
+    """
+
+    def __init__(
+        self,
+        shards: int,
+        registry_factory: Callable[[], ToolRegistry] = build_default_registry,
+        state_factory: Callable[[], Dict[str, Any]] = default_state_factory,
+        start_method: Optional[str] = None,
+    ) -> None:
+        """Start the worker processes.
+
+        Args:
+            shards: Number of worker processes.
+            registry_factory: Returns a fully registered registry (must be picklable
+                for non-fork start methods).
+            state_factory: Seed factory for worker stores.
+            start_method: multiprocessing start method; defaults to fork when available.
+
+        Raises:
+            ValueError: If shards is not positive.
+        """
+        if shards <= 0:
+            raise ValueError("shards must be positive")
+        if start_method is None:
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        mp = multiprocessing.get_context(start_method)
+        self._conns = []
+        self._locks = []
+        self._procs = []
+        for _ in range(shards):
+            parent_conn, child_conn = mp.Pipe()
+            proc = mp.Process(target=_serve, args=(child_conn, registry_factory, state_factory), daemon=True)
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._locks.append(threading.Lock())
+            self._procs.append(proc)
+        self._closed = False
+        self._clock_lock = threading.Lock()
+        self._clock_tokens: "weakref.WeakKeyDictionary[Clock, int]" = weakref.WeakKeyDictionary()
+        self._clock_shards: List[Set[int]] = []
+        self._forwarders: List[Callable[[int], None]] = []
+
+    @property
+    def shards(self) -> int:
+        """Return the number of worker processes."""
+        return len(self._conns)
+
+    def shard_for(self, session_id: str) -> int:
+        """Return the shard owning a session (stable across runs).
+
+        Args:
+            session_id: Session identifier.
+
+        Returns:
+            Shard index.
+        """
+        return zlib.crc32(session_id.encode("utf-8")) % len(self._conns)
+
+    def call(self, tool_name: str, args: dict, ctx: ToolContext) -> ToolResult:
+        """Invoke a tool on the worker owning ctx.session.
+
+        Args:
+            tool_name: Registered tool name.
+            args: Arguments dictionary.
+            ctx: ToolContext for the invocation.
+
+        Returns:
+            ToolResult describing success or failure.
+        """
+        token = self._clock_token(ctx.clock)
+        self._clock_shards[token].add(self.shard_for(ctx.session))
+        payload = (tool_name, args, ctx.session, ctx.user_id, ctx.trace_id, token, ctx.now_ms)
+        return self._request(ctx.session, "call", payload)
+
+    def snapshot(self, session_id: str) -> Dict[str, Any]:
+        """Return a snapshot of a session from its worker."""
+        return self._request(session_id, "snapshot", session_id)
+
+    def restore(self, session_id: str, snapshot: Dict[str, Any]) -> None:
+        """Restore a session on its worker."""
+        self._request(session_id, "restore", (session_id, snapshot))
+
+    def reset(self, session_id: str) -> None:
+        """Reset a session on its worker."""
+        self._request(session_id, "reset", session_id)
+
+    def get_state(self, session_id: str) -> Dict[str, Any]:
+        """Return a copy of a session's current state."""
+        return self._request(session_id, "get", session_id)
+
+    def close(self) -> None:
+        """Stop all workers."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._clock_lock:
+            for clock, token in list(self._clock_tokens.items()):
+                clock.remove_listener(self._forwarders[token])
+        for conn, lock in zip(self._conns, self._locks):
+            with lock:
+                try:
+                    conn.send(("close", None))
+                except (BrokenPipeError, OSError):
+                    pass
+                conn.close()
+        for proc in self._procs:
+            proc.join(timeout=5)
+
+    def __enter__(self) -> "ShardedToolRegistry":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _clock_token(self, clock: Clock) -> int:
+        """Return the token identifying a caller clock to workers, forwarding its advances."""
+        token = self._clock_tokens.get(clock)
+        if token is None:
+            with self._clock_lock:
+                token = self._clock_tokens.get(clock)
+                if token is None:
+                    token = len(self._forwarders)
+                    self._clock_shards.append(set())
+                    self._forwarders.append(partial(self._forward_advance, token))
+                    self._clock_tokens[clock] = token
+                    clock.add_listener(self._forwarders[token])
+        return token
+
+    def _forward_advance(self, token: int, now_ms: int) -> None:
+        """Clock listener sending an advance to every shard that has seen the clock."""
+        if self._closed:
+            return
+        for shard in sorted(self._clock_shards[token]):
+            with self._locks[shard]:
+                self._conns[shard].send(("advance", (token, now_ms)))
+
+    def _request(self, session_id: str, op: str, payload: Any) -> Any:
+        """Send a request to the owning shard and wait for its reply."""
+        if self._closed:
+            raise RuntimeError("ShardedToolRegistry is closed")
+        shard = self.shard_for(session_id)
+        conn = self._conns[shard]
+        with self._locks[shard]:
+            conn.send((op, payload))
+            ok, value = conn.recv()
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+
+def _serve(conn, registry_factory: Callable[[], ToolRegistry], state_factory: Callable[[], Dict[str, Any]]) -> None:
+    """Worker loop: own a registry and store, answer requests until closed."""
+    registry = registry_factory()
+    store = InMemoryStateStore(state_factory)
+    clocks: Dict[int, Clock] = {}
+    failure: Optional[str] = None
+    while True:
+        try:
+            op, payload = conn.recv()
+        except EOFError:
+            return
+        if op == "close":
+            return
+        if op == "advance":
+            # One-way message: a failure is reported in place of the next reply.
+            try:
+                _advance(clocks, *payload)
+            except Exception as exc:  # pylint: disable=broad-except
+                failure = failure or f"{type(exc).__name__} during clock advance: {exc}"
+            continue
+        if failure is not None:
+            conn.send((False, failure))
+            failure = None
+            continue
+        try:
+            value = _handle(op, payload, registry, store, clocks)
+        except Exception as exc:  # pylint: disable=broad-except
+            conn.send((False, f"{type(exc).__name__}: {exc}"))
+            continue
+        conn.send((True, value))
+
+
+def _advance(clocks: Dict[int, Clock], token: int, now_ms: int) -> Clock:
+    """Bring the mirror of a caller clock up to now_ms, firing due timers."""
+    clock = clocks.get(token)
+    if clock is None:
+        clock = clocks[token] = Clock(start_ms=now_ms)
+    elif now_ms > clock.now_ms():
+        clock.advance(now_ms - clock.now_ms())
+    return clock
+
+
+def _handle(op: str, payload: Any, registry: ToolRegistry, store: InMemoryStateStore, clocks: Dict[int, Clock]) -> Any:
+    """Execute one worker request."""
+    if op == "call":
+        tool_name, args, session_id, user_id, trace_id, token, now_ms = payload
+        clock = _advance(clocks, token, now_ms)
+        ctx = ToolContext(user_id=user_id, trace_id=trace_id, clock=clock, state_store=store, session_id=session_id)
+        return registry.call(tool_name, args, ctx)
+    if op == "snapshot":
+        return store.snapshot(payload)
+    if op == "restore":
+        session_id, snapshot = payload
+        store.restore(session_id, snapshot)
+        return None
+    if op == "reset":
+        store.reset(payload)
+        return None
+    if op == "get":
+        return store.get(payload)
+    raise ValueError(f"Unknown op '{op}'")
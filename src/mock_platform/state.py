@@ -2,12 +2,52 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import copy
-from typing import Any, Callable, Dict, List
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Set, Tuple
+
+from mock_platform.copying import clone_json
+from mock_platform.cow import CowMap, fork_state, materialize, to_cow_state
+from mock_platform.journal import Journal
+from mock_platform.records import to_compact
+from mock_platform.tracking import track_state
+
+SNAPSHOT_MODES = ("deepcopy", "cow")
+
+
+class TimerHandle:
+    """Handle for an event scheduled on a Clock."""
+
+    __slots__ = ("due_ms", "callback", "cancelled")
+
+    def __init__(self, due_ms: int, callback: Callable[[int], None]) -> None:
+        """Initialize handle.
+
+        Args:
+            due_ms: Logical time at which the callback fires.
+            callback: Callback accepting the current logical time in milliseconds.
+        """
+        self.due_ms = due_ms
+        self.callback = callback
+        self.cancelled = False
 
 
 class Clock:
-    """Logical clock that drives asynchronous events."""
+    """Logical clock that drives asynchronous events.
+
+    Scheduled callbacks live in a single min-heap keyed on due time, so
+    `advance` only touches events that are actually due, independent of how
+    many sessions share the clock. The heap is guarded by a lock that is
+    released before callbacks run, so callbacks may schedule timers or take
+    session locks from any thread.
+    """
 
     def __init__(self, start_ms: int = 0) -> None:
         """Initialize clock.
@@ -17,6 +57,9 @@ class Clock:
         """
         self._now = start_ms
         self._listeners: List[Callable[[int], None]] = []
+        self._timers: List[Tuple[int, int, TimerHandle]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
 
     def now_ms(self) -> int:
         """Return current logical time.
@@ -27,7 +70,10 @@ class Clock:
         return self._now
 
     def advance(self, ms: int) -> int:
-        """Advance clock and trigger listeners.
+        """Advance clock, fire due timers in due order, then trigger listeners.
+
+        Timers scheduled by a callback fire in the same advance when they are
+        already due.
 
         Args:
             ms: Milliseconds to advance; must be non-negative.
@@ -40,32 +86,334 @@ class Clock:
         """
         if ms < 0:
             raise ValueError("Cannot advance clock by negative milliseconds")
-        self._now += ms
+        with self._lock:
+            self._now += ms
+            now = self._now
+        timers = self._timers
+        while True:
+            with self._lock:
+                due = []
+                while timers and timers[0][0] <= now:
+                    due.append(heapq.heappop(timers)[2])
+            if not due:
+                break
+            for handle in due:
+                if not handle.cancelled:
+                    handle.cancelled = True
+                    handle.callback(now)
         for listener in list(self._listeners):
-            listener(self._now)
-        return self._now
+            listener(now)
+        return now
+
+    async def advance_async(self, ms: int) -> int:
+        """Advance like `advance`, then yield so coroutines woken by due timers run.
+
+        Args:
+            ms: Milliseconds to advance; must be non-negative.
+
+        Returns:
+            Current logical time in milliseconds.
+        """
+        now = self.advance(ms)
+        await asyncio.sleep(0)
+        return now
+
+    async def sleep_until(self, due_ms: int) -> int:
+        """Wait on the running event loop until the clock reaches due_ms.
+
+        Args:
+            due_ms: Logical time to wait for.
+
+        Returns:
+            Logical time at which the wait completed.
+        """
+        if due_ms <= self._now:
+            return self._now
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        def _wake(now_ms: int) -> None:
+            if not future.done():
+                future.set_result(now_ms)
+
+        handle = self.schedule(due_ms, _wake)
+        try:
+            return await future
+        finally:
+            self.cancel(handle)
+
+    def schedule(self, due_ms: int, callback: Callable[[int], None]) -> TimerHandle:
+        """Schedule a callback for a logical time.
+
+        Args:
+            due_ms: Logical time at which the callback fires; past times fire on
+                the next advance.
+            callback: Callback accepting the current logical time in milliseconds.
+
+        Returns:
+            Handle usable with `cancel`.
+        """
+        handle = TimerHandle(due_ms, callback)
+        with self._lock:
+            heapq.heappush(self._timers, (due_ms, next(self._seq), handle))
+        return handle
+
+    def cancel(self, handle: TimerHandle) -> bool:
+        """Cancel a scheduled callback; the heap entry is discarded lazily.
+
+        Args:
+            handle: Handle returned by `schedule`.
+
+        Returns:
+            True if the callback was still pending.
+        """
+        if handle.cancelled:
+            return False
+        handle.cancelled = True
+        return True
+
+    def pending_timers(self) -> int:
+        """Return the number of heap entries, including lazily cancelled ones."""
+        return len(self._timers)
 
     def add_listener(self, listener: Callable[[int], None]) -> None:
         """Register a listener invoked on every advance.
 
+        Prefer `schedule` for time-based events; listeners run on every advance.
+
         Args:
             listener: Callback accepting the new logical time in milliseconds.
         """
         if listener not in self._listeners:
             self._listeners.append(listener)
 
+    def remove_listener(self, listener: Callable[[int], None]) -> None:
+        """Unregister a listener if present.
+
+        Args:
+            listener: Previously registered callback.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+
+class SessionHook:
+    """Per-session observer registered through `InMemoryStateStore.session_hooks`.
+
+    Hooks let derived runtime state that lives outside the session dict (such
+    as clock timers) follow the session when its state is replaced. The
+    default methods do nothing.
+    """
+
+    def installed(self, state: Dict[str, Any]) -> None:
+        """Called after a restore or reset replaces the session's state.
+
+        Args:
+            state: The session's new state.
+        """
+
+    def evicted(self, state: Dict[str, Any]) -> None:
+        """Called just before the session is spilled by an eviction policy.
+
+        Args:
+            state: The state being spilled; read it, do not keep it.
+        """
+
+    def rehydrated(self, state: Dict[str, Any]) -> None:
+        """Called after a spilled session is loaded back; defaults to `installed`.
+
+        Args:
+            state: The rehydrated state.
+        """
+        self.installed(state)
+
+    def discarded(self) -> None:
+        """Called when the session is discarded (or evicted without a spill) and its hooks are dropped."""
+
+
+class SessionSpill(Protocol):
+    """Storage that receives evicted sessions and hands them back on access."""
+
+    def save(self, session_id: str, state: Dict[str, Any]) -> None:
+        """Persist a plain JSON-shaped session state."""
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a previously saved state, or None."""
+
+    def delete(self, session_id: str) -> None:
+        """Forget a saved state if present."""
+
+
+@dataclass
+class EvictionPolicy:
+    """Bounds on the sessions an InMemoryStateStore keeps resident.
+
+    Sessions are kept in least-recently-used order. Whenever a session is
+    accessed, the least recently used sessions are evicted while any bound
+    is exceeded; the session being accessed is never evicted. Every check is
+    O(1) per access (amortized over evictions).
+
+    Attributes:
+        max_sessions: Maximum resident sessions.
+        ttl_s: Evict sessions idle for longer than this many seconds.
+        max_bytes: Approximate byte budget across resident sessions.
+        spill: Receives evicted sessions and rehydrates them on next access;
+            when None, evicted sessions are dropped and reseeded on access.
+        size_fn: Estimates a session's size in bytes; must be cheap.
+        time_fn: Monotonic time source in seconds.
+    """
+
+    max_sessions: Optional[int] = None
+    ttl_s: Optional[float] = None
+    max_bytes: Optional[int] = None
+    spill: Optional[SessionSpill] = None
+    size_fn: Optional[Callable[[Dict[str, Any]], int]] = None
+    time_fn: Callable[[], float] = time.monotonic
+
+
+# Rough per-record footprint used by approx_state_bytes.
+_RECORD_BYTES = 512
+_BASE_BYTES = 4096
+
+
+def approx_state_bytes(state: Dict[str, Any]) -> int:
+    """Estimate a session's memory footprint from its collection sizes.
+
+    Only the top-level keys are inspected, so the cost is independent of how
+    many records the session holds.
+
+    Args:
+        state: Session state.
+
+    Returns:
+        Approximate size in bytes.
+    """
+    records = sum(len(value) for value in state.values() if isinstance(value, (list, dict, CowMap)))
+    return _BASE_BYTES + records * _RECORD_BYTES
+
 
 class InMemoryStateStore:
-    """Per-session in-memory state with snapshot/restore."""
+    """Per-session in-memory state with snapshot/restore.
+
+    Two snapshot modes are supported:
+
+    - ``"deepcopy"`` (default): snapshots and restores are full deep copies of
+      plain JSON-shaped dicts. Live top-level dicts are
+      :class:`~mock_platform.tracking.TrackedDict` so derived indexes see
+      records edited in place; snapshots are still plain dicts.
+    - ``"cow"``: every top-level dict of a session (``messages``,
+      ``conversations``, ``contacts``, ``memos``, ...) is a
+      :class:`~mock_platform.cow.CowMap`. Snapshot and restore fork those maps
+      by copying only their deltas and records are copied lazily on first
+      access, so the cost tracks what changed rather than the session size. Use
+      :func:`~mock_platform.cow.materialize` to turn a snapshot into plain
+      JSON-serializable dicts.
+
+    By default the factory runs once and its result is kept as a frozen seed
+    template; new and reset sessions are cloned from it with a JSON-specialized
+    copier (or forked in O(1) in ``"cow"`` mode). Call
+    :meth:`invalidate_template` when a parameterized factory changes.
+
+    Sessions are created lazily and kept until `discard`/`reset_all` unless an
+    :class:`EvictionPolicy` bounds them by count, idle time or approximate
+    bytes; evicted sessions are dropped or handed to the policy's spill and
+    rehydrated on next access. Without a policy no bookkeeping is done.
+
+    With ``journal=True`` the built-in tools append delta records to a
+    per-session :class:`~mock_platform.journal.Journal` (see `journal`).
 
-    def __init__(self, factory: Callable[[], Dict[str, Any]]) -> None:
+    Per-session :class:`SessionHook` objects (see `session_hooks`) are told
+    whenever a restore or reset replaces a session's state and when it is
+    spilled or rehydrated. Background work should read sessions with
+    `resident`, which neither reseeds evicted sessions nor counts as an
+    access.
+
+    With ``compact_records=True`` the built-in tools store new messages as
+    slotted :class:`~mock_platform.records.MessageRecord` objects instead of
+    dicts; tool results and :func:`~mock_platform.cow.materialize` still
+    produce the plain JSON shape. ``"deepcopy"`` snapshots and spilled states
+    are then plain JSON-shaped dicts, and messages are converted back to
+    records on restore and rehydration.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Dict[str, Any]],
+        snapshot_mode: str = "deepcopy",
+        cache_template: bool = True,
+        eviction: Optional[EvictionPolicy] = None,
+        journal: bool = False,
+        compact_records: bool = False,
+    ) -> None:
         """Initialize state store.
 
         Args:
             factory: Callable returning a fresh state dict.
+            snapshot_mode: ``"deepcopy"`` or ``"cow"``.
+            cache_template: Build the seed once and clone it per session instead
+                of calling the factory for every new or reset session.
+            eviction: Optional bounds on resident sessions.
+            journal: Record a per-session delta journal (see `mock_platform.journal`).
+            compact_records: Store new messages as slotted records (see `mock_platform.records`).
+
+        Raises:
+            ValueError: If snapshot_mode is unknown.
         """
+        if snapshot_mode not in SNAPSHOT_MODES:
+            raise ValueError(f"Unknown snapshot_mode '{snapshot_mode}'")
         self._factory = factory
-        self._state: Dict[str, Dict[str, Any]] = {}
+        self._snapshot_mode = snapshot_mode
+        self._cache_template = cache_template
+        self._template: Optional[Dict[str, Any]] = None
+        self._state: Dict[str, Dict[str, Any]] = OrderedDict()
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+        self._hooks: Dict[str, Dict[Any, SessionHook]] = {}
+        self._eviction = eviction
+        self._last_access: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._spilled: Set[str] = set()
+        self._journaling = journal
+        self._journals: Dict[str, Journal] = {}
+        self._compact_records = compact_records
+
+    @property
+    def snapshot_mode(self) -> str:
+        """Return the snapshot mode in use."""
+        return self._snapshot_mode
+
+    @property
+    def compact_records(self) -> bool:
+        """Return True when new messages are stored as slotted records."""
+        return self._compact_records
+
+    def invalidate_template(self, factory: Optional[Callable[[], Dict[str, Any]]] = None) -> None:
+        """Drop the cached seed template so the next session rebuilds it.
+
+        Existing sessions are not affected.
+
+        Args:
+            factory: Optional replacement factory.
+        """
+        if factory is not None:
+            self._factory = factory
+        self._template = None
+
+    def _build(self) -> Dict[str, Any]:
+        """Run the factory and convert its result to the store's representation."""
+        state = clone_json(self._factory())
+        if self._snapshot_mode == "cow":
+            return to_cow_state(state)
+        return state
+
+    def _fresh(self) -> Dict[str, Any]:
+        """Return a new seeded state in the store's representation."""
+        if not self._cache_template:
+            return self._build()
+        if self._template is None:
+            self._template = self._build()
+        if self._snapshot_mode == "cow":
+            return fork_state(self._template)
+        return clone_json(self._template)
 
     def get(self, session_id: str) -> Dict[str, Any]:
         """Return (and lazily initialize) state for a session.
@@ -76,9 +424,65 @@ class InMemoryStateStore:
         Returns:
             Session state dictionary.
         """
-        if session_id not in self._state:
-            self._state[session_id] = copy.deepcopy(self._factory())
-        return self._state[session_id]
+        state = self._state.get(session_id)
+        if state is None:
+            if session_id in self._spilled:
+                return self._notify(session_id, self._install(session_id, self._rehydrate(session_id)), True)
+            return self._install(session_id, self._fresh())
+        if self._eviction is not None:
+            self._touch(session_id)
+        return state
+
+    @contextlib.contextmanager
+    def pinned(self, session_id: str) -> Iterator[None]:
+        """Do the eviction bookkeeping of repeated `get(session_id)` calls once.
+
+        Inside the block the first `get` of the session runs as usual
+        (creating, rehydrating or touching it); later ones return the resident
+        state directly, skipping LRU and size accounting. Without an eviction
+        policy `get` does no bookkeeping and the block changes nothing. Like
+        `ToolRegistry.enable_instrumentation`, this swaps the instance's
+        `get`; nested blocks are no-ops.
+
+        Args:
+            session_id: Session to pin.
+        """
+        if self._eviction is None or "get" in vars(self):
+            yield
+            return
+        full_get = self.get
+        resident = self._state.get
+        touched = False
+
+        def get(sid: str) -> Dict[str, Any]:
+            nonlocal touched
+            if sid == session_id:
+                state = resident(sid) if touched else None
+                if state is not None:
+                    return state
+                touched = True
+            return full_get(sid)
+
+        self.get = get  # type: ignore[method-assign]
+        try:
+            yield
+        finally:
+            del self.get
+
+    def resident(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a session's state if it is held in memory.
+
+        Unlike `get`, this never creates or rehydrates a session and does not
+        count as an access for the eviction policy, so background callbacks
+        (such as clock timers) can use it without disturbing LRU order.
+
+        Args:
+            session_id: Session identifier.
+
+        Returns:
+            Session state, or None when the session is not resident.
+        """
+        return self._state.get(session_id)
 
     def reset(self, session_id: str) -> Dict[str, Any]:
         """Reset state for a session to the factory seed.
@@ -89,22 +493,119 @@ class InMemoryStateStore:
         Returns:
             Fresh session state.
         """
-        self._state[session_id] = copy.deepcopy(self._factory())
-        return self._state[session_id]
+        self._indexes.pop(session_id, None)
+        if self._journaling:
+            self.journal(session_id).record("reset", 0, [])
+        return self._notify(session_id, self._install(session_id, self._fresh()))
+
+    def discard(self, session_id: str) -> None:
+        """Drop a session and its derived indexes; the next `get` reseeds it.
+
+        Args:
+            session_id: Session identifier.
+        """
+        self._state.pop(session_id, None)
+        self._indexes.pop(session_id, None)
+        self._journals.pop(session_id, None)
+        for hook in self._hooks.pop(session_id, {}).values():
+            hook.discarded()
+        if self._eviction is not None:
+            self._forget(session_id)
+            if session_id in self._spilled:
+                self._spilled.discard(session_id)
+                self._eviction.spill.delete(session_id)
 
     def reset_all(self) -> None:
         """Clear all sessions."""
         self._state.clear()
+        self._indexes.clear()
+        self._journals.clear()
+        hooks, self._hooks = self._hooks, {}
+        for session_hooks in hooks.values():
+            for hook in session_hooks.values():
+                hook.discarded()
+        self._last_access.clear()
+        self._sizes.clear()
+        self._total_bytes = 0
+        if self._spilled:
+            for session_id in self._spilled:
+                self._eviction.spill.delete(session_id)
+            self._spilled.clear()
+
+    def journal(self, session_id: str) -> Optional[Journal]:
+        """Return the session's delta journal, or None when journaling is off.
+
+        Args:
+            session_id: Session identifier.
+
+        Returns:
+            Journal of changes since the session was created or last restored.
+        """
+        if not self._journaling:
+            return None
+        journal = self._journals.get(session_id)
+        if journal is None:
+            journal = self._journals[session_id] = Journal()
+        return journal
+
+    def resident_sessions(self) -> int:
+        """Return the number of sessions currently held in memory."""
+        return len(self._state)
+
+    def approx_bytes(self) -> int:
+        """Return the estimated bytes of resident sessions (0 without an eviction policy)."""
+        return self._total_bytes
+
+    def indexes(self, session_id: str) -> Dict[str, Any]:
+        """Return the derived-index cache for a session.
+
+        The cache holds non-serialized lookup structures (see
+        `mock_platform.indexing`). It is not part of snapshots and is dropped
+        whenever the session is reset or restored.
+
+        Args:
+            session_id: Session identifier.
+
+        Returns:
+            Mutable dict keyed by index name.
+        """
+        cache = self._indexes.get(session_id)
+        if cache is None:
+            cache = self._indexes[session_id] = {}
+        return cache
+
+    def session_hooks(self, session_id: str) -> Dict[Any, SessionHook]:
+        """Return the session's hooks, keyed by an owner-chosen key.
+
+        Unlike `indexes`, hooks are kept across restore, reset and spilling,
+        and are notified by them (see `SessionHook`); `discard`, `reset_all`
+        and eviction without a spill drop them.
+
+        Args:
+            session_id: Session identifier.
+
+        Returns:
+            Mutable dict of hooks.
+        """
+        hooks = self._hooks.get(session_id)
+        if hooks is None:
+            hooks = self._hooks[session_id] = {}
+        return hooks
 
     def snapshot(self, session_id: str) -> Dict[str, Any]:
-        """Return a deep copy snapshot for a session.
+        """Return a snapshot for a session.
 
         Args:
             session_id: Session identifier.
 
         Returns:
-            Deep copy of the session state.
+            Deep copy of the session state, or a structural-sharing fork in
+            ``"cow"`` mode.
         """
+        if self._snapshot_mode == "cow":
+            return fork_state(self.get(session_id))
+        if self._compact_records:
+            return materialize(self.get(session_id))
         return copy.deepcopy(self.get(session_id))
 
     def restore(self, session_id: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
@@ -117,5 +618,260 @@ class InMemoryStateStore:
         Returns:
             Restored session state.
         """
-        self._state[session_id] = copy.deepcopy(snapshot)
-        return self._state[session_id]
+        self._indexes.pop(session_id, None)
+        if self._journaling:
+            self._journals[session_id] = Journal()
+        if self._snapshot_mode == "cow":
+            state = self._install(session_id, fork_state(snapshot))
+        else:
+            state = self._install(session_id, self._compacted(copy.deepcopy(snapshot)))
+        return self._notify(session_id, state)
+
+    def _install(self, session_id: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a session's state and account for it under the eviction policy."""
+        if self._snapshot_mode != "cow":
+            track_state(state)
+        self._state[session_id] = state
+        if self._eviction is not None:
+            self._touch(session_id)
+        return state
+
+    def _notify(self, session_id: str, state: Dict[str, Any], rehydrated: bool = False) -> Dict[str, Any]:
+        """Tell the session's hooks that its state was replaced or rehydrated."""
+        hooks = self._hooks.get(session_id)
+        if hooks:
+            for hook in list(hooks.values()):
+                if rehydrated:
+                    hook.rehydrated(state)
+                else:
+                    hook.installed(state)
+        return state
+
+    def _rehydrate(self, session_id: str) -> Dict[str, Any]:
+        """Return a spilled session's state, or a freshly seeded one when the spill lost it."""
+        self._spilled.discard(session_id)
+        spill = self._eviction.spill
+        loaded = spill.load(session_id)
+        spill.delete(session_id)
+        if loaded is not None:
+            loaded = self._compacted(loaded)
+            return to_cow_state(loaded) if self._snapshot_mode == "cow" else loaded
+        return self._fresh()
+
+    def _compacted(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a plain state's messages to compact records when the store uses them."""
+        messages = state.get("messages")
+        if self._compact_records and type(messages) is dict:
+            state["messages"] = {message_id: to_compact(message) for message_id, message in messages.items()}
+        return state
+
+    def _touch(self, session_id: str) -> None:
+        """Mark a session most recently used, refresh its size and enforce the policy."""
+        policy = self._eviction
+        self._state.move_to_end(session_id)
+        now = policy.time_fn()
+        self._last_access[session_id] = now
+        if policy.max_bytes is not None:
+            size = (policy.size_fn or approx_state_bytes)(self._state[session_id])
+            self._total_bytes += size - self._sizes.get(session_id, 0)
+            self._sizes[session_id] = size
+        while len(self._state) > 1:
+            victim = next(iter(self._state))
+            if victim == session_id or not self._over_budget(victim, now):
+                break
+            if not self._evict(victim):
+                break
+
+    def _over_budget(self, victim: str, now: float) -> bool:
+        """Return True when the oldest session must go."""
+        policy = self._eviction
+        if policy.max_sessions is not None and len(self._state) > policy.max_sessions:
+            return True
+        if policy.max_bytes is not None and self._total_bytes > policy.max_bytes:
+            return True
+        return policy.ttl_s is not None and now - self._last_access[victim] > policy.ttl_s
+
+    def _evict(self, session_id: str) -> bool:
+        """Evict a session, spilling it when the policy has a spill."""
+        state = self._state.pop(session_id)
+        self._indexes.pop(session_id, None)
+        self._forget(session_id)
+        spill = self._eviction.spill
+        if spill is not None:
+            for hook in list(self._hooks.get(session_id, {}).values()):
+                hook.evicted(state)
+            plain = self._snapshot_mode == "cow" or self._compact_records
+            spill.save(session_id, materialize(state) if plain else state)
+            self._spilled.add(session_id)
+        else:
+            self._journals.pop(session_id, None)
+            for hook in self._hooks.pop(session_id, {}).values():
+                hook.discarded()
+        return True
+
+    def _forget(self, session_id: str) -> None:
+        """Drop eviction bookkeeping for a session."""
+        self._last_access.pop(session_id, None)
+        self._total_bytes -= self._sizes.pop(session_id, 0)
+
+
+class ThreadSafeStateStore(InMemoryStateStore):
+    """InMemoryStateStore with lock-striped per-session synchronization.
+
+    Each session id hashes onto one of `stripes` re-entrant locks, so threads
+    working on different sessions rarely contend and never serialize on a
+    single global lock.
+
+    Guarantees:
+
+    - `get` initializes a session exactly once; concurrent first accesses see
+      the same state object. Existing sessions are returned without locking.
+    - `reset`, `snapshot`, `restore` and `indexes` hold the session's stripe
+      lock, so a snapshot never observes a half-applied restore or reset of
+      the same session, and concurrent restores apply one after the other.
+    - `reset_all` acquires every stripe and is atomic against all of the above.
+    - With an eviction policy, LRU bookkeeping is serialized by one store-wide
+      lock, and a session is only evicted when its stripe lock can be taken
+      without blocking, so a session in use by another thread is never evicted.
+    - Tool handlers do not take the lock themselves. When several threads
+      drive the *same* session, wrap each call (or a multi-call critical
+      section) in ``with store.session_lock(session_id):``; the lock is
+      re-entrant, so store methods can be called inside it.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Dict[str, Any]],
+        snapshot_mode: str = "deepcopy",
+        cache_template: bool = True,
+        eviction: Optional[EvictionPolicy] = None,
+        journal: bool = False,
+        compact_records: bool = False,
+        stripes: int = 64,
+    ) -> None:
+        """Initialize state store.
+
+        Args:
+            factory: Callable returning a fresh state dict.
+            snapshot_mode: ``"deepcopy"`` or ``"cow"``.
+            cache_template: Build the seed once and clone it per session.
+            eviction: Optional bounds on resident sessions.
+            journal: Record a per-session delta journal.
+            compact_records: Store new messages as slotted records.
+            stripes: Number of session lock stripes.
+
+        Raises:
+            ValueError: If stripes is not positive.
+        """
+        if stripes <= 0:
+            raise ValueError("stripes must be positive")
+        super().__init__(
+            factory,
+            snapshot_mode=snapshot_mode,
+            cache_template=cache_template,
+            eviction=eviction,
+            journal=journal,
+            compact_records=compact_records,
+        )
+        self._stripes = [threading.RLock() for _ in range(stripes)]
+        self._template_lock = threading.Lock()
+        self._lru_lock = threading.RLock()
+
+    def session_lock(self, session_id: str) -> threading.RLock:
+        """Return the re-entrant lock guarding a session.
+
+        Args:
+            session_id: Session identifier.
+
+        Returns:
+            Stripe lock shared by every session hashing to the same stripe.
+        """
+        return self._stripes[hash(session_id) % len(self._stripes)]
+
+    def invalidate_template(self, factory: Optional[Callable[[], Dict[str, Any]]] = None) -> None:
+        """Drop the cached seed template; see `InMemoryStateStore.invalidate_template`."""
+        with self._template_lock:
+            super().invalidate_template(factory)
+
+    def _fresh(self) -> Dict[str, Any]:
+        """Return a new seeded state, building the template at most once."""
+        if self._cache_template and self._template is None:
+            with self._template_lock:
+                if self._template is None:
+                    self._template = self._build()
+        return super()._fresh()
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        """Return (and lazily initialize exactly once) state for a session."""
+        if self._eviction is None:
+            state = self._state.get(session_id)
+            if state is not None:
+                return state
+        with self.session_lock(session_id):
+            return super().get(session_id)
+
+    def reset(self, session_id: str) -> Dict[str, Any]:
+        """Reset a session under its stripe lock."""
+        with self.session_lock(session_id):
+            return super().reset(session_id)
+
+    def discard(self, session_id: str) -> None:
+        """Drop a session under its stripe lock."""
+        with self.session_lock(session_id):
+            super().discard(session_id)
+
+    def reset_all(self) -> None:
+        """Clear all sessions while holding every stripe."""
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            with self._lru_lock:
+                super().reset_all()
+        finally:
+            for lock in reversed(self._stripes):
+                lock.release()
+
+    def _touch(self, session_id: str) -> None:
+        """Run LRU bookkeeping under the store-wide LRU lock."""
+        with self._lru_lock:
+            super()._touch(session_id)
+
+    def _forget(self, session_id: str) -> None:
+        """Drop eviction bookkeeping under the store-wide LRU lock."""
+        with self._lru_lock:
+            super()._forget(session_id)
+
+    def _evict(self, session_id: str) -> bool:
+        """Evict a session only if no other thread holds its stripe."""
+        lock = self.session_lock(session_id)
+        if not lock.acquire(blocking=False):
+            return False
+        try:
+            return super()._evict(session_id)
+        finally:
+            lock.release()
+
+    def journal(self, session_id: str) -> Optional[Journal]:
+        """Return the session's delta journal under its stripe lock."""
+        with self.session_lock(session_id):
+            return super().journal(session_id)
+
+    def indexes(self, session_id: str) -> Dict[str, Any]:
+        """Return the derived-index cache for a session under its stripe lock."""
+        with self.session_lock(session_id):
+            return super().indexes(session_id)
+
+    def session_hooks(self, session_id: str) -> Dict[Any, SessionHook]:
+        """Return the session's hooks under its stripe lock."""
+        with self.session_lock(session_id):
+            return super().session_hooks(session_id)
+
+    def snapshot(self, session_id: str) -> Dict[str, Any]:
+        """Snapshot a session under its stripe lock."""
+        with self.session_lock(session_id):
+            return super().snapshot(session_id)
+
+    def restore(self, session_id: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Restore a session under its stripe lock."""
+        with self.session_lock(session_id):
+            return super().restore(session_id, snapshot)
@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+from mock_platform.encoding import dumps_bytes
+from mock_platform.views import ReadOnlyMapping, thaw
+
 
 @dataclass
 class ToolResult:
     """Structured tool response.
 
+    `to_dict`, `to_json` and `to_json_bytes` are computed once and cached, so a
+    result must not be modified after it has been serialized.
+
     Attributes:
         ok: True when the tool succeeded.
-        data: Optional payload dictionary.
+        data: Optional payload dictionary (a read-only view from registries built with `readonly_results=True`).
         error: Optional error info with code/message/details.
         meta: Optional metadata about the execution.
     """
@@ -22,13 +29,56 @@ class ToolResult:
     error: Optional[Dict[str, Any]] = None
     meta: Dict[str, Any] = field(default_factory=dict)
 
+    _dict_cache = None
+    _json_cache = None
+    _bytes_cache = None
+
     def to_dict(self) -> Dict[str, Any]:
         """Return a dict representation for logging or transport.
 
+        Read-only payload views are converted to plain dicts; otherwise the
+        payload is returned as is. The dict is built once and shared by later
+        calls.
+
         Returns:
             Dictionary form of the result.
         """
-        return {"ok": self.ok, "data": self.data, "error": self.error, "meta": self.meta}
+        cached = self._dict_cache
+        if cached is None:
+            data = self.data
+            if isinstance(data, ReadOnlyMapping):
+                data = thaw(data)
+            cached = self._dict_cache = {"ok": self.ok, "data": data, "error": self.error, "meta": self.meta}
+        return cached
+
+    def to_json(self) -> str:
+        """Return the compact JSON form of `to_dict`, serialized once.
+
+        Returns:
+            JSON text with ``(",", ":")`` separators and non-ASCII kept as is.
+        """
+        cached = self._json_cache
+        if cached is None:
+            cached = self._json_cache = json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+        return cached
+
+    def to_json_bytes(self) -> bytes:
+        """Return `to_json` as UTF-8 bytes for transport, encoded once.
+
+        Payload views and records are encoded in place (no `to_dict` copy)
+        by `mock_platform.encoding.dumps_bytes`, which uses orjson when
+        installed and otherwise a shape-aware stdlib encoder; both produce
+        the same bytes as ``to_json().encode()``.
+
+        Returns:
+            Compact UTF-8 JSON.
+        """
+        cached = self._bytes_cache
+        if cached is None:
+            cached = self._bytes_cache = dumps_bytes(
+                {"ok": self.ok, "data": self.data, "error": self.error, "meta": self.meta}
+            )
+        return cached
 
 
 class ToolError(Exception):
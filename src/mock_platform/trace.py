@@ -0,0 +1,234 @@
+"""Deterministic trace recording and replay of tool-call sessions.
+
+A trace is an append-only JSON Lines file. Each line is one event:
+
+- ``{"t": "call", "clock": k, "now_ms": ..., "session": ..., "user_id": ...,
+  "trace_id": ..., "tool": ..., "args": {...}, "result": {...}}``
+- ``{"t": "advance", "clock": k, "now_ms": ...}``
+
+A call whose arguments are not JSON-serializable (such as bytes) is recorded
+with ``"args": null`` and ``"replayable": false``, and replay skips it.
+Results are compared on ``ok``, ``data`` and ``error``; ``meta`` (timings from
+an instrumented registry) is ignored.
+
+``clock`` numbers the distinct `Clock` objects seen by the recorder, so
+sessions sharing a clock in the recording share one during replay. Both the
+recorder and the replayer stream line by line, so traces of any size never
+sit in memory.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Union
+
+from mock_platform.context import ToolContext
+from mock_platform.cow import CowMap, materialize
+from mock_platform.records import CompactRecord
+from mock_platform.registry import ToolRegistry
+from mock_platform.seeds import default_state_factory
+from mock_platform.state import Clock, InMemoryStateStore
+from mock_platform.tools import ToolResult
+
+
+class TraceRecorder:
+    """Wraps `ToolRegistry.call` and appends every call to a trace file."""
+
+    def __init__(self, registry: ToolRegistry, path: Union[str, Path]) -> None:
+        """Open the trace file for appending.
+
+        Args:
+            registry: Registry that executes the calls.
+            path: Trace file path.
+        """
+        self._registry = registry
+        self._handle: IO[str] = open(path, "a", encoding="utf-8")
+        self._clocks: Dict[int, int] = {}
+        self._listeners: List[tuple] = []
+
+    def call(self, tool_name: str, args: dict, ctx: ToolContext) -> ToolResult:
+        """Invoke a tool and record the call with its result.
+
+        Args:
+            tool_name: Registered tool name.
+            args: Arguments dictionary.
+            ctx: ToolContext for the invocation.
+
+        Returns:
+            The registry's ToolResult.
+        """
+        clock_no = self._clock_no(ctx.clock)
+        now_ms = ctx.now_ms
+        result = self._registry.call(tool_name, args, ctx)
+        event = {
+            "t": "call",
+            "clock": clock_no,
+            "now_ms": now_ms,
+            "session": ctx.session,
+            "user_id": ctx.user_id,
+            "trace_id": ctx.trace_id,
+            "tool": tool_name,
+            "args": args,
+            "result": result.to_dict(),
+        }
+        try:
+            line = json.dumps(event, default=_json_default)
+        except (TypeError, ValueError):
+            event["args"] = None
+            event["replayable"] = False
+            line = json.dumps(event, default=_repr_default)
+        self._handle.write(line)
+        self._handle.write("\n")
+        return result
+
+    def flush(self) -> None:
+        """Flush buffered events to disk."""
+        self._handle.flush()
+
+    def close(self) -> None:
+        """Detach from clocks and close the trace file."""
+        for clock, listener in self._listeners:
+            clock.remove_listener(listener)
+        self._listeners.clear()
+        self._handle.close()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _clock_no(self, clock: Clock) -> int:
+        """Number a clock and start recording its advances on first sight."""
+        clock_no = self._clocks.get(id(clock))
+        if clock_no is None:
+            clock_no = self._clocks[id(clock)] = len(self._clocks)
+
+            def _on_advance(now_ms: int) -> None:
+                self._write({"t": "advance", "clock": clock_no, "now_ms": now_ms})
+
+            clock.add_listener(_on_advance)
+            self._listeners.append((clock, _on_advance))
+        return clock_no
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        """Append one event line."""
+        self._handle.write(json.dumps(event, default=_json_default))
+        self._handle.write("\n")
+
+
+@dataclass
+class Mismatch:
+    """A replayed call whose result differs from the recording.
+
+    Attributes:
+        line: 1-based line number in the trace.
+        tool: Tool name.
+        expected: Recorded result.
+        actual: Replayed result.
+    """
+
+    line: int
+    tool: str
+    expected: Dict[str, Any]
+    actual: Dict[str, Any]
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of a replay.
+
+    Attributes:
+        calls: Number of calls replayed.
+        skipped: Number of calls recorded as not replayable.
+        mismatches: Calls whose results differed (capped by `max_mismatches`).
+    """
+
+    calls: int = 0
+    skipped: int = 0
+    mismatches: List[Mismatch] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Return True when every replayed result matched."""
+        return not self.mismatches
+
+
+def replay_trace(
+    path: Union[str, Path],
+    registry: ToolRegistry,
+    state_factory: Callable[[], Dict[str, Any]] = default_state_factory,
+    max_mismatches: Optional[int] = 100,
+) -> ReplayReport:
+    """Re-execute a trace against fresh state and compare every result.
+
+    Calls recorded as not replayable are skipped. Results are compared on
+    ``ok``, ``data`` and ``error``, so recordings made with instrumentation
+    enabled replay cleanly.
+
+    Args:
+        path: Trace file path.
+        registry: Registry with the same tools as the recording.
+        state_factory: Seed factory for the fresh store.
+        max_mismatches: Stop after this many mismatches; None never stops early.
+
+    Returns:
+        ReplayReport with the call count and mismatches.
+    """
+    store = InMemoryStateStore(state_factory)
+    clocks: Dict[int, Clock] = {}
+    report = ReplayReport()
+    mismatches = report.mismatches
+    call = registry.call
+    loads = json.loads
+    calls = 0
+    with open(path, encoding="utf-8") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            event = loads(line)
+            clock = clocks.get(event["clock"])
+            if clock is None:
+                clock = clocks[event["clock"]] = Clock(start_ms=event["now_ms"])
+            delta = event["now_ms"] - clock.now_ms()
+            if delta > 0:
+                clock.advance(delta)
+            if event["t"] != "call":
+                continue
+            if not event.get("replayable", True):
+                report.skipped += 1
+                continue
+            calls += 1
+            ctx = ToolContext(
+                user_id=event["user_id"],
+                trace_id=event["trace_id"],
+                clock=clock,
+                state_store=store,
+                session_id=event["session"],
+            )
+            actual = call(event["tool"], event["args"], ctx).to_dict()
+            if _outcome(actual) != _outcome(event["result"]):
+                mismatches.append(Mismatch(line_no, event["tool"], event["result"], actual))
+                if max_mismatches is not None and len(mismatches) >= max_mismatches:
+                    break
+    report.calls = calls
+    return report
+
+
+def _outcome(result: Dict[str, Any]) -> tuple:
+    """Return the parts of a result dict that replay compares."""
+    return result["ok"], result["data"], result["error"]
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize CowMap-backed payloads and compact records."""
+    if isinstance(value, (CowMap, CompactRecord)):
+        return materialize(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _repr_default(value: Any) -> Any:
+    """Like `_json_default`, but write anything else by its repr (for events replay skips)."""
+    if isinstance(value, (CowMap, CompactRecord)):
+        return materialize(value)
+    return repr(value)
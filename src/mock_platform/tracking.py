@@ -0,0 +1,170 @@
+"""Session collections that report which records were handed out for writing.
+
+Derived indexes (`mock_platform.indexing`) must notice records edited in
+place, but re-checking every record per query is O(n). A `TrackedDict`
+instead tells its watchers about every key accessed through item access
+(``m[key]``, ``m.get``, ``m.setdefault``) or written, deleted or popped, so an
+index only re-examines those keys. `CowMap` offers the same `watch` API.
+
+As with `CowMap`, iteration views (`keys`, `values`, `items`) are read-only:
+mutate a record through item access, and re-access it after an index has
+been queried rather than holding it across queries.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Set, Tuple
+
+from mock_platform.copying import clone_json
+
+_MISSING = object()
+
+
+class KeyChanges:
+    """Keys a watched collection reported, collected until the watcher drains them.
+
+    `touched` lists keys read through item access or written, in first-touch
+    order; collections only report a key once it exists, so keys inserted
+    since the last drain appear in collection order. `removed` holds
+    deleted keys. Deleting a key drops it from `touched`, so a key deleted and
+    re-inserted is reported as removed and then touched again at the end.
+    """
+
+    __slots__ = ("touched", "removed")
+
+    def __init__(self) -> None:
+        """Start with nothing reported."""
+        self.touched: Dict[str, None] = {}
+        self.removed: Set[str] = set()
+
+    def remove(self, key: str) -> None:
+        """Report a deleted key."""
+        self.touched.pop(key, None)
+        self.removed.add(key)
+
+    def drain(self) -> Tuple[Set[str], List[str]]:
+        """Return and forget ``(removed, touched)``."""
+        removed, touched = self.removed, list(self.touched)
+        self.removed = set()
+        self.touched.clear()
+        return removed, touched
+
+
+class TrackedDict(dict):
+    """Plain dict that reports keys handed out for writing to its watchers.
+
+    Pickling and deep copies produce plain dicts, so snapshots, spills and
+    checkpoints keep the plain JSON shape.
+    """
+
+    __slots__ = ("_watchers",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize like `dict`, with no watchers."""
+        super().__init__(*args, **kwargs)
+        self._watchers: List[KeyChanges] = []
+
+    def watch(self) -> KeyChanges:
+        """Start reporting changed keys to a new watcher.
+
+        Returns:
+            Watcher collecting keys from now on.
+        """
+        changes = KeyChanges()
+        self._watchers.append(changes)
+        return changes
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Return the record for key without reporting it (read-only)."""
+        return dict.get(self, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = dict.__getitem__(self, key)
+        for watcher in self._watchers:
+            watcher.touched[key] = None
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a writable record for key, or default."""
+        value = dict.get(self, key, _MISSING)
+        if value is _MISSING:
+            return default
+        for watcher in self._watchers:
+            watcher.touched[key] = None
+        return value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        """Return the record for key, inserting default first if missing."""
+        for watcher in self._watchers:
+            watcher.touched[key] = None
+        return dict.setdefault(self, key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        for watcher in self._watchers:
+            watcher.touched[key] = None
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        dict.__delitem__(self, key)
+        for watcher in self._watchers:
+            watcher.remove(key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        """Remove key and return its record."""
+        if key in self:
+            for watcher in self._watchers:
+                watcher.remove(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self) -> Tuple[str, Any]:
+        """Remove and return the last inserted item."""
+        item = dict.popitem(self)
+        for watcher in self._watchers:
+            watcher.remove(item[0])
+        return item
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Update from a mapping or pairs, reporting every written key."""
+        if not self._watchers:
+            dict.update(self, *args, **kwargs)
+            return
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other: Any) -> "TrackedDict":
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        """Remove every record."""
+        for watcher in self._watchers:
+            for key in self:
+                watcher.remove(key)
+        dict.clear(self)
+
+    def copy(self) -> Dict[str, Any]:
+        """Return a shallow plain-dict copy."""
+        return dict(self)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return dict, (dict(self),)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return clone_json(dict(self))
+
+
+def track_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap every top-level dict of a plain session state in a fresh TrackedDict.
+
+    Records are shared, not copied; any earlier watchers are left behind.
+
+    Args:
+        state: Plain session state; modified in place.
+
+    Returns:
+        The same state object.
+    """
+    for key, value in state.items():
+        if isinstance(value, dict):
+            state[key] = TrackedDict(value)
+    return state
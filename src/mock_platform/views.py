@@ -0,0 +1,125 @@
+"""Recursive read-only views over tool result payloads.
+
+Handlers return stored session records directly. `freeze` wraps such a
+payload without copying: dicts (and `CowMap`/compact records) become
+`ReadOnlyMapping`, lists become `ReadOnlyList`, and nested containers are
+wrapped as they are read, so an agent holding a result cannot mutate session
+state through it. Views are live: they reflect later changes to the records
+they wrap. `thaw` produces an independent plain copy.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterator
+
+from mock_platform.records import CompactRecord
+
+
+class ReadOnlyMapping(Mapping):
+    """Immutable mapping view whose nested containers are also read-only."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping) -> None:
+        """Wrap a mapping.
+
+        Args:
+            data: Mapping to expose; it is not copied.
+        """
+        self._data = data
+
+    def __getitem__(self, key: Any) -> Any:
+        return freeze(self._data[key])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ReadOnlyMapping, ReadOnlyList)):
+            other = other._data
+        return self._data == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ReadOnlyMapping({self._data!r})"
+
+
+class ReadOnlyList(Sequence):
+    """Immutable list view whose nested containers are also read-only."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: list) -> None:
+        """Wrap a list.
+
+        Args:
+            data: List to expose; it is not copied.
+        """
+        self._data = data
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return ReadOnlyList(self._data[index])
+        return freeze(self._data[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(freeze, self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ReadOnlyMapping, ReadOnlyList)):
+            other = other._data
+        return self._data == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ReadOnlyList({self._data!r})"
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only view of a container, or a scalar unchanged.
+
+    Args:
+        value: Payload value.
+
+    Returns:
+        `ReadOnlyMapping`/`ReadOnlyList` for containers, else value.
+    """
+    if isinstance(value, (ReadOnlyMapping, ReadOnlyList)):
+        return value
+    if isinstance(value, list):
+        return ReadOnlyList(value)
+    if isinstance(value, Mapping):
+        return ReadOnlyMapping(value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return an independent plain JSON-shaped copy of a (possibly frozen) value.
+
+    Args:
+        value: View, container or scalar.
+
+    Returns:
+        Deep copy using only dicts, lists and scalars.
+    """
+    if isinstance(value, (ReadOnlyMapping, ReadOnlyList)):
+        value = value._data
+    if isinstance(value, CompactRecord):
+        return value.to_dict()
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
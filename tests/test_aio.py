@@ -0,0 +1,56 @@
+import asyncio
+
+from mock_platform import AsyncToolRegistry, Clock, InMemoryStateStore, ToolContext, ToolRegistry, default_state_factory
+from mock_platform.services import register_contacts_tools, register_messaging_tools
+
+
+def build(sessions: list[str]) -> tuple[AsyncToolRegistry, list[ToolContext]]:
+    registry = ToolRegistry()
+    register_contacts_tools(registry)
+    register_messaging_tools(registry)
+    clock = Clock()
+    store = InMemoryStateStore(default_state_factory)
+    ctxs = [ToolContext(user_id=s, trace_id="trace-" + s, clock=clock, state_store=store) for s in sessions]
+    return AsyncToolRegistry(registry), ctxs
+
+
+def test_acall_sends_and_awaits_delivery() -> None:
+    async def episode(aregistry: AsyncToolRegistry, ctx: ToolContext) -> str:
+        sent = await aregistry.acall(
+            "messaging.send_text",
+            {"to": {"type": "contact_id", "value": "anders"}, "text": "hi", "client_msg_id": ctx.session},
+            ctx,
+        )
+        await ctx.clock.sleep_until(ctx.now_ms + 500)
+        got = await aregistry.acall("messaging.get_message", {"message_id": sent.data["message_id"]}, ctx)
+        return got.data["message"]["status"]
+
+    async def main() -> list[str]:
+        aregistry, ctxs = build(["a", "b", "c"])
+        tasks = [asyncio.create_task(episode(aregistry, ctx)) for ctx in ctxs]
+        await asyncio.sleep(0)
+        await ctxs[0].clock.advance_async(500)
+        statuses = await asyncio.gather(*tasks)
+        assert aregistry.active_sessions() == 0
+        return statuses
+
+    assert asyncio.run(main()) == ["delivered", "delivered", "delivered"]
+
+
+def test_session_lock_serializes_same_session_only() -> None:
+    events: list[str] = []
+
+    async def hold(aregistry: AsyncToolRegistry, session: str, tag: str) -> None:
+        async with aregistry.session(session):
+            events.append(f"{tag}-in")
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            events.append(f"{tag}-out")
+
+    async def main() -> None:
+        aregistry, _ = build([])
+        await asyncio.gather(hold(aregistry, "s1", "a"), hold(aregistry, "s1", "b"), hold(aregistry, "s2", "c"))
+
+    asyncio.run(main())
+    assert events.index("a-out") < events.index("b-in")
+    assert events.index("c-in") < events.index("a-out")
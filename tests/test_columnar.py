@@ -0,0 +1,90 @@
+import pytest
+
+from mock_platform import Clock, InMemoryStateStore, ToolContext, default_state_factory
+from mock_platform.columnar import message_table
+from mock_platform.runner import build_default_registry
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_message_table_tracks_tool_writes(compact: bool) -> None:
+    registry = build_default_registry()
+    store = InMemoryStateStore(default_state_factory, snapshot_mode="cow", compact_records=compact)
+    ctx = ToolContext(user_id="col", trace_id="trace-col", clock=Clock(), state_store=store)
+
+    def send(n: int, peer: str) -> None:
+        to = {"type": "e164", "value": peer}
+        assert registry.call("messaging.send_text", {"to": to, "text": "t", "client_msg_id": f"k{n}"}, ctx).ok
+
+    send(0, "+1555")
+    table = message_table(store, ctx.session)
+    assert table.count_by_status() == {"sent": 1}
+
+    ctx.clock.advance(100)
+    send(1, "+1555")
+    send(2, "+1666")
+    ctx.clock.advance(400)
+    assert message_table(store, ctx.session) is table
+    assert table.count_by_status() == {"sent": 2, "delivered": 1}
+    assert table.latency_summary() == {"count": 1, "mean_ms": 500.0, "min_ms": 500, "max_ms": 500}
+
+    registry.call("admin.set_delivery", {"message_id": "m3", "status": "failed"}, ctx)
+    ctx.clock.advance(200)
+    assert table.count_by_status() == {"delivered": 2, "failed": 1}
+    assert table.count_by_peer() == {"+1555": 2, "+1666": 1}
+    assert table.count_by_conversation() == {"c1": 2, "c2": 1}
+    assert table.latencies() == [500, 600]
+    assert table.latencies("failed") == [400]
+    assert table.latencies(None) == [500, 600, 400]
+
+    store.restore(ctx.session, store.snapshot(ctx.session))
+    rebuilt = message_table(store, ctx.session)
+    assert rebuilt is not table
+    assert rebuilt.count_by_status() == table.count_by_status()
+
+
+def test_message_table_picks_up_direct_writes() -> None:
+    store = InMemoryStateStore(default_state_factory)
+    table = message_table(store, "s")
+    assert len(table) == 0 and table.latency_summary()["count"] == 0
+    messages = store.get("s")["messages"]
+    for n in range(3):
+        messages[f"m{n}"] = {
+            "message_id": f"m{n}",
+            "conversation_id": "c1",
+            "to": {"type": "e164", "value": "+1"},
+            "status": "delivered",
+            "created_ms": n,
+            "updated_ms": 10,
+        }
+    assert message_table(store, "s").latencies() == [10, 9, 8]
+
+
+
+def test_numpy_aggregations_match_builtin_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("numpy")
+    from mock_platform import columnar
+
+    empty = columnar.MessageTable()
+    table = columnar.MessageTable()
+    for n in range(50):
+        table.upsert(
+            f"m{n}",
+            {
+                "conversation_id": f"c{n % 7}",
+                "to": {"type": "e164", "value": f"+1{n % 5}"},
+                "status": ("sent", "delivered", "failed")[n % 3],
+                "created_ms": n * 10,
+                "updated_ms": n * 10 + (n * 37) % 900,
+            },
+        )
+
+    def aggregate(target: columnar.MessageTable) -> list:
+        results = [target.count_by_status(), target.count_by_peer(), target.count_by_conversation()]
+        for status in ("delivered", "failed", "unknown", None):
+            results += [target.latencies(status), target.latency_summary(status)]
+        return results
+
+    with_numpy = [aggregate(table), aggregate(empty)]
+    monkeypatch.setattr(columnar, "_np", None)
+    assert with_numpy == [aggregate(table), aggregate(empty)]
+    assert all(type(value) is int for value in with_numpy[0][3])
@@ -0,0 +1,98 @@
+import pytest
+
+from mock_platform import Clock, InMemoryStateStore, ToolContext, ToolRegistry, default_state_factory
+from mock_platform.services import register_contacts_tools
+from mock_platform.services.contacts import remove_contact, upsert_contact
+
+
+def build_ctx(session: str = "contacts", snapshot_mode: str = "deepcopy") -> tuple[ToolRegistry, ToolContext]:
+    registry = ToolRegistry()
+    register_contacts_tools(registry)
+    state_store = InMemoryStateStore(default_state_factory, snapshot_mode=snapshot_mode)
+    ctx = ToolContext(user_id=session, trace_id="trace-" + session, clock=Clock(), state_store=state_store)
+    return registry, ctx
+
+
+def scan(contacts: dict, query: str) -> list:
+    q = query.lower()
+    return [
+        c["contact_id"]
+        for c in contacts.values()
+        if q in c["name"].lower() or any(q in p["e164"].lower() for p in c["phones"])
+    ]
+
+
+def search_ids(registry: ToolRegistry, ctx: ToolContext, query: str) -> list:
+    result = registry.call("contacts.search", {"q": query}, ctx)
+    assert result.ok
+    return [c["contact_id"] for c in result.data["contacts"]]
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_indexed_search_matches_scan(mode: str) -> None:
+    registry, ctx = build_ctx("bulk", mode)
+    for n in range(300):
+        upsert_contact(
+            ctx.state_store,
+            ctx.session,
+            {"contact_id": f"c{n}", "name": f"Person {n} Anderson", "phones": [{"e164": f"+1555{n:07d}"}]},
+        )
+    contacts = ctx.state_store.get(ctx.session)["contacts"]
+    for query in ["", "a", "an", "ANDERS", "son 1", "+15550000", "0000029", "nomatch", "rson 29"]:
+        assert search_ids(registry, ctx, query) == scan(contacts, query), query
+
+
+def test_index_follows_contact_changes() -> None:
+    registry, ctx = build_ctx("changes")
+    assert search_ids(registry, ctx, "ander") == ["anders"]
+
+    upsert_contact(ctx.state_store, ctx.session, {"contact_id": "anders", "name": "Andy", "phones": []})
+    assert search_ids(registry, ctx, "ander") == []
+    assert search_ids(registry, ctx, "andy") == ["anders"]
+
+    state = ctx.state_store.get(ctx.session)
+    state["contacts"]["temp"] = {"contact_id": "temp", "name": "Zelda Anderton", "phones": []}
+    assert search_ids(registry, ctx, "ander") == ["temp"]
+
+    remove_contact(ctx.state_store, ctx.session, "temp")
+    assert search_ids(registry, ctx, "ander") == []
+
+    # A direct delete plus insert keeps the size but changes the key set.
+    del state["contacts"]["anders"]
+    state["contacts"]["bob"] = {"contact_id": "bob", "name": "Bobby", "phones": []}
+    assert search_ids(registry, ctx, "bob") == ["bob"] == search_ids(registry, ctx, "bo")
+    state["contacts"]["anders"] = {"contact_id": "anders", "name": "Andy", "phones": []}
+
+    snap = ctx.state_store.snapshot(ctx.session)
+    ctx.state_store.reset(ctx.session)
+    assert search_ids(registry, ctx, "ander") == ["anders"]
+    ctx.state_store.restore(ctx.session, snap)
+    assert search_ids(registry, ctx, "andy") == ["anders"]
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_index_sees_in_place_edits(mode: str) -> None:
+    registry, ctx = build_ctx("in-place-" + mode, mode)
+    assert search_ids(registry, ctx, "anders") == ["anders"]
+    state = ctx.state_store.get(ctx.session)
+
+    state["contacts"]["anders"]["name"] = "Bobby"
+    assert search_ids(registry, ctx, "bobby") == ["anders"]
+    assert search_ids(registry, ctx, "anders") == []
+
+    state["contacts"].get("anders")["phones"][0]["e164"] = "+19990001234"
+    assert search_ids(registry, ctx, "0001234") == ["anders"]
+
+    # Delete and re-insert moves a key to the end, after keys added meanwhile.
+    state["contacts"]["zed"] = {"contact_id": "zed", "name": "Bobby Z", "phones": []}
+    state["contacts"]["anders"] = state["contacts"].pop("anders")
+    assert search_ids(registry, ctx, "bobby") == ["zed", "anders"] == scan(state["contacts"], "bobby")
+
+
+def test_untracked_contacts_fall_back_to_scan() -> None:
+    registry, ctx = build_ctx("plain")
+    state = ctx.state_store.get(ctx.session)
+    state["contacts"] = {"x": {"contact_id": "x", "name": "Xavier", "phones": []}}
+    assert search_ids(registry, ctx, "xav") == ["x"]
+    state["contacts"]["x"]["name"] = "Yann"
+    assert search_ids(registry, ctx, "yann") == ["x"]
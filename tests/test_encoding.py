@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from mock_platform import Clock, InMemoryStateStore, ToolContext, ToolResult, default_state_factory
+from mock_platform.encoding import BACKENDS, default_backend, dumps_bytes
+from mock_platform.records import MessageRecord
+from mock_platform.runner import build_default_registry
+from mock_platform.views import freeze
+
+
+def stdlib_bytes(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def available_backends() -> list:
+    return [b for b in BACKENDS if b != "orjson" or default_backend() == "orjson"]
+
+
+def session_results() -> list:
+    registry = build_default_registry()
+    store = InMemoryStateStore(default_state_factory, compact_records=True)
+    ctx = ToolContext(user_id="enc", trace_id="trace-enc", clock=Clock(), state_store=store)
+    calls = [
+        ("contacts.search", {"q": "and"}),
+        ("contacts.get", {"contact_id": "anders"}),
+        ("messaging.send_text", {"to": {"type": "contact_id", "value": "anders"}, "text": "hej — ✓\n\"q\"", "client_msg_id": "1"}),
+        ("messaging.send_text", {"to": {"type": "contact_id", "value": "anders"}, "text": "dup", "client_msg_id": "1"}),
+        ("messaging.get_message", {"message_id": "m1"}),
+        ("messaging.list_messages", {"conversation_id": "c1"}),
+        ("memo.list_memos", {}),
+        ("memo.search", {"query": "casey", "ranked": True}),
+        ("memo.get_memo", {"memo_id": "decision"}),
+        ("memo.get_memo", {"memo_id": "ghost"}),
+        ("admin.set_rule", {"name": "r", "value": {"1": [1.5, None, True, " "]}}),
+    ]
+    return [registry.call(name, args, ctx) for name, args in calls]
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_to_json_bytes_matches_stdlib(backend: str) -> None:
+    for result in session_results():
+        expected = stdlib_bytes(result.to_dict())
+        assert dumps_bytes({"ok": result.ok, "data": result.data, "error": result.error, "meta": result.meta}, backend) == expected
+        assert result.to_json_bytes() == expected == result.to_json().encode("utf-8")
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_views_records_and_odd_values_encode_identically(backend: str) -> None:
+    message = MessageRecord("m1", "c1", {"type": "e164", "value": "+1"}, "hi", "k", "sent", 0, 5, {"contact_id": "a"})
+    value = {"data": freeze({"message": message, "items": [message, {"x": 1}]}), "big": 2**70, "keys": {1: "a"}}
+    plain = {"data": {"message": message.to_dict(), "items": [message.to_dict(), {"x": 1}]}, "big": 2**70, "keys": {1: "a"}}
+    assert dumps_bytes(value, backend) == stdlib_bytes(plain)
+    floats = {"small": [1e-05, 0.00012, -2.5e-09], "large": [1e16, -3e22, 1e15, 123.25], "text": "3e5 0.00001"}
+    assert dumps_bytes(freeze(floats), backend) == stdlib_bytes(floats)
+    assert dumps_bytes({"score": 0.5, "timing": {"ms": 1.25e-05}}, backend) == b'{"score":0.5,"timing":{"ms":1.25e-05}}'
+    # Field types outside the known record shapes fall back to the generic path.
+    odd = dict(message.to_dict(), created_ms=True, updated_ms=1.5)
+    assert dumps_bytes({"message": odd}, backend) == stdlib_bytes({"message": odd})
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_non_finite_floats_encode_like_stdlib(backend: str) -> None:
+    message = MessageRecord("m1", "c1", {"type": "e164", "value": "+1"}, "hi", "k", "sent", 0, 5, None)
+    for bad in (float("nan"), float("inf"), float("-inf")):
+        value = {"error": None, "data": freeze({"rule": {"rate": [1.0, bad]}, "message": message})}
+        plain = {"error": None, "data": {"rule": {"rate": [1.0, bad]}, "message": message.to_dict()}}
+        assert dumps_bytes(value, backend) == stdlib_bytes(plain)
+    result = ToolResult(ok=True, data={"score": float("nan")})
+    assert result.to_json_bytes() == b'{"ok":true,"data":{"score":NaN},"error":null,"meta":{}}'
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        dumps_bytes({}, "simdjson")
+    assert ToolResult(ok=True).to_json_bytes() == b'{"ok":true,"data":null,"error":null,"meta":{}}'
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from mock_platform import Clock, InMemoryStateStore, ToolContext, default_state_factory
+from mock_platform.cow import materialize
+from mock_platform.journal import replay
+from mock_platform.runner import build_default_registry
+
+
+def send(registry, ctx: ToolContext, to_value: str, client_msg_id: str):
+    to_type = "e164" if to_value.startswith("+") else "contact_id"
+    return registry.call(
+        "messaging.send_text",
+        {"to": {"type": to_type, "value": to_value}, "text": "hi", "client_msg_id": client_msg_id},
+        ctx,
+    )
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_journal_replays_to_live_state(mode: str) -> None:
+    registry = build_default_registry()
+    store = InMemoryStateStore(default_state_factory, snapshot_mode=mode, journal=True)
+    ctx = ToolContext(user_id="j", trace_id="t", clock=Clock(), state_store=store)
+    base = materialize(store.snapshot(ctx.session))
+    journal = store.journal(ctx.session)
+
+    send(registry, ctx, "anders", "a")
+    send(registry, ctx, "+15550002222", "b")
+    mark = journal.mark()
+    send(registry, ctx, "anders", "c")
+    send(registry, ctx, "anders", "a")
+    registry.call("admin.set_delivery", {"message_id": "m2", "status": "failed"}, ctx)
+    registry.call("admin.set_rule", {"name": "drop", "value": {"rate": 0.5}}, ctx)
+    ctx.clock.advance(500)
+    at_mark = replay(json.loads(json.dumps(base)), journal.entries(until=mark))
+    assert list(at_mark["messages"]) == ["m1", "m2"]
+
+    kinds = [entry["kind"] for entry in journal.entries()]
+    assert kinds == [
+        "messaging.send_text",
+        "messaging.send_text",
+        "messaging.send_text",
+        "admin.set_delivery",
+        "admin.set_rule",
+        "delivery",
+    ]
+    replayed = replay(json.loads(json.dumps(base)), journal.entries())
+    assert replayed == materialize(store.get(ctx.session))
+
+    diff = journal.entries(since=mark)
+    assert diff[0]["ops"][0] == ["set", ["conversations", "c1", "updated_ms"], 0]
+
+    registry.call("admin.reset", {}, ctx)
+    send(registry, ctx, "anders", "z")
+    with pytest.raises(ValueError):
+        replay(json.loads(json.dumps(base)), journal.entries())
+    replayed = replay(json.loads(json.dumps(base)), journal.entries(), seed=default_state_factory)
+    assert replayed == materialize(store.get(ctx.session))
+
+
+def test_journal_disabled_by_default_and_restarted_on_restore() -> None:
+    assert InMemoryStateStore(default_state_factory).journal("s") is None
+    registry = build_default_registry()
+    store = InMemoryStateStore(default_state_factory, journal=True)
+    ctx = ToolContext(user_id="j2", trace_id="t", clock=Clock(), state_store=store)
+    snap = store.snapshot(ctx.session)
+    send(registry, ctx, "anders", "a")
+    assert len(store.journal(ctx.session)) == 1
+    store.restore(ctx.session, snap)
+    assert len(store.journal(ctx.session)) == 0
+
+
+def test_journal_restarts_when_session_is_evicted_without_spill() -> None:
+    from mock_platform import EvictionPolicy
+
+    registry = build_default_registry()
+    store = InMemoryStateStore(default_state_factory, journal=True, eviction=EvictionPolicy(max_sessions=1))
+    ctx = ToolContext(user_id="j3", trace_id="t", clock=Clock(), state_store=store)
+    send(registry, ctx, "anders", "a")
+    assert len(store.journal(ctx.session)) == 1
+    store.get("other")
+    assert store.resident_sessions() == 1
+    send(registry, ctx, "anders", "b")
+    entries = store.journal(ctx.session).entries()
+    assert len(entries) == 1
+    replayed = replay(default_state_factory(), entries)
+    assert replayed == materialize(store.get(ctx.session))
@@ -74,3 +74,98 @@ def test_messaging_with_memo_content() -> None:
     ctx.clock.advance(600)
     delivered = registry.call("messaging.get_message", {"message_id": send.data["message_id"]}, ctx)
     assert delivered.data["message"]["status"] == "delivered"
+
+
+def seed_memos(ctx: ToolContext) -> None:
+    from mock_platform.services.memo import upsert_memo
+
+    corpus = {
+        "budget": ("Budget review", "The budget for hiring is approved"),
+        "hiring": ("Hiring plan", "Hiring hiring hiring: two engineers and one designer"),
+        "offsite": ("Offsite", "Venue booked; budget pending"),
+    }
+    for memo_id, (title, content) in corpus.items():
+        upsert_memo(
+            ctx.state_store,
+            ctx.session,
+            {"memo_id": memo_id, "title": title, "content": content, "created_at": 0, "updated_at": 0},
+        )
+
+
+def test_title_search_default_unchanged() -> None:
+    registry, ctx = build_ctx("m5")
+    seed_memos(ctx)
+    for title, expected in [("BUDGET", ["budget"]), ("i", ["decision", "budget", "hiring", "offsite"]), ("plan", ["hiring"])]:
+        search = registry.call("memo.search", {"title": title}, ctx)
+        assert [m["memo_id"] for m in search.data["memos"]] == expected
+
+
+def test_full_text_search_matches_all_terms() -> None:
+    registry, ctx = build_ctx("m6")
+    seed_memos(ctx)
+    search = registry.call("memo.search", {"query": "budget"}, ctx)
+    assert [m["memo_id"] for m in search.data["memos"]] == ["budget", "offsite"]
+    search = registry.call("memo.search", {"query": "Casey candidate"}, ctx)
+    assert [m["memo_id"] for m in search.data["memos"]] == ["decision"]
+    page = registry.call("memo.search", {"query": "budget", "limit": 1, "offset": 1}, ctx)
+    assert [m["memo_id"] for m in page.data["memos"]] == ["offsite"]
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_full_text_search_rechecks_memos_edited_in_place(mode: str) -> None:
+    registry, ctx = build_ctx("m9")
+    ctx.state_store = InMemoryStateStore(default_state_factory, snapshot_mode=mode)
+    seed_memos(ctx)
+    assert [m["memo_id"] for m in registry.call("memo.search", {"query": "casey"}, ctx).data["memos"]] == ["decision"]
+    memos = ctx.state_store.get(ctx.session)["memos"]
+    memos["decision"]["content"] = "nothing"
+    memos["budget"]["title"] = "Old"
+    assert registry.call("memo.search", {"query": "casey"}, ctx).data["memos"] == []
+    ranked = registry.call("memo.search", {"query": "budget", "ranked": True}, ctx).data["memos"]
+    assert registry.call("memo.search", {"query": "budget review"}, ctx).data["memos"] == []
+    ctx.state_store.indexes(ctx.session).clear()
+    assert ranked == registry.call("memo.search", {"query": "budget", "ranked": True}, ctx).data["memos"]
+    assert {m["memo_id"] for m in ranked} == {"budget", "offsite"}
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_searches_see_memos_renamed_in_place(mode: str) -> None:
+    registry, ctx = build_ctx("m10")
+    ctx.state_store = InMemoryStateStore(default_state_factory, snapshot_mode=mode)
+    seed_memos(ctx)
+    assert registry.call("memo.search", {"title": "verdict"}, ctx).data["memos"] == []
+    assert registry.call("memo.search", {"query": "verdict"}, ctx).data["memos"] == []
+    state = ctx.state_store.get(ctx.session)
+    state["memos"]["decision"]["title"] = "Verdict"
+    assert [m["memo_id"] for m in registry.call("memo.search", {"title": "verdict"}, ctx).data["memos"]] == ["decision"]
+    assert [m["memo_id"] for m in registry.call("memo.search", {"query": "verdict"}, ctx).data["memos"]] == ["decision"]
+
+
+def test_searches_scan_untracked_memos() -> None:
+    registry, ctx = build_ctx("m11")
+    state = ctx.state_store.get(ctx.session)
+    state["memos"] = {"x": {"memo_id": "x", "title": "Plain", "content": "hand made", "updated_at": "t"}}
+    assert [m["memo_id"] for m in registry.call("memo.search", {"title": "plain"}, ctx).data["memos"]] == ["x"]
+    state["memos"]["x"]["title"] = "Other"
+    assert registry.call("memo.search", {"title": "plain"}, ctx).data["memos"] == []
+    assert [m["memo_id"] for m in registry.call("memo.search", {"query": "made"}, ctx).data["memos"]] == ["x"]
+
+
+def test_ranked_search_orders_by_bm25() -> None:
+    registry, ctx = build_ctx("m7")
+    seed_memos(ctx)
+    ranked = registry.call("memo.search", {"query": "hiring engineers", "ranked": True}, ctx)
+    memos = ranked.data["memos"]
+    assert [m["memo_id"] for m in memos] == ["hiring", "budget"]
+    assert memos[0]["score"] > memos[1]["score"] > 0
+
+    state = ctx.state_store.get(ctx.session)
+    state["memos"].pop("hiring")
+    ranked = registry.call("memo.search", {"query": "hiring", "ranked": True, "limit": 5}, ctx)
+    assert [m["memo_id"] for m in ranked.data["memos"]] == ["budget"]
+
+
+def test_full_text_search_rejects_bad_arguments() -> None:
+    registry, ctx = build_ctx("m8")
+    for args in ({"query": 3}, {"query": "x", "title": "y"}, {"query": "x", "limit": 0}, {"query": "x", "ranked": "yes"}):
+        assert registry.call("memo.search", args, ctx).error["code"] == "invalid_arguments"
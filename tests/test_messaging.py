@@ -0,0 +1,177 @@
+import json
+
+import pytest
+
+from mock_platform import Clock, InMemoryStateStore, ToolContext, ToolRegistry, default_state_factory
+from mock_platform.cow import materialize
+from mock_platform.journal import replay
+from mock_platform.scheduler import cancel_delivery, next_due_ms, pop_due, schedule_delivery
+from mock_platform.services import register_admin_tools, register_contacts_tools, register_messaging_tools
+
+
+def build_ctx(session: str = "msg") -> tuple[ToolRegistry, ToolContext]:
+    registry = ToolRegistry()
+    register_contacts_tools(registry)
+    register_messaging_tools(registry)
+    register_admin_tools(registry)
+    state_store = InMemoryStateStore(default_state_factory)
+    ctx = ToolContext(user_id=session, trace_id="trace-" + session, clock=Clock(), state_store=state_store)
+    return registry, ctx
+
+
+def send(registry: ToolRegistry, ctx: ToolContext, to_value: str, client_msg_id: str, text: str = "hi"):
+    to_type = "e164" if to_value.startswith("+") else "contact_id"
+    return registry.call(
+        "messaging.send_text",
+        {"to": {"type": to_type, "value": to_value}, "text": text, "client_msg_id": client_msg_id},
+        ctx,
+    )
+
+
+def test_scheduler_orders_and_cancels_lazily() -> None:
+    state = default_state_factory()
+    schedule_delivery(state, "m1", 300)
+    schedule_delivery(state, "m2", 100)
+    schedule_delivery(state, "m3", 200)
+    assert cancel_delivery(state, "m3")
+    assert not cancel_delivery(state, "m3")
+    assert next_due_ms(state) == 100
+    assert pop_due(state, 250) == [("m2", "delivered")]
+    assert next_due_ms(state) == 300
+    assert pop_due(state, 300) == [("m1", "delivered")]
+    assert pop_due(state, 10_000) == []
+    json.dumps(state)
+
+
+def test_set_delivery_cancels_pending_delivery() -> None:
+    registry, ctx = build_ctx("cancel")
+    sent = send(registry, ctx, "anders", "c-1")
+    forced = registry.call("admin.set_delivery", {"message_id": sent.data["message_id"], "status": "failed"}, ctx)
+    assert forced.ok
+    ctx.clock.advance(1_000)
+    message = registry.call("messaging.get_message", {"message_id": sent.data["message_id"]}, ctx).data["message"]
+    assert message["status"] == "failed"
+    assert ctx.state_store.get(ctx.session)["delivery_pending"] == {}
+
+
+def test_delivery_survives_snapshot_restore() -> None:
+    registry, ctx = build_ctx("snap-deliver")
+    sent = send(registry, ctx, "anders", "c-1")
+    snap = ctx.state_store.snapshot(ctx.session)
+    ctx.state_store.restore(ctx.session, json.loads(json.dumps(snap)))
+    ctx.clock.advance(500)
+    message = registry.call("messaging.get_message", {"message_id": sent.data["message_id"]}, ctx).data["message"]
+    assert message["status"] == "delivered"
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_legacy_delivery_queue_is_converted_on_restore(mode: str) -> None:
+    registry, _ = build_ctx()
+    store = InMemoryStateStore(default_state_factory, snapshot_mode=mode, journal=True)
+    ctx = ToolContext(user_id="legacy-queue", trace_id="t", clock=Clock(), state_store=store)
+    first = send(registry, ctx, "anders", "c-1")
+    ctx.clock.advance(100)
+    second = send(registry, ctx, "anders", "c-2")
+    legacy = json.loads(json.dumps(materialize(store.snapshot(ctx.session))))
+    legacy["delivery_queue"] = [
+        {"message_id": message_id, "due_ms": due_ms, "target_status": target_status}
+        for due_ms, _, message_id, target_status in sorted(legacy["delivery_queue"], key=lambda entry: entry[1])
+    ]
+    del legacy["delivery_pending"], legacy["next_delivery_seq"]
+
+    store.restore(ctx.session, legacy)
+    first_due = legacy["delivery_queue"][0]["due_ms"]
+    ctx.clock.advance(first_due - ctx.clock.now_ms())
+    statuses = [
+        registry.call("messaging.get_message", {"message_id": sent.data["message_id"]}, ctx).data["message"]["status"]
+        for sent in (first, second)
+    ]
+    assert statuses == ["delivered", "sent"]
+    third = send(registry, ctx, "anders", "c-3")
+    ctx.clock.advance(1_000)
+    state = store.get(ctx.session)
+    assert all(state["messages"][sent.data["message_id"]]["status"] == "delivered" for sent in (first, second, third))
+    assert state["delivery_queue"] == [] and state["delivery_pending"] == {}
+    replayed = replay(json.loads(json.dumps(legacy)), store.journal(ctx.session).entries())
+    assert replayed == materialize(state)
+
+
+def test_peer_index_reuses_conversations_across_snapshots() -> None:
+    registry, ctx = build_ctx("index")
+    first = send(registry, ctx, "+15550002222", "c-1")
+    snap = ctx.state_store.snapshot(ctx.session)
+    other = send(registry, ctx, "+15550003333", "c-2")
+    assert other.data["conversation_id"] != first.data["conversation_id"]
+
+    ctx.state_store.restore(ctx.session, snap)
+    again = send(registry, ctx, "+15550002222", "c-3")
+    assert again.data["conversation_id"] == first.data["conversation_id"]
+    fresh = send(registry, ctx, "+15550003333", "c-4")
+    assert fresh.data["conversation_id"] == other.data["conversation_id"]
+    state = ctx.state_store.get(ctx.session)
+    assert state["conversation_index"] == {"+15550002222": "c1", "+15550003333": "c2"}
+
+    registry.call("admin.reset", {}, ctx)
+    assert ctx.state_store.get(ctx.session)["conversation_index"] == {}
+
+
+def test_peer_index_rebuilt_for_legacy_state() -> None:
+    registry, ctx = build_ctx("legacy")
+    first = send(registry, ctx, "anders", "c-1")
+    del ctx.state_store.get(ctx.session)["conversation_index"]
+    again = send(registry, ctx, "+15550001111", "c-2")
+    assert again.data["conversation_id"] == first.data["conversation_id"]
+
+
+def test_send_text_is_idempotent_on_client_msg_id() -> None:
+    registry, ctx = build_ctx("dedup")
+    first = send(registry, ctx, "anders", "retry-1", text="once")
+    ctx.clock.advance(500)
+    retry = send(registry, ctx, "anders", "retry-1", text="once")
+    assert retry.ok
+    assert retry.meta == {"deduplicated": True}
+    assert retry.data == {
+        "message_id": first.data["message_id"],
+        "conversation_id": first.data["conversation_id"],
+        "status": "delivered",
+    }
+    state = ctx.state_store.get(ctx.session)
+    assert len(state["messages"]) == 1
+    assert state["next_message_id"] == 2
+    assert state["delivery_pending"] == {}
+
+    snap = ctx.state_store.snapshot(ctx.session)
+    ctx.state_store.restore(ctx.session, json.loads(json.dumps(snap)))
+    assert send(registry, ctx, "anders", "retry-1").data["message_id"] == first.data["message_id"]
+    assert send(registry, ctx, "anders", "retry-2").data["message_id"] != first.data["message_id"]
+
+
+def test_list_messages_cursor_pagination() -> None:
+    registry, ctx = build_ctx("pages")
+    for n in range(7):
+        send(registry, ctx, "anders", f"p-{n}", text=f"t{n}")
+
+    def page(**extra):
+        args = {"conversation_id": "c1", "limit": 3, **extra}
+        result = registry.call("messaging.list_messages", args, ctx)
+        assert result.ok, result.error
+        return [m["text"] for m in result.data["messages"]], result.data["next_cursor"]
+
+    texts, cursor = page()
+    assert texts == ["t4", "t5", "t6"]
+    texts, cursor = page(before=cursor)
+    assert texts == ["t1", "t2", "t3"]
+    texts, cursor = page(before=cursor)
+    assert (texts, cursor) == (["t0"], None)
+
+    texts, cursor = page(after="0")
+    assert texts == ["t0", "t1", "t2"]
+    texts, cursor = page(after=cursor)
+    texts, cursor = page(after=cursor)
+    assert (texts, cursor) == (["t6"], None)
+
+    for cursor in ("99", "\u00b2", "\u0663", "-1", " 1"):
+        bad = registry.call("messaging.list_messages", {"conversation_id": "c1", "before": cursor}, ctx)
+        assert not bad.ok and bad.error["code"] == "invalid_arguments"
+    both = registry.call("messaging.list_messages", {"conversation_id": "c1", "before": "1", "after": "0"}, ctx)
+    assert not both.ok
@@ -0,0 +1,50 @@
+import pytest
+
+from mock_platform import Clock, EvictionPolicy, InMemoryStateStore, ToolContext, default_state_factory
+from mock_platform.cow import materialize
+from mock_platform.persistence import CheckpointDirectory
+from mock_platform.runner import build_default_registry
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_checkpoint_roundtrip(tmp_path, mode: str) -> None:
+    registry = build_default_registry()
+    store = InMemoryStateStore(default_state_factory, snapshot_mode=mode)
+    ctx = ToolContext(user_id="p/1", trace_id="t", clock=Clock(), state_store=store)
+    registry.call(
+        "messaging.send_text",
+        {"to": {"type": "contact_id", "value": "anders"}, "text": "héllo", "client_msg_id": "c1"},
+        ctx,
+    )
+    checkpoints = CheckpointDirectory(tmp_path / "ckpt")
+    checkpoints.save(ctx.session, store.snapshot(ctx.session))
+
+    assert list(checkpoints.names()) == ["p/1"]
+    assert "p/1" in checkpoints
+    loaded = checkpoints.load("p/1")
+    assert loaded == materialize(store.get(ctx.session))
+
+    store.reset(ctx.session)
+    store.restore(ctx.session, loaded)
+    ctx.clock.advance(500)
+    assert registry.call("messaging.get_message", {"message_id": "m1"}, ctx).data["message"]["status"] == "delivered"
+
+    checkpoints.delete("p/1")
+    assert checkpoints.load("p/1") is None
+
+
+def test_checkpoint_rejects_foreign_files(tmp_path) -> None:
+    checkpoints = CheckpointDirectory(tmp_path)
+    (tmp_path / "bad.ckpt").write_bytes(b"not a checkpoint")
+    with pytest.raises(ValueError):
+        checkpoints.load("bad")
+
+
+def test_checkpoint_directory_as_eviction_spill(tmp_path) -> None:
+    spill = CheckpointDirectory(tmp_path)
+    store = InMemoryStateStore(default_state_factory, eviction=EvictionPolicy(max_sessions=1, spill=spill))
+    store.get("a")["rules"]["kept"] = True
+    store.get("b")
+    assert list(spill.names()) == ["a"]
+    assert store.get("a")["rules"] == {"kept": True}
+    assert list(spill.names()) == ["b"]
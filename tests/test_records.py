@@ -0,0 +1,64 @@
+import json
+import pickle
+import sys
+
+import pytest
+
+from mock_platform import Clock, InMemoryStateStore, ToolContext, default_state_factory
+from mock_platform.cow import materialize
+from mock_platform.records import MessageRecord
+from mock_platform.runner import build_default_registry
+
+
+def run_session(compact: bool, snapshot_mode: str = "deepcopy"):
+    registry = build_default_registry()
+    store = InMemoryStateStore(default_state_factory, snapshot_mode=snapshot_mode, compact_records=compact)
+    ctx = ToolContext(user_id="rec", trace_id="trace-rec", clock=Clock(), state_store=store)
+    results = []
+    for n in range(3):
+        to = {"type": "contact_id", "value": "anders"} if n else {"type": "e164", "value": "+15550002222"}
+        results.append(registry.call("messaging.send_text", {"to": to, "text": f"t{n}", "client_msg_id": f"k{n}"}, ctx))
+    snapshot = store.snapshot(ctx.session)
+    ctx.clock.advance(500)
+    results.append(registry.call("messaging.get_message", {"message_id": "m2"}, ctx))
+    results.append(registry.call("messaging.list_messages", {"conversation_id": "c2"}, ctx))
+    results.append(registry.call("admin.set_delivery", {"message_id": "m1", "status": "failed"}, ctx))
+    return store, ctx, snapshot, [r.to_dict() for r in results]
+
+
+@pytest.mark.parametrize("snapshot_mode", ["deepcopy", "cow"])
+def test_compact_records_match_dict_storage(snapshot_mode: str) -> None:
+    plain_store, plain_ctx, plain_snapshot, plain_results = run_session(False, snapshot_mode)
+    store, ctx, snapshot, results = run_session(True, snapshot_mode)
+
+    assert results == plain_results
+    assert json.dumps(results)
+    assert isinstance(store.get(ctx.session)["messages"]["m1"], MessageRecord)
+    assert materialize(snapshot) == materialize(plain_snapshot)
+    assert materialize(snapshot)["messages"]["m1"]["status"] == "sent"
+    assert materialize(store.get(ctx.session)) == materialize(plain_store.get(plain_ctx.session))
+
+
+def test_compact_deepcopy_snapshot_is_plain_json() -> None:
+    store, ctx, snapshot, _ = run_session(True)
+    plain_store, plain_ctx, plain_snapshot, _ = run_session(False)
+    assert json.dumps(snapshot) == json.dumps(plain_snapshot)
+    store.restore(ctx.session, json.loads(json.dumps(snapshot)))
+    restored = store.get(ctx.session)["messages"]
+    assert all(isinstance(message, MessageRecord) for message in restored.values())
+    assert materialize(restored) == plain_snapshot["messages"]
+
+
+def test_message_record_mapping_behaviour() -> None:
+    record = MessageRecord("m1", "c1", {"type": "e164", "value": "+1"}, "hi", "k", "sent", 0, 0)
+    plain = record.to_dict()
+    assert record == plain and list(record) == list(plain)
+    assert record.get("missing", 1) == 1 and "to" in record
+    record["status"] = "delivered"
+    with pytest.raises(KeyError):
+        record["extra"] = 1
+    with pytest.raises(ValueError):
+        record["to"] = {"type": "e164"}
+    clone = pickle.loads(pickle.dumps(record))
+    assert clone == record and clone["status"] == "delivered"
+    assert sys.getsizeof(record) < sys.getsizeof(plain)
@@ -0,0 +1,138 @@
+import pytest
+
+from mock_platform import (
+    Clock,
+    EvictionPolicy,
+    InMemoryStateStore,
+    ToolContext,
+    ToolRegistry,
+    ToolResult,
+    default_state_factory,
+)
+from mock_platform.services import register_admin_tools, register_contacts_tools, register_messaging_tools
+
+
+def build_ctx(session: str = "reg") -> tuple[ToolRegistry, ToolContext]:
+    registry = ToolRegistry()
+    register_contacts_tools(registry)
+    register_messaging_tools(registry)
+    register_admin_tools(registry)
+    state_store = InMemoryStateStore(default_state_factory)
+    ctx = ToolContext(user_id=session, trace_id="trace-" + session, clock=Clock(), state_store=state_store)
+    return registry, ctx
+
+
+BATCH = [
+    ("contacts.get", {"contact_id": "anders"}),
+    ("contacts.get", "not-a-dict"),
+    ("nope.tool", {}),
+    ("contacts.get", {"contact_id": "ghost"}),
+    ("contacts.search", {"q": "and"}),
+]
+
+
+def test_call_batch_matches_individual_calls() -> None:
+    registry, ctx = build_ctx("batch")
+    batch = registry.call_batch(BATCH, ctx)
+    single = [registry.call(name, args, ctx) for name, args in BATCH]
+    assert [r.to_dict() for r in batch] == [r.to_dict() for r in single]
+    assert [r.ok for r in batch] == [True, False, False, False, True]
+    assert batch[2].error["code"] == "tool_not_found"
+    assert batch[3].error["code"] == "not_found"
+
+
+def test_call_batch_stop_on_error() -> None:
+    registry, ctx = build_ctx("batch-stop")
+    results = registry.call_batch(BATCH, ctx, stop_on_error=True)
+    assert len(results) == 2
+    assert results[-1].error["code"] == "invalid_arguments"
+
+
+def test_call_batch_of_invalid_calls_leaves_session_untouched() -> None:
+    registry, ctx = build_ctx("batch-invalid")
+    results = registry.call_batch([("contacts.get", "not-a-dict"), ("nope.tool", {})], ctx)
+    assert [r.ok for r in results] == [False, False]
+    assert ctx.state_store.resident_sessions() == 0
+
+
+@pytest.mark.parametrize("readonly", [False, True])
+def test_call_batch_pins_evictable_session(readonly: bool) -> None:
+    sizes = []
+    policy = EvictionPolicy(max_bytes=10**9, size_fn=lambda state: sizes.append(state) or 1)
+    registry = ToolRegistry(readonly_results=readonly)
+    register_contacts_tools(registry)
+    store = InMemoryStateStore(default_state_factory, eviction=policy)
+    ctx = ToolContext(user_id="pin", trace_id="t", clock=Clock(), state_store=store)
+
+    single = [registry.call(name, args, ctx).to_dict() for name, args in BATCH * 3]
+    sizes.clear()
+    assert [r.to_dict() for r in registry.call_batch(BATCH * 3, ctx)] == single
+    assert len(sizes) == 1
+    assert "get" not in vars(store)
+
+
+def test_call_batch_keeps_handler_error_semantics() -> None:
+    registry, ctx = build_ctx("batch-errors")
+    registry.register_tool("test.boom", lambda args, ctx: 1 / 0)
+    registry.register_tool("test.bad_return", lambda args, ctx: {"ok": True})
+    registry.register_tool("test.ok", lambda args, ctx: ToolResult(ok=True, data={}))
+    codes = [r.error["code"] if r.error else None for r in registry.call_batch(
+        [("test.boom", {}), ("test.bad_return", {}), ("test.ok", {})], ctx
+    )]
+    assert codes == ["internal_error", "invalid_return", None]
+
+
+def test_instrumentation_is_opt_in_and_swaps_call() -> None:
+    registry, ctx = build_ctx("instr")
+    assert "call" not in vars(registry)
+    assert "timing" not in registry.call("contacts.get", {"contact_id": "anders"}, ctx).meta
+
+    instrumentation = registry.enable_instrumentation(track_allocations=True)
+    result = registry.call("contacts.get", {"contact_id": "anders"}, ctx)
+    assert result.meta["timing"]["wall_us"] >= 0
+    assert "alloc_peak_bytes" in result.meta["timing"]
+    registry.call("nope.tool", {}, ctx)
+    batch = registry.call_batch(BATCH, ctx)
+    assert all("timing" in r.meta for r in batch)
+
+    tools = instrumentation.snapshot()["tools"]
+    assert tools["contacts.get"]["calls"] == 4
+    assert tools["contacts.get"]["errors"] == 2
+    assert tools["nope.tool"]["calls"] == 2
+    assert sum(tools["contacts.get"]["histogram"]) == 4
+    assert '"contacts.search"' in instrumentation.export_json()
+
+    assert registry.disable_instrumentation() is instrumentation
+    assert "call" not in vars(registry)
+    assert "timing" not in registry.call("contacts.get", {"contact_id": "anders"}, ctx).meta
+    assert instrumentation.snapshot()["tools"]["contacts.get"]["calls"] == 4
+
+
+def test_schema_validation_runs_before_state_is_touched() -> None:
+    registry, ctx = build_ctx("schema")
+    cases = [
+        ("contacts.search", {}, "q is required"),
+        ("contacts.get", {"contact_id": 7}, "contact_id must be a string"),
+        ("messaging.send_text", {"to": {"type": "fax", "value": "1"}, "text": "hi", "client_msg_id": "x"},
+         "to.type must be one of contact_id, e164"),
+        ("messaging.list_messages", {"conversation_id": "c1", "limit": True}, "limit must be an integer"),
+        ("messaging.list_messages", {"conversation_id": "c1", "limit": 0}, "limit must be >= 1"),
+        ("admin.set_delivery", {"message_id": "m1", "status": "lost"}, "status must be one of sent, delivered, failed"),
+    ]
+    for name, args, message in cases:
+        result = registry.call(name, args, ctx)
+        assert result.error == {"code": "invalid_arguments", "message": message, "details": None}
+    assert ctx.state_store.resident_sessions() == 0
+
+    listed = registry.call("messaging.list_messages", {"conversation_id": "c1", "before": None}, ctx)
+    assert listed.error["code"] == "not_found"
+
+
+def test_export_schemas() -> None:
+    registry, _ = build_ctx("export")
+    registry.register_tool("custom.echo", lambda args, ctx: ToolResult(ok=True, data=args))
+    schemas = registry.export_schemas()
+    assert schemas["messaging.send_text"]["required"] == ["to", "text", "client_msg_id"]
+    assert schemas["custom.echo"] == {"type": "object"}
+    schemas["contacts.get"]["required"].append("mutated")
+    assert registry.export_schemas()["contacts.get"]["required"] == ["contact_id"]
@@ -0,0 +1,37 @@
+from mock_platform.runner import EpisodeRunner
+
+
+def script(n: int) -> list:
+    return [
+        {"tool": "contacts.search", "args": {"q": "anders"}},
+        {
+            "tool": "messaging.send_text",
+            "args": {"to": {"type": "contact_id", "value": "anders"}, "text": f"hi {n}", "client_msg_id": "c"},
+        },
+        {"tool": "messaging.get_message", "args": {"message_id": "m1"}},
+        {"advance": 500},
+        {"tool": "messaging.get_message", "args": {"message_id": "m1"}},
+    ]
+
+
+def test_runner_results_deterministic_and_ordered() -> None:
+    episodes = [script(n) for n in range(12)] + [[{"bogus": 1}]]
+    forked = EpisodeRunner(processes=3).run(episodes, chunksize=2)
+    inline = EpisodeRunner(processes=1).run(episodes)
+
+    assert [e.index for e in forked.episodes] == list(range(13))
+    assert [e.results for e in forked.episodes] == [e.results for e in inline.episodes]
+    assert forked.calls == 48
+    assert forked.calls_per_s > 0
+    last = forked.episodes[11].results[-1]["data"]["message"]
+    assert (last["text"], last["status"]) == ("hi 11", "delivered")
+    assert forked.episodes[-1].error
+
+
+def test_results_are_snapshotted_when_the_call_returns() -> None:
+    for processes in (1, 2):
+        report = EpisodeRunner(processes=processes).run([script(0), script(1)])
+        for episode in report.episodes:
+            before, after = episode.results[2], episode.results[3]
+            assert before["data"]["message"]["status"] == "sent"
+            assert after["data"]["message"]["status"] == "delivered"
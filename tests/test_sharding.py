@@ -0,0 +1,40 @@
+from mock_platform import Clock, InMemoryStateStore, ToolContext, default_state_factory
+from mock_platform.runner import build_default_registry
+from mock_platform.sharding import ShardedToolRegistry
+
+
+def send(registry, ctx: ToolContext, client_msg_id: str):
+    return registry.call(
+        "messaging.send_text",
+        {"to": {"type": "contact_id", "value": "anders"}, "text": "hi", "client_msg_id": client_msg_id},
+        ctx,
+    )
+
+
+def test_sharded_calls_match_local_registry() -> None:
+    clock = Clock()
+    local_store = InMemoryStateStore(default_state_factory)
+    local = build_default_registry()
+    sessions = [f"s{n}" for n in range(6)]
+    with ShardedToolRegistry(shards=3) as sharded:
+        assert {sharded.shard_for(s) for s in sessions} <= {0, 1, 2}
+        for session in sessions:
+            ctx = ToolContext(user_id=session, trace_id=session, clock=clock, state_store=local_store)
+            remote_send = send(sharded, ctx, "a")
+            assert remote_send.to_dict() == send(local, ctx, "a").to_dict()
+        clock.advance(500)
+        assert sharded.get_state("s1")["messages"]["m1"]["status"] == "delivered"
+        clock.advance(300)
+        for session in sessions:
+            ctx = ToolContext(user_id=session, trace_id=session, clock=clock, state_store=local_store)
+            remote = sharded.call("messaging.get_message", {"message_id": "m1"}, ctx)
+            assert (remote.data["message"]["status"], remote.data["message"]["updated_ms"]) == ("delivered", 500)
+            assert remote.to_dict() == local.call("messaging.get_message", {"message_id": "m1"}, ctx).to_dict()
+
+        snap = sharded.snapshot("s0")
+        sharded.reset("s0")
+        assert sharded.get_state("s0")["messages"] == {}
+        sharded.restore("s0", snap)
+        assert "m1" in sharded.get_state("s0")["messages"]
+        missing = sharded.call("nope.tool", {}, ToolContext("s0", "t", clock, local_store))
+        assert missing.error["code"] == "tool_not_found"
@@ -0,0 +1,366 @@
+import json
+
+import pytest
+
+from mock_platform import Clock, InMemoryStateStore, ToolContext, ToolRegistry, default_state_factory
+from mock_platform.cow import materialize
+from mock_platform.services import register_admin_tools, register_contacts_tools, register_messaging_tools
+
+
+def build_ctx(session: str = "st", snapshot_mode: str = "cow") -> tuple[ToolRegistry, ToolContext]:
+    registry = ToolRegistry()
+    register_contacts_tools(registry)
+    register_messaging_tools(registry)
+    register_admin_tools(registry)
+    state_store = InMemoryStateStore(default_state_factory, snapshot_mode=snapshot_mode)
+    ctx = ToolContext(user_id=session, trace_id="trace-" + session, clock=Clock(), state_store=state_store)
+    return registry, ctx
+
+
+def send(registry: ToolRegistry, ctx: ToolContext, text: str, client_msg_id: str):
+    return registry.call(
+        "messaging.send_text",
+        {"to": {"type": "contact_id", "value": "anders"}, "text": text, "client_msg_id": client_msg_id},
+        ctx,
+    )
+
+
+def test_unknown_snapshot_mode_rejected() -> None:
+    with pytest.raises(ValueError):
+        InMemoryStateStore(default_state_factory, snapshot_mode="bogus")
+
+
+def test_cow_snapshot_isolated_from_record_mutation() -> None:
+    registry, ctx = build_ctx("cow-1")
+    first = send(registry, ctx, "hello", "c-1")
+    snap = ctx.state_store.snapshot(ctx.session)
+
+    ctx.clock.advance(500)
+    send(registry, ctx, "again", "c-2")
+    live = registry.call("messaging.get_message", {"message_id": first.data["message_id"]}, ctx)
+    assert live.data["message"]["status"] == "delivered"
+
+    plain = materialize(snap)
+    assert plain["messages"][first.data["message_id"]]["status"] == "sent"
+    assert list(plain["messages"]) == [first.data["message_id"]]
+    assert len(plain["conversations"]["c1"]["messages"]) == 1
+    json.dumps(plain)
+
+
+def test_cow_restore_is_reusable() -> None:
+    registry, ctx = build_ctx("cow-2")
+    snap = ctx.state_store.snapshot(ctx.session)
+    for attempt in range(2):
+        ctx.state_store.restore(ctx.session, snap)
+        sent = send(registry, ctx, f"try {attempt}", f"c-{attempt}")
+        assert sent.data["message_id"] == "m1"
+        state = ctx.state_store.get(ctx.session)
+        state["contacts"].pop("anders")
+    assert "anders" in materialize(snap)["contacts"]
+    assert materialize(snap)["messages"] == {}
+
+
+def test_cow_map_reads_after_fork_leave_storage_shared() -> None:
+    from mock_platform.cow import CowMap
+
+    live = CowMap({f"k{n}": {"n": n} for n in range(1_000)})
+    snap = live.fork()
+    live["k5"]["n"] = -1
+    del live["k6"]
+    live["k6"] = {"n": 6}
+    live["new"] = {"n": 0}
+    assert live._base is snap._base
+    assert len(live._changes) + len(live._tail) == 4
+    assert list(live)[-2:] == ["k6", "new"] and len(live) == 1_001
+    assert snap["k5"] == {"n": 5} and list(snap)[:7] == [f"k{n}" for n in range(7)]
+    assert dict(live.items()) == {**{f"k{n}": {"n": n} for n in range(1_000)}, "k5": {"n": -1}, "new": {"n": 0}}
+
+
+def test_cow_snapshot_shares_delivery_queue_until_written() -> None:
+    registry, ctx = build_ctx("cow-queue")
+    for n in range(5):
+        send(registry, ctx, f"q{n}", f"q-{n}")
+    store = ctx.state_store
+    live = store.get(ctx.session)
+    queue = live.peek("delivery_queue")
+    snap = store.snapshot(ctx.session)
+    assert snap.peek("delivery_queue") is queue
+    restored = store.restore(ctx.session, snap)
+    assert restored.peek("delivery_queue") is queue
+
+    send(registry, ctx, "more", "q-more")
+    assert len(restored.peek("delivery_queue")) == 6
+    assert snap.peek("delivery_queue") is queue and len(queue) == 5
+    ctx.clock.advance(500)
+    assert len(queue) == 5
+    assert materialize(store.restore(ctx.session, snap))["delivery_queue"] == materialize(snap)["delivery_queue"]
+
+
+def test_cow_and_deepcopy_modes_agree() -> None:
+    results = []
+    for mode in ("deepcopy", "cow"):
+        registry, ctx = build_ctx("agree", snapshot_mode=mode)
+        send(registry, ctx, "one", "a")
+        snap = ctx.state_store.snapshot(ctx.session)
+        send(registry, ctx, "two", "b")
+        ctx.clock.advance(500)
+        ctx.state_store.restore(ctx.session, snap)
+        send(registry, ctx, "three", "c")
+        results.append(materialize(ctx.state_store.get(ctx.session)))
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_seed_template_built_once_and_invalidated(mode: str) -> None:
+    calls = []
+    greeting = {"text": "hi"}
+
+    def factory() -> dict:
+        calls.append(1)
+        state = default_state_factory()
+        state["rules"] = {"greeting": greeting["text"]}
+        return state
+
+    store = InMemoryStateStore(factory, snapshot_mode=mode)
+    first = store.get("a")
+    first["contacts"].pop("anders")
+    store.get("b")
+    store.reset("a")
+    assert len(calls) == 1
+    assert "anders" in store.get("a")["contacts"]
+
+    greeting["text"] = "hello"
+    store.invalidate_template()
+    assert store.reset("a")["rules"]["greeting"] == "hello"
+    assert store.get("b")["rules"]["greeting"] == "hi"
+    assert len(calls) == 2
+
+
+def test_template_cache_can_be_disabled() -> None:
+    calls = []
+
+    def factory() -> dict:
+        calls.append(1)
+        return default_state_factory()
+
+    store = InMemoryStateStore(factory, cache_template=False)
+    store.get("a")
+    store.get("b")
+    assert len(calls) == 2
+
+
+def test_clock_fires_only_due_timers_in_order() -> None:
+    clock = Clock()
+    fired = []
+    clock.schedule(300, lambda now: fired.append(("late", now)))
+    clock.schedule(100, lambda now: fired.append(("early", now)))
+    cancelled = clock.schedule(200, lambda now: fired.append(("cancelled", now)))
+    assert clock.cancel(cancelled)
+    assert not clock.cancel(cancelled)
+
+    clock.advance(250)
+    assert fired == [("early", 250)]
+    clock.advance(50)
+    assert fired == [("early", 250), ("late", 300)]
+    assert clock.pending_timers() == 0
+
+
+def test_clock_timer_scheduled_from_callback_fires_when_due() -> None:
+    clock = Clock()
+    fired = []
+    clock.schedule(10, lambda now: clock.schedule(now, fired.append))
+    clock.advance(10)
+    assert fired == [10]
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_restored_session_delivers_overdue_messages_on_next_advance(mode: str) -> None:
+    registry, ctx = build_ctx("catch-up-" + mode, snapshot_mode=mode)
+    sent = send(registry, ctx, "hello", "c-1")
+    message_id = sent.data["message_id"]
+    snap = ctx.state_store.snapshot(ctx.session)
+    ctx.clock.advance(600)
+    ctx.state_store.restore(ctx.session, snap)
+    assert ctx.state_store.get(ctx.session)["messages"][message_id]["status"] == "sent"
+
+    ctx.clock.advance(100)
+    message = ctx.state_store.get(ctx.session)["messages"][message_id]
+    assert (message["status"], message["updated_ms"]) == ("delivered", 700)
+    assert ctx.state_store.get(ctx.session)["delivery_pending"] == {}
+
+    ctx.state_store.restore(ctx.session, snap)
+    ctx.state_store.reset(ctx.session)
+    ctx.clock.advance(100)
+    assert ctx.clock.pending_timers() == 0
+
+
+def test_thread_safe_store_initializes_session_once() -> None:
+    import threading
+    import time
+
+    from mock_platform import ThreadSafeStateStore
+
+    calls = []
+
+    def slow_factory() -> dict:
+        calls.append(1)
+        time.sleep(0.01)
+        return default_state_factory()
+
+    store = ThreadSafeStateStore(slow_factory, cache_template=False, stripes=4)
+    barrier = threading.Barrier(8)
+    seen = []
+
+    def worker() -> None:
+        barrier.wait()
+        seen.append(id(store.get("shared")))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(seen)) == 1
+    assert len(calls) == 1
+
+
+def test_thread_safe_store_parallel_sessions() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from mock_platform import ThreadSafeStateStore
+
+    registry, _ = build_ctx("unused")
+    clock = Clock()
+    store = ThreadSafeStateStore(default_state_factory, snapshot_mode="cow")
+
+    def episode(n: int) -> int:
+        ctx = ToolContext(user_id=f"t{n}", trace_id=f"t{n}", clock=clock, state_store=store)
+        for i in range(20):
+            with store.session_lock(ctx.session):
+                send(registry, ctx, f"msg {i}", f"{n}-{i}")
+            if i == 10:
+                snap = store.snapshot(ctx.session)
+        store.restore(ctx.session, snap)
+        return len(store.get(ctx.session)["messages"])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(episode, range(32))) == [11] * 32
+    clock.advance(500)
+    assert all(m["status"] == "delivered" for m in materialize(store.get("t0"))["messages"].values())
+
+
+class DictSpill:
+    def __init__(self) -> None:
+        self.saved: dict = {}
+
+    def save(self, session_id: str, state: dict) -> None:
+        self.saved[session_id] = json.loads(json.dumps(state))
+
+    def load(self, session_id: str):
+        return self.saved.get(session_id)
+
+    def delete(self, session_id: str) -> None:
+        self.saved.pop(session_id, None)
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_lru_eviction_spills_and_rehydrates(mode: str) -> None:
+    from mock_platform import EvictionPolicy
+
+    spill = DictSpill()
+    store = InMemoryStateStore(
+        default_state_factory, snapshot_mode=mode, eviction=EvictionPolicy(max_sessions=2, spill=spill)
+    )
+    store.get("a")["rules"]["mark"] = "a"
+    store.get("b")
+    store.get("a")
+    store.get("c")
+    assert store.resident_sessions() == 2
+    assert list(spill.saved) == ["b"]
+
+    store.get("b")["rules"]["mark"] = "b2"
+    assert "b" not in spill.saved
+    assert list(spill.saved) == ["a"]
+    assert store.get("a")["rules"]["mark"] == "a"
+    store.reset_all()
+    assert spill.saved == {}
+
+
+def test_ttl_and_byte_budget_eviction_without_spill() -> None:
+    from mock_platform import EvictionPolicy
+
+    now = [0.0]
+    store = InMemoryStateStore(
+        default_state_factory,
+        eviction=EvictionPolicy(ttl_s=10, max_bytes=3_000, size_fn=lambda state: 1_000, time_fn=lambda: now[0]),
+    )
+    store.get("a")["rules"]["mark"] = "a"
+    store.get("b")
+    store.get("c")
+    assert store.approx_bytes() == 3_000
+    store.get("d")
+    assert store.resident_sessions() == 3
+    assert "mark" not in store.get("a")["rules"]
+
+    now[0] = 100.0
+    store.get("x")
+    assert store.resident_sessions() == 1
+
+
+def test_delivery_timers_skip_evicted_sessions() -> None:
+    from mock_platform import EvictionPolicy
+
+    registry, ctx = build_ctx("a", snapshot_mode="deepcopy")
+    store = InMemoryStateStore(default_state_factory, eviction=EvictionPolicy(max_sessions=1))
+    ctx.state_store = store
+    send(registry, ctx, "from a", "a-1")
+    ctx.session_id = "b"
+    sent = send(registry, ctx, "from b", "b-1")
+    registry.call("admin.set_rule", {"name": "keep", "value": True}, ctx)
+
+    ctx.clock.advance(600)
+    assert store.resident_sessions() == 1
+    state = store.resident("b")
+    assert state["rules"] == {"keep": True}
+    assert state["messages"][sent.data["message_id"]]["status"] == "delivered"
+    assert ctx.clock.pending_timers() == 0
+
+
+@pytest.mark.parametrize("mode", ["deepcopy", "cow"])
+def test_spilled_session_catches_up_deliveries_on_rehydrate(mode: str) -> None:
+    from mock_platform import EvictionPolicy
+
+    registry, ctx = build_ctx("a", snapshot_mode=mode)
+    store = InMemoryStateStore(
+        default_state_factory, snapshot_mode=mode, eviction=EvictionPolicy(max_sessions=1, spill=DictSpill())
+    )
+    ctx.state_store = store
+    first = send(registry, ctx, "first", "a-1").data["message_id"]
+    ctx.clock.advance(300)
+    second = send(registry, ctx, "second", "a-2").data["message_id"]
+    ctx.session_id = "b"
+    store.get("b")
+    assert store.resident("a") is None
+
+    ctx.clock.advance(250)
+    ctx.clock.advance(600)
+    assert store.resident("a") is None
+    messages = store.get("a")["messages"]
+    assert (messages[first]["status"], messages[first]["updated_ms"]) == ("delivered", 550)
+    assert (messages[second]["status"], messages[second]["updated_ms"]) == ("delivered", 1150)
+    assert store.get("a")["delivery_queue"] == []
+
+
+def test_pinned_session_still_sees_reset_and_restore() -> None:
+    from mock_platform import EvictionPolicy
+
+    store = InMemoryStateStore(default_state_factory, eviction=EvictionPolicy(max_sessions=4))
+    snap = store.snapshot("p")
+    with store.pinned("p"):
+        first = store.get("p")
+        assert store.get("p") is first
+        fresh = store.reset("p")
+        assert fresh is not first and store.get("p") is fresh
+        restored = store.restore("p", snap)
+        assert store.get("p") is restored
+    assert "get" not in vars(store)
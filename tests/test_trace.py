@@ -0,0 +1,81 @@
+import json
+
+from mock_platform import Clock, InMemoryStateStore, ToolContext, default_state_factory
+from mock_platform.runner import build_default_registry
+from mock_platform.trace import TraceRecorder, replay_trace
+
+
+def record_session(path, snapshot_mode: str = "deepcopy") -> None:
+    record_session_with(build_default_registry(), path, snapshot_mode)
+
+
+def record_session_with(registry, path, snapshot_mode: str = "deepcopy") -> None:
+    store = InMemoryStateStore(default_state_factory, snapshot_mode=snapshot_mode)
+    clock = Clock()
+    with TraceRecorder(registry, path) as recorder:
+        for session in ("a", "b"):
+            ctx = ToolContext(user_id=session, trace_id="t-" + session, clock=clock, state_store=store)
+            recorder.call("contacts.search", {"q": "anders"}, ctx)
+            recorder.call(
+                "messaging.send_text",
+                {"to": {"type": "contact_id", "value": "anders"}, "text": "hi", "client_msg_id": "x"},
+                ctx,
+            )
+        clock.advance(500)
+        clock.advance(400)
+        ctx = ToolContext(user_id="a", trace_id="t-a", clock=clock, state_store=store)
+        recorder.call("messaging.get_message", {"message_id": "m1"}, ctx)
+        recorder.call("messaging.list_messages", {"conversation_id": "c1", "limit": 0}, ctx)
+    clock.advance(1)
+
+
+def test_record_and_replay_match(tmp_path) -> None:
+    path = tmp_path / "trace.jsonl"
+    record_session(path, snapshot_mode="cow")
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["t"] for e in events].count("advance") == 2
+    assert events[-2]["result"]["data"]["message"]["updated_ms"] == 500
+
+    report = replay_trace(path, build_default_registry())
+    assert report.ok
+    assert report.calls == 6
+
+
+def test_replay_reports_mismatches(tmp_path) -> None:
+    path = tmp_path / "trace.jsonl"
+    record_session(path)
+    lines = path.read_text().splitlines()
+    tampered = json.loads(lines[0])
+    tampered["result"]["data"]["contacts"] = []
+    lines[0] = json.dumps(tampered)
+    path.write_text("\n".join(lines) + "\n")
+
+    report = replay_trace(path, build_default_registry())
+    assert not report.ok
+    assert [(m.line, m.tool) for m in report.mismatches] == [(1, "contacts.search")]
+
+
+def test_non_json_args_are_recorded_as_not_replayable(tmp_path) -> None:
+    path = tmp_path / "trace.jsonl"
+    store = InMemoryStateStore(default_state_factory)
+    ctx = ToolContext(user_id="a", trace_id="t-a", clock=Clock(), state_store=store)
+    with TraceRecorder(build_default_registry(), path) as recorder:
+        result = recorder.call("contacts.search", {"q": b"x"}, ctx)
+        recorder.call("contacts.search", {"q": "anders"}, ctx)
+    assert not result.ok
+    first = json.loads(path.read_text().splitlines()[0])
+    assert (first["args"], first["replayable"]) == (None, False)
+    assert first["result"] == result.to_dict()
+
+    report = replay_trace(path, build_default_registry())
+    assert report.ok
+    assert (report.calls, report.skipped) == (1, 1)
+
+
+def test_instrumented_recording_replays(tmp_path) -> None:
+    path = tmp_path / "trace.jsonl"
+    registry = build_default_registry()
+    registry.enable_instrumentation()
+    record_session_with(registry, path)
+    assert "timing" in json.loads(path.read_text().splitlines()[0])["result"]["meta"]
+    assert replay_trace(path, build_default_registry()).ok
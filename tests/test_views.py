@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from mock_platform import Clock, InMemoryStateStore, ToolContext, ToolRegistry, default_state_factory
+from mock_platform.services import register_contacts_tools, register_memo_tools, register_messaging_tools
+from mock_platform.views import ReadOnlyList, ReadOnlyMapping, thaw
+
+
+def build_ctx(session: str = "views", snapshot_mode: str = "deepcopy") -> tuple[ToolRegistry, ToolContext]:
+    registry = ToolRegistry(readonly_results=True)
+    register_contacts_tools(registry)
+    register_messaging_tools(registry)
+    register_memo_tools(registry)
+    state_store = InMemoryStateStore(default_state_factory, snapshot_mode=snapshot_mode)
+    ctx = ToolContext(user_id=session, trace_id="trace-" + session, clock=Clock(), state_store=state_store)
+    return registry, ctx
+
+
+@pytest.mark.parametrize("snapshot_mode", ["deepcopy", "cow"])
+def test_results_are_zero_copy_read_only_views(snapshot_mode: str) -> None:
+    registry, ctx = build_ctx(snapshot_mode=snapshot_mode)
+    result = registry.call("contacts.get", {"contact_id": "anders"}, ctx)
+    contact = result.data["contact"]
+    phones = contact["phones"]
+    assert isinstance(result.data, ReadOnlyMapping) and isinstance(phones, ReadOnlyList)
+    assert contact == {"contact_id": "anders", "name": "Anders", "phones": [{"e164": "+15550001111"}]}
+
+    with pytest.raises(TypeError):
+        contact["name"] = "Mallory"
+    with pytest.raises(TypeError):
+        phones[0]["e164"] = "+1"
+    with pytest.raises(AttributeError):
+        phones.append({})
+    assert ctx.state_store.get(ctx.session)["contacts"]["anders"]["name"] == "Anders"
+
+    plain = thaw(result.data)
+    plain["contact"]["phones"][0]["e164"] = "+1"
+    assert phones[0]["e164"] == "+15550001111"
+
+
+def test_to_dict_and_to_json_serialize_once() -> None:
+    registry, ctx = build_ctx("views-json")
+    result = registry.call("memo.get_memo", {"memo_id": "decision"}, ctx)
+    as_dict = result.to_dict()
+    assert type(as_dict["data"]["memo"]) is dict
+    assert result.to_dict() is as_dict
+    text = result.to_json()
+    assert result.to_json() is text
+    assert json.loads(text) == as_dict
+    assert text == json.dumps(as_dict, ensure_ascii=False, separators=(",", ":"))